@@ -1,69 +1,371 @@
-import json
-from flask import Flask, render_template, request, Response
-from typing import Optional, Union, Any
+import hashlib
+from functools import partial
+from threading import Lock
+from flask import (
+    Flask,
+    abort,
+    current_app,
+    jsonify,
+    render_template,
+    request,
+    Response,
+)
+from typing import TYPE_CHECKING, Callable, Iterator, Mapping, Optional, Union, Any
 
+from app.config import DEFAULT_CONFIG
+from app.modules.api.api import (
+    ApiRecord,
+    OrjsonProvider,
+    RecordCache,
+    filter_records,
+    gzip_response,
+    meta_tags_api_records,
+    paginate,
+    sitemap_api_records,
+)
+from app.modules.exporters.exporters import (
+    META_TAGS_FIELDS,
+    SITEMAP_FIELDS,
+    meta_tags_records,
+    records_to_csv,
+    records_to_ndjson,
+    sitemap_records,
+    sitemap_to_xml,
+)
+from app.modules.http_client.http_client import configure_http_client
+from app.modules.jobs.jobs import Job, JobManager
+from app.modules.metrics.metrics import REGISTRY
+from app.modules.page_parser.page_parser import get_page_parser
+from app.modules.page_parser.parse_pool import configure_parse_pool, get_parse_pool
+from app.modules.sitemap.crawl_cache import CrawlCache, crawl_cache_key
+from app.modules.sitemap.crawl_state import CrawlState
+from app.modules.sitemap.link_checker import LinkCheckCache, LinkChecker
+from app.modules.sitemap.page_renderer import PageRenderer
 from app.modules.sitemap.sitemap import Sitemap
-from app.modules.sitemap.jstree_formatter import sitemap_to_jstree_formatter
+from app.modules.sitemap.jstree_formatter import JsTreeIndex, sitemap_to_text_outline
 from app.modules.meta_tags.meta_tags_request import get_meta_tags_request
-from app.modules.meta_tags.meta_tags_selenium import get_meta_tags_selenium
+from app.modules.url_rules.canonical import (
+    SESSION_PARAMS,
+    TRACKING_PARAMS,
+    UrlCanonicalizer,
+)
 
-app: Flask = Flask(__name__)
+if TYPE_CHECKING:
+    from app.modules.meta_tags.browser_pool import BrowserPool
+
+SERVICES_KEY: str = "qatools"
+
+
+class Services:
+    def __init__(self, config: Mapping[str, Any]) -> None:
+        self.config: Mapping[str, Any] = config
+        self.jobs: JobManager = JobManager(max_workers=config["JOB_WORKERS"])
+        self.crawl_cache: CrawlCache = CrawlCache(
+            ttl=config["CRAWL_CACHE_TTL"],
+            max_bytes=config["CRAWL_CACHE_MAX_BYTES"],
+            path=config["CRAWL_CACHE_PATH"],
+        )
+        self.crawl_state: Optional[CrawlState] = (
+            CrawlState(path=config["CRAWL_STATE_PATH"])
+            if config["CRAWL_STATE_PATH"]
+            else None
+        )
+        self.link_check_cache: LinkCheckCache = LinkCheckCache(
+            ttl=config["LINK_CHECK_CACHE_TTL"]
+        )
+        self.canonicalizer: UrlCanonicalizer = UrlCanonicalizer(
+            drop_params=(
+                *TRACKING_PARAMS,
+                *SESSION_PARAMS,
+                *config["SITEMAP_EXTRA_DROP_PARAMS"],
+            ),
+            sort_query=config["SITEMAP_SORT_QUERY"],
+            lowercase_path=config["SITEMAP_LOWERCASE_PATH"],
+        )
+        self.api_records: RecordCache[list[ApiRecord]] = RecordCache()
+        self.tree_indexes: RecordCache[JsTreeIndex] = RecordCache()
+        self._browser_pool: Optional["BrowserPool"] = None
+        self._browser_pool_lock: Lock = Lock()
+
+    def browser_pool(self) -> "BrowserPool":
+        from app.modules.meta_tags.browser_pool import configure_browser_pool
+
+        with self._browser_pool_lock:
+            if self._browser_pool is None:
+                self._browser_pool = configure_browser_pool(
+                    size=self.config["BROWSER_POOL_SIZE"],
+                    max_pages_per_session=self.config["BROWSER_MAX_PAGES_PER_SESSION"],
+                )
+            return self._browser_pool
+
+
+def _services() -> Services:
+    services: Services = current_app.extensions[SERVICES_KEY]
+    return services
 
 
-@app.context_processor
 def inject_defaults() -> dict[str, str]:
     return {"site_name": "QA-Tools"}
 
 
-@app.route("/", methods=["GET"])
+def _collect_sitemap(services: Services, job: Job) -> dict[str, Any]:
+    config: Mapping[str, Any] = services.config
+    sitemap: Sitemap = Sitemap(
+        job.params["url"],
+        max_depth=job.params["depth"],
+        exclude_substrings=job.params["exclude_substrings"],
+        include_rules=job.params.get("include_rules"),
+        respect_robots=config["SITEMAP_RESPECT_ROBOTS"]
+        and not job.params.get("ignore_robots", False),
+        seed_from_sitemaps=job.params.get("seed_sitemaps", False),
+        concurrency=config["SITEMAP_CONCURRENCY"],
+        per_host_concurrency=config["SITEMAP_PER_HOST_CONCURRENCY"],
+        max_pages=config["SITEMAP_MAX_PAGES"],
+        max_bytes=config["SITEMAP_MAX_BYTES"],
+        max_page_bytes=config["SITEMAP_MAX_PAGE_BYTES"],
+        parser=get_page_parser(config["PARSER_BACKEND"]),
+        parse_pool=get_parse_pool(),
+        on_progress=job.update,
+        state=services.crawl_state,
+        link_checker=(
+            LinkChecker(
+                concurrency=config["LINK_CHECK_CONCURRENCY"],
+                per_host_concurrency=config["LINK_CHECK_PER_HOST_CONCURRENCY"],
+                cache=services.link_check_cache,
+            )
+            if job.params.get("check_external")
+            else None
+        ),
+        renderer=(
+            PageRenderer(
+                services.browser_pool(),
+                max_pages=config["SITEMAP_RENDER_MAX_PAGES"],
+                timeout=config["SITEMAP_RENDER_TIMEOUT"],
+            )
+            if job.params.get("render_js")
+            else None
+        ),
+        canonicalizer=services.canonicalizer,
+        honor_canonical=job.params.get("collapse_duplicates", False),
+        near_duplicate_distance=(
+            config["SITEMAP_NEAR_DUPLICATE_DISTANCE"]
+            if job.params.get("collapse_duplicates")
+            else None
+        ),
+    )
+    sitemap.collect()
+    sitemap_data: dict[str, Any] = sitemap.get()
+    services.crawl_cache.set(job.params["cache_key"], sitemap_data)
+    return sitemap_data
+
+
+def _collect_meta_tags(
+    services: Services, job: Job
+) -> Optional[dict[str, dict[str, str]]]:
+    if job.params["enable_selenium"]:
+        from app.modules.meta_tags.meta_tags_selenium import get_meta_tags_selenium
+
+        return get_meta_tags_selenium(
+            job.params["urls"],
+            pool=services.browser_pool(),
+            on_progress=job.update,
+            session_timeout=services.config["BROWSER_SESSION_TIMEOUT"],
+        )
+    return get_meta_tags_request(
+        job.params["urls"], head_only=job.params["head_only"], on_progress=job.update
+    )
+
+
+def _split_lines(raw: Optional[str]) -> list[str]:
+    return (
+        [line for line in raw.replace("\r", "").replace(" ", "").split("\n") if line]
+        if raw
+        else []
+    )
+
+
+def _get_job(kind: str) -> Optional[Job]:
+    job_id: Optional[str] = request.args.get("job")
+    if not job_id:
+        return None
+    job: Optional[Job] = _services().jobs.get(job_id)
+    if job is None or job.kind != kind:
+        abort(404)
+    return job
+
+
+def _get_finished_job(job_id: str, kind: str) -> Job:
+    job: Optional[Job] = _services().jobs.get(job_id)
+    if job is None or job.kind != kind or job.result is None:
+        abort(404)
+    return job
+
+
+PROMETHEUS_CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+EXPORT_MIMETYPES: dict[str, str] = {
+    "xml": "application/xml",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _export_response(
+    chunks: Iterator[str], filename: str, export_format: str
+) -> Response:
+    return Response(
+        chunks,
+        mimetype=EXPORT_MIMETYPES[export_format],
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+def metrics() -> Response:
+    return Response(REGISTRY.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def job_status(job_id: str) -> Response:
+    job: Optional[Job] = _services().jobs.get(job_id)
+    if job is None:
+        abort(404)
+    return jsonify(job.to_dict())
+
+
 def sitemap() -> Union[str, Response]:
     page_meta_title: str = "Sitemap"
+    services: Services = _services()
 
     url: Optional[str] = request.args.get("url")
-    exclude_substrings_raw: Optional[str] = request.args.get("exclude_substrings")
-    exclude_substrings: list[str] = (
-        [
-            substring
-            for substring in exclude_substrings_raw.replace("\r", "")
-            .replace(" ", "")
-            .split("\n")
-            if substring
-        ]
-        if exclude_substrings_raw
-        else []
-    )
+    exclude_substrings: list[str] = _split_lines(request.args.get("exclude_substrings"))
+    include_rules: list[str] = _split_lines(request.args.get("include_rules"))
     depth: int = request.args.get("depth", type=int, default=0)
+    refresh: bool = bool(request.args.get("refresh"))
+    seed_sitemaps: bool = bool(request.args.get("seed_sitemaps"))
+    check_external: bool = bool(request.args.get("check_external"))
+    render_js: bool = bool(request.args.get("render_js"))
+    collapse_duplicates: bool = bool(request.args.get("collapse_duplicates"))
+    ignore_robots: bool = bool(request.args.get("ignore_robots"))
 
-    if url:
-        sitemap: Sitemap = Sitemap(
-            url, max_depth=depth, exclude_substrings=exclude_substrings
-        )
-        sitemap.collect()
-        sitemap_data: dict[str, Any] = sitemap.get()
-        sitemap_jstree = sitemap_to_jstree_formatter(sitemap_data)
-
-        return render_template(
-            "pages/sitemap.html",
-            page_meta_title=page_meta_title,
-            url=url,
-            depth=depth,
-            sitemap=sitemap_jstree,
-            metadata_json=json.dumps(sitemap_data.get("metadata", {})),
-            incoming_links=json.dumps(sitemap_data.get("incoming", {})),
-            exclude_substrings=exclude_substrings,
+    job: Optional[Job] = _get_job("sitemap")
+    if job is not None:
+        url = job.params["url"]
+        depth = job.params["depth"]
+        exclude_substrings = job.params["exclude_substrings"]
+        include_rules = job.params.get("include_rules", [])
+        seed_sitemaps = job.params.get("seed_sitemaps", False)
+        check_external = job.params.get("check_external", False)
+        render_js = job.params.get("render_js", False)
+        collapse_duplicates = job.params.get("collapse_duplicates", False)
+        ignore_robots = job.params.get("ignore_robots", False)
+    elif url:
+        cache_key: str = crawl_cache_key(
+            url,
+            depth,
+            exclude_substrings,
+            include_rules,
+            seed_sitemaps,
+            check_external,
+            render_js,
+            collapse_duplicates,
+            ignore_robots,
+            canonicalizer=services.canonicalizer,
         )
+        params: dict[str, Any] = {
+            "url": url,
+            "depth": depth,
+            "exclude_substrings": exclude_substrings,
+            "include_rules": include_rules,
+            "seed_sitemaps": seed_sitemaps,
+            "check_external": check_external,
+            "render_js": render_js,
+            "collapse_duplicates": collapse_duplicates,
+            "ignore_robots": ignore_robots,
+            "cache_key": cache_key,
+        }
+        if refresh:
+            services.crawl_cache.invalidate(cache_key)
+        cached: Optional[dict[str, Any]] = services.crawl_cache.get(cache_key)
+        if cached is not None:
+            job = services.jobs.add_finished(
+                "sitemap", cached, {**params, "cached": True}
+            )
+        else:
+            job = services.jobs.submit(
+                "sitemap", partial(_collect_sitemap, services), params
+            )
+            job.wait(current_app.config["JOB_INLINE_WAIT"])
 
     return render_template(
         "pages/sitemap.html",
         page_meta_title=page_meta_title,
+        url=url,
         depth=depth,
         exclude_substrings=exclude_substrings,
+        include_rules=include_rules,
+        seed_sitemaps=seed_sitemaps,
+        check_external=check_external,
+        render_js=render_js,
+        collapse_duplicates=collapse_duplicates,
+        ignore_robots=ignore_robots,
+        job=job.to_dict() if job is not None else None,
+        cached=job is not None and job.params.get("cached", False),
+        truncated=job is not None
+        and job.status == "finished"
+        and job.result.get("truncated", False),
+        blocked=(
+            len(job.result.get("blocked", []))
+            if job is not None and job.status == "finished"
+            else 0
+        ),
+    )
+
+
+def _tree_index(job_id: str) -> JsTreeIndex:
+    job: Job = _get_finished_job(job_id, "sitemap")
+    return _services().tree_indexes.get_or_build(
+        (job_id, "tree"), lambda: JsTreeIndex(job.result)
+    )
+
+
+def sitemap_tree(job_id: str) -> Response:
+    index: JsTreeIndex = _tree_index(job_id)
+    node: str = request.args.get("node", "#")
+    return jsonify(index.root_nodes() if node == "#" else index.child_nodes(node))
+
+
+def sitemap_details(job_id: str) -> Response:
+    index: JsTreeIndex = _tree_index(job_id)
+    return jsonify(index.details(request.args.get("url", "")))
+
+
+def sitemap_outline(job_id: str) -> Response:
+    sitemap_data: dict[str, Any] = _get_finished_job(job_id, "sitemap").result
+    outline_type: str = request.args.get("type", "all")
+    return Response(
+        sitemap_to_text_outline(
+            sitemap_data,
+            include_internal=outline_type in ("all", "internal"),
+            include_external=outline_type in ("all", "external"),
+        ),
+        mimetype="text/plain",
     )
 
 
-@app.route("/meta-tags", methods=["GET", "POST"])
+def sitemap_export(job_id: str, export_format: str) -> Response:
+    sitemap_data: dict[str, Any] = _get_finished_job(job_id, "sitemap").result
+    if export_format == "xml":
+        chunks: Iterator[str] = sitemap_to_xml(sitemap_data)
+    elif export_format == "ndjson":
+        chunks = records_to_ndjson(sitemap_records(sitemap_data))
+    elif export_format == "csv":
+        chunks = records_to_csv(sitemap_records(sitemap_data), SITEMAP_FIELDS)
+    else:
+        abort(404)
+    return _export_response(chunks, f"sitemap.{export_format}", export_format)
+
+
 def meta_tags() -> Union[str, Response]:
     page_meta_title: str = "Meta tags"
+    services: Services = _services()
 
     meta_tags: Optional[dict[str, dict[str, str]]] = None
     urls_raw: Optional[str] = request.form.get("urls")
@@ -73,15 +375,159 @@ def meta_tags() -> Union[str, Response]:
         else []
     )
     enable_selenium: bool = "enable-selenium" in request.form
-    if urls:
-        get_page_meta_tags = (
-            get_meta_tags_selenium if enable_selenium else get_meta_tags_request
+    head_only: bool = "head-only" in request.form
+
+    job: Optional[Job] = _get_job("meta_tags")
+    if job is not None:
+        urls = job.params["urls"]
+        head_only = job.params["head_only"]
+    elif urls:
+        job = services.jobs.submit(
+            "meta_tags",
+            partial(_collect_meta_tags, services),
+            {"urls": urls, "enable_selenium": enable_selenium, "head_only": head_only},
         )
-        meta_tags = get_page_meta_tags(urls)
+        job.wait(current_app.config["JOB_INLINE_WAIT"])
+
+    if job is not None:
+        meta_tags = job.result
 
     return render_template(
         "pages/meta_tags.html",
         page_meta_title=page_meta_title,
         urls=urls,
         meta_tags=meta_tags,
+        head_only=head_only,
+        bytes_saved=sum(
+            int(url_meta_tags.get("bytes_saved", 0))
+            for url_meta_tags in (meta_tags or {}).values()
+        ),
+        job=job.to_dict() if job is not None else None,
+    )
+
+
+def meta_tags_export(job_id: str, export_format: str) -> Response:
+    meta_tags_data: dict[str, dict[str, str]] = _get_finished_job(
+        job_id, "meta_tags"
+    ).result
+    if export_format == "ndjson":
+        chunks: Iterator[str] = records_to_ndjson(meta_tags_records(meta_tags_data))
+    elif export_format == "csv":
+        chunks = records_to_csv(meta_tags_records(meta_tags_data), META_TAGS_FIELDS)
+    else:
+        abort(404)
+    return _export_response(chunks, f"meta-tags.{export_format}", export_format)
+
+
+def _api_page(
+    job_id: str,
+    kind: str,
+    build_records: Callable[[Any], list[ApiRecord]],
+    **filters: Any,
+) -> Response:
+    job: Job = _get_finished_job(job_id, kind)
+    etag: str = hashlib.sha1(job_id.encode() + b"?" + request.query_string).hexdigest()
+    if request.if_none_match.contains(etag):
+        not_modified: Response = Response(status=304)
+        not_modified.set_etag(etag)
+        return not_modified
+
+    records: list[ApiRecord] = _services().api_records.get_or_build(
+        (job_id, kind), lambda: build_records(job.result)
+    )
+    limit: int = min(
+        max(
+            1,
+            request.args.get("limit", type=int) or current_app.config["API_PAGE_SIZE"],
+        ),
+        current_app.config["API_MAX_PAGE_SIZE"],
+    )
+    offset: int = max(0, request.args.get("offset", type=int, default=0))
+    try:
+        page: dict[str, Any] = paginate(
+            filter_records(records, **filters), offset, limit
+        )
+    except ValueError as e:
+        error: Response = jsonify({"error": str(e)})
+        error.status_code = 400
+        return error
+    response: Response = jsonify({"job_id": job_id, **page})
+    response.set_etag(etag)
+    return response
+
+
+def api_sitemap_pages(job_id: str) -> Response:
+    return _api_page(
+        job_id,
+        "sitemap",
+        sitemap_api_records,
+        status=request.args.get("status"),
+        depth=request.args.get("depth", type=int),
+        prefix=request.args.get("prefix"),
+        link_type=request.args.get("type"),
+    )
+
+
+def api_meta_tags(job_id: str) -> Response:
+    return _api_page(
+        job_id,
+        "meta_tags",
+        meta_tags_api_records,
+        prefix=request.args.get("prefix"),
+    )
+
+
+def compress_json(response: Response) -> Response:
+    if response.mimetype != "application/json":
+        return response
+    response.vary.add("Accept-Encoding")
+    if not request.accept_encodings.quality("gzip"):
+        return response
+    return gzip_response(response, current_app.config["API_GZIP_MIN_BYTES"])
+
+
+def create_app(config: Optional[Mapping[str, Any]] = None) -> Flask:
+    app: Flask = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    app.config.from_mapping(DEFAULT_CONFIG)
+    app.config.from_prefixed_env("QATOOLS")
+    app.config.from_mapping(config or {})
+
+    configure_http_client(
+        timeout=app.config["HTTP_TIMEOUT"],
+        pool_maxsize=app.config["HTTP_POOL_MAXSIZE"],
+        retries=app.config["HTTP_RETRIES"],
+    )
+    configure_parse_pool(app.config["PARSE_WORKERS"])
+    app.extensions[SERVICES_KEY] = Services(app.config)
+
+    app.context_processor(inject_defaults)
+    app.after_request(compress_json)
+    app.add_url_rule("/", view_func=sitemap, methods=["GET"])
+    app.add_url_rule("/metrics", view_func=metrics, methods=["GET"])
+    app.add_url_rule("/jobs/<job_id>", view_func=job_status, methods=["GET"])
+    app.add_url_rule("/sitemap/<job_id>/tree", view_func=sitemap_tree, methods=["GET"])
+    app.add_url_rule(
+        "/sitemap/<job_id>/details", view_func=sitemap_details, methods=["GET"]
+    )
+    app.add_url_rule(
+        "/sitemap/<job_id>/outline", view_func=sitemap_outline, methods=["GET"]
+    )
+    app.add_url_rule(
+        "/sitemap/<job_id>/export.<export_format>",
+        view_func=sitemap_export,
+        methods=["GET"],
+    )
+    app.add_url_rule("/meta-tags", view_func=meta_tags, methods=["GET", "POST"])
+    app.add_url_rule(
+        "/meta-tags/<job_id>/export.<export_format>",
+        view_func=meta_tags_export,
+        methods=["GET"],
+    )
+    app.add_url_rule(
+        "/api/sitemap/<job_id>/pages", view_func=api_sitemap_pages, methods=["GET"]
+    )
+    app.add_url_rule(
+        "/api/meta-tags/<job_id>", view_func=api_meta_tags, methods=["GET"]
     )
+    return app
@@ -0,0 +1,36 @@
+from typing import Any, Dict
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "SITEMAP_CONCURRENCY": 8,
+    "SITEMAP_PER_HOST_CONCURRENCY": 4,
+    "SITEMAP_RESPECT_ROBOTS": True,
+    "SITEMAP_MAX_PAGES": 50_000,
+    "SITEMAP_MAX_BYTES": 2 * 1024 * 1024 * 1024,
+    "SITEMAP_MAX_PAGE_BYTES": 5 * 1024 * 1024,
+    "SITEMAP_RENDER_MAX_PAGES": 200,
+    "SITEMAP_RENDER_TIMEOUT": 20,
+    "SITEMAP_EXTRA_DROP_PARAMS": [],
+    "SITEMAP_SORT_QUERY": True,
+    "SITEMAP_LOWERCASE_PATH": False,
+    "SITEMAP_NEAR_DUPLICATE_DISTANCE": 3,
+    "HTTP_TIMEOUT": 10,
+    "HTTP_POOL_MAXSIZE": 16,
+    "HTTP_RETRIES": 2,
+    "PARSER_BACKEND": "streaming",
+    "PARSE_WORKERS": 0,
+    "BROWSER_POOL_SIZE": 2,
+    "BROWSER_MAX_PAGES_PER_SESSION": 100,
+    "BROWSER_SESSION_TIMEOUT": 60,
+    "JOB_WORKERS": 4,
+    "JOB_INLINE_WAIT": 2.0,
+    "CRAWL_CACHE_TTL": 3600,
+    "CRAWL_CACHE_MAX_BYTES": 256 * 1024 * 1024,
+    "CRAWL_CACHE_PATH": None,
+    "CRAWL_STATE_PATH": None,
+    "LINK_CHECK_CONCURRENCY": 8,
+    "LINK_CHECK_PER_HOST_CONCURRENCY": 2,
+    "LINK_CHECK_CACHE_TTL": 24 * 3600,
+    "API_PAGE_SIZE": 100,
+    "API_MAX_PAGE_SIZE": 1000,
+    "API_GZIP_MIN_BYTES": 1024,
+}
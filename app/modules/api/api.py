@@ -0,0 +1,148 @@
+import gzip
+import re
+from collections import OrderedDict
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+from flask.wrappers import Response
+
+from app.modules.exporters.exporters import sitemap_page_records
+
+ORJSON_OPTIONS: int = orjson.OPT_NON_STR_KEYS
+STATUS_CLASS_PATTERN: re.Pattern[str] = re.compile(r"^[1-5]xx$")
+
+ApiRecord = Dict[str, Any]
+T = TypeVar("T")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj: Any = self._prepare_response_obj(args, kwargs)
+        return Response(
+            orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS),
+            mimetype=self.mimetype,
+        )
+
+
+def sitemap_api_records(sitemap: Dict[str, Any]) -> List[ApiRecord]:
+    return list(sitemap_page_records(sitemap))
+
+
+def meta_tags_api_records(meta_tags: Dict[str, Dict[str, str]]) -> List[ApiRecord]:
+    return [{"url": url, "tags": tags} for url, tags in meta_tags.items()]
+
+
+def status_matcher(wanted: str) -> Callable[[ApiRecord], bool]:
+    if wanted == "ok":
+        return lambda record: record["response"] is not None and (
+            record["status"] is not None and record["status"] < 400
+        )
+    if wanted == "error":
+        return lambda record: record["response"] is not None and (
+            record["status"] is None or record["status"] >= 400
+        )
+    if STATUS_CLASS_PATTERN.match(wanted):
+        status_class: int = int(wanted[0])
+        return lambda record: (
+            record["status"] is not None and record["status"] // 100 == status_class
+        )
+    if wanted.isdigit():
+        code: int = int(wanted)
+        return lambda record: record["status"] == code
+    raise ValueError(f"Unknown status filter: {wanted}")
+
+
+def filter_records(
+    records: Iterable[ApiRecord],
+    status: Optional[str] = None,
+    depth: Optional[int] = None,
+    prefix: Optional[str] = None,
+    link_type: Optional[str] = None,
+) -> Iterable[ApiRecord]:
+    if status is not None:
+        matches_status: Callable[[ApiRecord], bool] = status_matcher(status)
+        records = (record for record in records if matches_status(record))
+    if depth is not None:
+        records = (record for record in records if record.get("depth") == depth)
+    if prefix:
+        records = (record for record in records if record["url"].startswith(prefix))
+    if link_type is not None:
+        records = (record for record in records if record.get("type") == link_type)
+    return records
+
+
+def paginate(records: Iterable[ApiRecord], offset: int, limit: int) -> Dict[str, Any]:
+    items: List[ApiRecord] = []
+    total: int = 0
+    for record in records:
+        if offset <= total < offset + limit:
+            items.append(record)
+        total += 1
+    return {
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "next_offset": offset + limit if offset + limit < total else None,
+        "items": items,
+    }
+
+
+def gzip_response(response: Response, min_bytes: int, level: int = 6) -> Response:
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code != 200
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    data: bytes = response.get_data()
+    if len(data) < min_bytes:
+        return response
+    response.set_data(gzip.compress(data, compresslevel=level))
+    response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+class RecordCache(Generic[T]):
+    def __init__(self, max_entries: int = 8) -> None:
+        self.max_entries: int = max_entries
+        self._entries: OrderedDict[Tuple[str, str], T] = OrderedDict()
+        self._lock: Lock = Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_or_build(self, key: Tuple[str, str], build: Callable[[], T]) -> T:
+        with self._lock:
+            records: Optional[T] = self._entries.get(key)
+            if records is not None:
+                self._entries.move_to_end(key)
+                return records
+        records = build()
+        with self._lock:
+            self._entries[key] = records
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return records
@@ -0,0 +1,145 @@
+import csv
+import io
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+from xml.sax.saxutils import escape
+
+import orjson
+
+from app.modules.sitemap.frontier import FrontierStore
+
+SITEMAP_XML_HEADER: str = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+SITEMAP_XML_FOOTER: str = "</urlset>\n"
+SITEMAP_FIELDS: List[str] = [
+    "url",
+    "type",
+    "depth",
+    "status",
+    "title",
+    "description",
+    "incoming",
+]
+META_TAGS_FIELDS: List[str] = ["url", "title", "description"]
+
+
+def _is_listed(response: Dict[str, Dict[str, Any]], url: str) -> bool:
+    page_response: Dict[str, Any] = response.get(url, {})
+    status: Optional[int] = page_response.get("status")
+    return (status is None or status < 400) and "duplicate_of" not in page_response
+
+
+def sitemap_page_records(sitemap: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    internal: Dict[str, List[str]] = sitemap.get("internal", {})
+    response: Dict[str, Dict[str, Any]] = sitemap.get("response", {})
+    metadata: Dict[str, Dict[str, str]] = sitemap.get("metadata", {})
+    incoming: Dict[str, List[str]] = sitemap.get("incoming", {})
+    depths: Dict[str, int] = sitemap.get("depths", {})
+    blocked: List[str] = sitemap.get("blocked", [])
+    blocked_urls: Set[str] = set(blocked)
+
+    def record(url: str, link_type: str) -> Dict[str, Any]:
+        return {
+            "url": url,
+            "type": link_type,
+            "depth": depths.get(url),
+            "status": response.get(url, {}).get("status"),
+            "response": response.get(url),
+            "metadata": metadata.get(url),
+            "incoming": incoming.get(url, []),
+            "blocked": url in blocked_urls,
+        }
+
+    external: List[str] = sorted(sitemap.get("external", []))
+    listed: Set[str] = {*internal, *external}
+    for url in internal:
+        yield record(url, "internal")
+    for url in [*response, *blocked]:
+        if url not in listed:
+            listed.add(url)
+            yield record(url, "internal")
+    for url in external:
+        yield record(url, "external")
+
+
+def sitemap_records(sitemap: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    for page_record in sitemap_page_records(sitemap):
+        page_metadata: Dict[str, str] = page_record["metadata"] or {}
+        yield {
+            "url": page_record["url"],
+            "type": page_record["type"],
+            "depth": page_record["depth"],
+            "status": page_record["status"],
+            "title": page_metadata.get("title", ""),
+            "description": page_metadata.get("description", ""),
+            "incoming": len(page_record["incoming"]),
+        }
+
+
+def frontier_records(store: FrontierStore) -> Iterator[Dict[str, Any]]:
+    for url, depth, result, incoming in store.page_rows():
+        page_metadata: Dict[str, str] = result.metadata or {}
+        yield {
+            "url": url,
+            "type": "internal",
+            "depth": depth,
+            "status": result.response.get("status"),
+            "title": page_metadata.get("title", ""),
+            "description": page_metadata.get("description", ""),
+            "incoming": incoming,
+        }
+    for url, incoming in store.external_rows():
+        yield {
+            "url": url,
+            "type": "external",
+            "depth": None,
+            "status": None,
+            "title": "",
+            "description": "",
+            "incoming": incoming,
+        }
+
+
+def meta_tags_records(
+    meta_tags: Dict[str, Dict[str, str]],
+) -> Iterator[Dict[str, Any]]:
+    for url, url_meta_tags in meta_tags.items():
+        yield {
+            "url": url,
+            "title": url_meta_tags.get("title", ""),
+            "description": url_meta_tags.get("description", ""),
+        }
+
+
+def sitemap_to_xml(sitemap: Dict[str, Any]) -> Iterator[str]:
+    response: Dict[str, Dict[str, Any]] = sitemap.get("response", {})
+    yield SITEMAP_XML_HEADER
+    for url in sitemap.get("internal", {}):
+        if _is_listed(response, url):
+            yield f"  <url><loc>{escape(url)}</loc></url>\n"
+    yield SITEMAP_XML_FOOTER
+
+
+def records_to_ndjson(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    for record in records:
+        yield orjson.dumps(record).decode() + "\n"
+
+
+def records_to_csv(
+    records: Iterable[Dict[str, Any]], fields: List[str]
+) -> Iterator[str]:
+    buffer: io.StringIO = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore")
+
+    def flush() -> str:
+        row: str = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return row
+
+    writer.writeheader()
+    yield flush()
+    for record in records:
+        writer.writerow(record)
+        yield flush()
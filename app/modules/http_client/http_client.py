@@ -0,0 +1,88 @@
+from http.cookiejar import DefaultCookiePolicy
+from threading import Lock
+from typing import Any, Dict, Iterable, Optional
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_HEADERS: Dict[str, str] = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/114.0.0.0 Safari/537.36"
+    )
+}
+RETRY_STATUSES: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+
+class HttpClient:
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 10,
+        pool_connections: int = 16,
+        pool_maxsize: int = 16,
+        host_pool_sizes: Optional[Dict[str, int]] = None,
+        retries: int = 2,
+        backoff_factor: float = 0.3,
+        retry_statuses: Iterable[int] = RETRY_STATUSES,
+    ) -> None:
+        self.timeout: float = timeout
+        self.pool_connections: int = pool_connections
+        self.retry: Retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=frozenset(retry_statuses),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+        )
+        self.session: Session = Session()
+        self.session.headers.update({**DEFAULT_HEADERS, **(headers or {})})
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        default_adapter: HTTPAdapter = self._build_adapter(pool_maxsize)
+        self.session.mount("http://", default_adapter)
+        self.session.mount("https://", default_adapter)
+        for host, pool_size in (host_pool_sizes or {}).items():
+            host_adapter: HTTPAdapter = self._build_adapter(pool_size)
+            self.session.mount(f"http://{host}/", host_adapter)
+            self.session.mount(f"https://{host}/", host_adapter)
+
+    def _build_adapter(self, pool_maxsize: int) -> HTTPAdapter:
+        return HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=self.retry,
+        )
+
+    def get(self, url: str, **kwargs: Any) -> Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def head(self, url: str, **kwargs: Any) -> Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.head(url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_shared_client: Optional[HttpClient] = None
+_shared_client_lock: Lock = Lock()
+
+
+def get_http_client() -> HttpClient:
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
+
+
+def configure_http_client(**kwargs: Any) -> HttpClient:
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is not None:
+            _shared_client.close()
+        _shared_client = HttpClient(**kwargs)
+        return _shared_client
@@ -0,0 +1,133 @@
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Optional
+
+from app.modules.metrics.metrics import Counter, Gauge, Histogram
+
+logger = getLogger(__name__)
+
+JOB_PENDING: str = "pending"
+JOB_RUNNING: str = "running"
+JOB_FINISHED: str = "finished"
+JOB_FAILED: str = "failed"
+
+JOBS_COMPLETED: Counter = Counter(
+    "qatools_jobs_completed_total",
+    "Background jobs completed by kind and status.",
+    labelnames=("kind", "status"),
+)
+JOBS_RUNNING: Gauge = Gauge(
+    "qatools_jobs_running", "Background jobs currently running.", labelnames=("kind",)
+)
+JOB_DURATION_SECONDS: Histogram = Histogram(
+    "qatools_job_duration_seconds",
+    "Background job run time.",
+    labelnames=("kind",),
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+
+
+class Job:
+    def __init__(self, kind: str, params: Optional[Dict[str, Any]] = None) -> None:
+        self.id: str = uuid.uuid4().hex
+        self.kind: str = kind
+        self.params: Dict[str, Any] = params or {}
+        self.status: str = JOB_PENDING
+        self.progress: Dict[str, int] = {}
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at: float = time.time()
+        self.finished_at: Optional[float] = None
+        self._done: Event = Event()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def update(self, **progress: int) -> None:
+        self.progress.update(progress)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def finish(self, result: Any = None, error: Optional[str] = None) -> None:
+        self.result = result
+        self.error = error
+        self.status = JOB_FAILED if error is not None else JOB_FINISHED
+        self.finished_at = time.time()
+        self._done.set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": dict(self.progress),
+            "error": self.error,
+        }
+
+
+class JobManager:
+    def __init__(self, max_workers: int = 4, max_jobs: int = 100) -> None:
+        self.max_jobs: int = max_jobs
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="job"
+        )
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._lock: Lock = Lock()
+
+    def _run(self, job: Job, func: Callable[[Job], Any]) -> None:
+        job.status = JOB_RUNNING
+        result: Any = None
+        error: Optional[str] = None
+        with JOBS_RUNNING.track_inprogress(kind=job.kind):
+            with JOB_DURATION_SECONDS.time(kind=job.kind):
+                try:
+                    result = func(job)
+                except Exception as e:
+                    logger.exception("Job %s failed", job.id)
+                    error = str(e)
+        JOBS_COMPLETED.inc(
+            kind=job.kind, status=JOB_FAILED if error is not None else JOB_FINISHED
+        )
+        job.finish(result=result, error=error)
+
+    def _prune(self) -> None:
+        finished: list[str] = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(self._jobs) - self.max_jobs)]:
+            del self._jobs[job_id]
+
+    def _store(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+
+    def add_finished(
+        self, kind: str, result: Any, params: Optional[Dict[str, Any]] = None
+    ) -> Job:
+        job: Job = Job(kind, params)
+        job.finish(result=result)
+        self._store(job)
+        return job
+
+    def submit(
+        self,
+        kind: str,
+        func: Callable[[Job], Any],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Job:
+        job: Job = Job(kind, params)
+        self._store(job)
+        self._executor.submit(self._run, job, func)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
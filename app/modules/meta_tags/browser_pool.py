@@ -0,0 +1,168 @@
+import atexit
+import time
+from collections import deque
+from contextlib import contextmanager
+from logging import getLogger
+from queue import Empty
+from threading import Condition, Lock
+from typing import Any, Callable, Deque, Iterator, List, Optional
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.remote.webdriver import WebDriver
+
+logger = getLogger(__name__)
+
+BLOCKED_URL_PATTERNS: List[str] = [
+    "*.css",
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.avif",
+    "*.svg",
+    "*.ico",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+]
+
+
+def _build_options() -> Options:
+    options: Options = Options()
+    options.binary_location = "/usr/bin/chromium"
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option(
+        "prefs",
+        {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.fonts": 2,
+            "profile.managed_default_content_settings.stylesheets": 2,
+        },
+    )
+    return options
+
+
+def create_driver() -> WebDriver:
+    service: Service = Service(executable_path="/usr/bin/chromedriver")
+    driver: webdriver.Chrome = webdriver.Chrome(
+        service=service, options=_build_options()
+    )
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    return driver
+
+
+class BrowserSession:
+    def __init__(self, driver: WebDriver) -> None:
+        self.driver: WebDriver = driver
+        self.pages_loaded: int = 0
+        self.crashed: bool = False
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        size: int = 2,
+        max_pages_per_session: int = 100,
+        driver_factory: Callable[[], WebDriver] = create_driver,
+    ) -> None:
+        self.size: int = max(1, size)
+        self.max_pages_per_session: int = max(1, max_pages_per_session)
+        self.driver_factory: Callable[[], WebDriver] = driver_factory
+        self._idle: Deque[BrowserSession] = deque()
+        self._created: int = 0
+        self._lock: Lock = Lock()
+        self._available: Condition = Condition(self._lock)
+
+    def _acquire(self, timeout: Optional[float]) -> BrowserSession:
+        deadline: Optional[float] = (
+            None if timeout is None else time.monotonic() + timeout
+        )
+        with self._available:
+            while not self._idle and self._created >= self.size:
+                remaining: Optional[float] = (
+                    None if deadline is None else deadline - time.monotonic()
+                )
+                if remaining is not None and remaining <= 0:
+                    raise Empty(f"No browser session became free within {timeout}s")
+                self._available.wait(remaining)
+            if self._idle:
+                return self._idle.popleft()
+            self._created += 1
+
+        try:
+            return BrowserSession(self.driver_factory())
+        except Exception:
+            self._free_slot()
+            raise
+
+    def _free_slot(self) -> None:
+        with self._available:
+            self._created -= 1
+            self._available.notify()
+
+    def _discard(self, session: BrowserSession) -> None:
+        self._free_slot()
+        try:
+            session.driver.quit()
+        except Exception as e:
+            logger.warning("Failed to quit browser session: %s", e)
+
+    def _release(self, session: BrowserSession) -> None:
+        if session.crashed or session.pages_loaded >= self.max_pages_per_session:
+            self._discard(session)
+            return
+        with self._available:
+            self._idle.append(session)
+            self._available.notify()
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None) -> Iterator[WebDriver]:
+        browser_session: BrowserSession = self._acquire(timeout)
+        try:
+            yield browser_session.driver
+        except Exception:
+            browser_session.crashed = True
+            raise
+        finally:
+            browser_session.pages_loaded += 1
+            self._release(browser_session)
+
+    def close(self) -> None:
+        while True:
+            with self._available:
+                if not self._idle:
+                    return
+                session: BrowserSession = self._idle.popleft()
+            self._discard(session)
+
+
+_shared_pool: Optional[BrowserPool] = None
+_shared_pool_lock: Lock = Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = BrowserPool()
+            atexit.register(_shared_pool.close)
+        return _shared_pool
+
+
+def configure_browser_pool(**kwargs: Any) -> BrowserPool:
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is not None:
+            _shared_pool.close()
+            atexit.unregister(_shared_pool.close)
+        _shared_pool = BrowserPool(**kwargs)
+        atexit.register(_shared_pool.close)
+        return _shared_pool
@@ -1,44 +1,95 @@
 import requests
-from bs4 import BeautifulSoup
-from typing import Any, List, Dict, Optional
+from logging import getLogger
+from typing import Callable, List, Dict, Optional, Tuple
 
+from app.modules.http_client.http_client import HttpClient, get_http_client
+from app.modules.page_parser.page_parser import PageData, PageParser, get_page_parser
 
-def get_meta_tags_request(urls: List[str]) -> Optional[Dict[str, Dict[str, str]]]:
-    if not urls:
+logger = getLogger(__name__)
+
+HEAD_END_TAG: bytes = b"</head>"
+HEAD_CHUNK_SIZE: int = 8 * 1024
+HEAD_MAX_BYTES: int = 256 * 1024
+
+
+def _read_head(response: requests.Response, max_bytes: int) -> Tuple[str, bool]:
+    buffer: bytearray = bytearray()
+    truncated: bool = False
+    for chunk in response.iter_content(chunk_size=HEAD_CHUNK_SIZE):
+        search_from: int = max(0, len(buffer) - len(HEAD_END_TAG))
+        buffer.extend(chunk)
+        if HEAD_END_TAG in bytes(buffer[search_from:]).lower():
+            truncated = True
+            break
+        if len(buffer) >= max_bytes:
+            truncated = True
+            del buffer[max_bytes:]
+            break
+
+    return buffer.decode(response.encoding or "utf-8", errors="replace"), truncated
+
+
+def _bytes_saved(response: requests.Response, truncated: bool) -> Optional[int]:
+    if not truncated:
+        return 0
+    content_length: str = response.headers.get("Content-Length", "")
+    if not content_length.isdigit():
         return None
+    return max(0, int(content_length) - response.raw.tell())
 
-    meta_data: Dict[str, Dict[str, str]] = {}
 
-    headers: Dict[str, str] = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/114.0.0.0 Safari/537.36"
-        )
-    }
+def _fetch_html(
+    client: HttpClient, url: str, head_only: bool, head_max_bytes: int
+) -> Tuple[str, Optional[int]]:
+    response: requests.Response = client.get(url, stream=head_only)
+    try:
+        response.raise_for_status()
+        if not head_only:
+            return response.text, None
+        head, truncated = _read_head(response, head_max_bytes)
+        return head, _bytes_saved(response, truncated)
+    finally:
+        response.close()
 
-    for url in urls:
-        try:
-            response: requests.Response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            soup: BeautifulSoup = BeautifulSoup(response.text, "html.parser")
 
-            title_tag: Any = soup.find("title")
-            description_tag: Any = soup.find("meta", attrs={"name": "description"})
+def get_meta_tags_request(
+    urls: List[str],
+    client: Optional[HttpClient] = None,
+    parser: Optional[PageParser] = None,
+    head_only: bool = False,
+    head_max_bytes: int = HEAD_MAX_BYTES,
+    on_progress: Optional[Callable[..., None]] = None,
+) -> Optional[Dict[str, Dict[str, str]]]:
+    if not urls:
+        return None
 
-            title: str = (
-                title_tag.string.strip() if title_tag and title_tag.string else ""
-            )
-            description: str = (
-                description_tag["content"].strip()
-                if description_tag and "content" in description_tag.attrs
-                else ""
-            )
+    meta_data: Dict[str, Dict[str, str]] = {}
+    http_client: HttpClient = client or get_http_client()
+    page_parser: PageParser = parser or get_page_parser()
+    total_bytes_saved: int = 0
+    errors: int = 0
 
-            meta_data[url] = {"title": title, "description": description}
+    for index, url in enumerate(urls):
+        try:
+            html, bytes_saved = _fetch_html(http_client, url, head_only, head_max_bytes)
+            page: PageData = page_parser.parse(html)
+            meta_data[url] = {"title": page.title, "description": page.description}
+            if bytes_saved is not None:
+                meta_data[url]["bytes_saved"] = str(bytes_saved)
+                total_bytes_saved += bytes_saved
 
         except Exception as e:
             error: str = f"Error: {str(e)}"
             meta_data[url] = {"title": error, "description": error}
+            errors += 1
+
+        if on_progress is not None:
+            on_progress(
+                pages_fetched=index + 1 - errors,
+                queue_size=len(urls) - index - 1,
+                errors=errors,
+            )
 
+    if head_only:
+        logger.info("Head-only fetch skipped %d body bytes", total_bytes_saved)
     return meta_data
@@ -1,37 +1,22 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.common.by import By
-from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
-from typing import List, Dict, Optional
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 
+from app.modules.meta_tags.browser_pool import BrowserPool, get_browser_pool
 
-def get_meta_tags_selenium(urls: List[str]) -> Optional[Dict[str, Dict[str, str]]]:
-    if not urls:
-        return None
 
-    meta_data: Dict[str, Dict[str, str]] = {}
+def _get_page_meta_tags(
+    pool: BrowserPool, url: str, session_timeout: Optional[float]
+) -> Tuple[Dict[str, str], bool]:
+    if not url or not url.startswith("http"):
+        return {
+            "title": "Error: URL must start with http or https",
+            "description": "Error: URL must start with http or https",
+        }, False
 
-    options: Options = Options()
-    options.binary_location = "/usr/bin/chromium"
-    options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-
-    service: Service = Service(executable_path="/usr/bin/chromedriver")
-    driver: WebDriver = webdriver.Chrome(service=service, options=options)
-
-    for url in urls:
-        if not url or not url.startswith("http"):
-            meta_data[url] = {
-                "title": "Error: URL must start with http or https",
-                "description": "Error: URL must start with http or https",
-            }
-            continue
-
-        try:
+    try:
+        with pool.session(timeout=session_timeout) as driver:
             driver.get(url)
             title: str = driver.title or ""
 
@@ -44,11 +29,38 @@ def get_meta_tags_selenium(urls: List[str]) -> Optional[Dict[str, Dict[str, str]
             except Exception:
                 description = ""
 
-            meta_data[url] = {"title": title, "description": description}
+        return {"title": title, "description": description}, True
+
+    except Exception as e:
+        error_message: str = f"Error: {str(e)}"
+        return {"title": error_message, "description": error_message}, False
+
 
-        except Exception as e:
-            error_message: str = f"Error: {str(e)}"
-            meta_data[url] = {"title": error_message, "description": error_message}
+def get_meta_tags_selenium(
+    urls: List[str],
+    pool: Optional[BrowserPool] = None,
+    on_progress: Optional[Callable[..., None]] = None,
+    session_timeout: Optional[float] = 60,
+) -> Optional[Dict[str, Dict[str, str]]]:
+    if not urls:
+        return None
+
+    meta_data: Dict[str, Dict[str, str]] = {}
+    errors: int = 0
+    browser_pool: BrowserPool = pool or get_browser_pool()
+    with ThreadPoolExecutor(max_workers=browser_pool.size) as executor:
+        results: Iterator[Tuple[Dict[str, str], bool]] = executor.map(
+            lambda url: _get_page_meta_tags(browser_pool, url, session_timeout), urls
+        )
+        for index, (url, (url_meta_tags, loaded)) in enumerate(zip(urls, results)):
+            meta_data[url] = url_meta_tags
+            if not loaded:
+                errors += 1
+            if on_progress is not None:
+                on_progress(
+                    pages_fetched=index + 1 - errors,
+                    queue_size=len(urls) - index - 1,
+                    errors=errors,
+                )
 
-    driver.quit()
     return meta_data
@@ -0,0 +1,144 @@
+import re
+from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from bs4 import BeautifulSoup, Tag
+
+DEFAULT_PARSER_BACKEND: str = "streaming"
+HIDDEN_PATTERN: re.Pattern[str] = re.compile(
+    r"<(script|style|noscript|template)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL
+)
+TAG_PATTERN: re.Pattern[str] = re.compile(r"<[^>]*>")
+
+
+class PageData(NamedTuple):
+    links: List[str]
+    title: str
+    description: str
+    canonical: str
+    fingerprint: int = 0
+
+
+def visible_text(html: str) -> str:
+    return TAG_PATTERN.sub(" ", HIDDEN_PATTERN.sub(" ", html))
+
+
+class PageParser(ABC):
+    @abstractmethod
+    def parse(self, html: str) -> PageData: ...
+
+
+class SoupPageParser(PageParser):
+    def __init__(self, features: str = "html.parser") -> None:
+        self.features: str = features
+
+    @staticmethod
+    def _extract_tags(soup: BeautifulSoup) -> Tuple[str, str, str]:
+        title: str = (
+            soup.title.string.strip() if soup.title and soup.title.string else ""
+        )
+        description_tag: Optional[Tag] = soup.find(  # type: ignore
+            "meta", attrs={"name": "description"}
+        )
+        description: str = (
+            description_tag["content"].strip()  # type: ignore
+            if description_tag and "content" in description_tag.attrs
+            else ""
+        )
+        canonical_tag: Optional[Tag] = soup.find("link", rel="canonical")  # type: ignore
+        canonical: str = (
+            canonical_tag["href"].strip()  # type: ignore
+            if canonical_tag and "href" in canonical_tag.attrs
+            else ""
+        )
+        return title, description, canonical
+
+    @staticmethod
+    def _extract_links(soup: BeautifulSoup) -> List[str]:
+        return [
+            str(a_tag["href"])
+            for a_tag in soup.find_all("a", href=True)
+            if isinstance(a_tag, Tag)
+        ]
+
+    def parse(self, html: str) -> PageData:
+        soup: BeautifulSoup = BeautifulSoup(html, self.features)
+        title, description, canonical = SoupPageParser._extract_tags(soup)
+        return PageData(
+            SoupPageParser._extract_links(soup), title, description, canonical
+        )
+
+
+class _TargetedHTMLParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.links: List[str] = []
+        self.title: Optional[str] = None
+        self.description: Optional[str] = None
+        self.canonical: Optional[str] = None
+        self._title_parts: Optional[List[str]] = None
+        self._title_is_text: bool = True
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if self._title_parts is not None:
+            self._title_is_text = False
+
+        attributes: Dict[str, str] = {name: value or "" for name, value in attrs}
+        if tag == "a":
+            if "href" in attributes:
+                self.links.append(attributes["href"])
+        elif tag == "title":
+            if self.title is None and self._title_parts is None:
+                self._title_parts = []
+        elif tag == "meta":
+            if self.description is None and attributes.get("name") == "description":
+                self.description = attributes.get("content", "").strip()
+        elif tag == "link":
+            if (
+                self.canonical is None
+                and "canonical" in attributes.get("rel", "").split()
+            ):
+                self.canonical = attributes.get("href", "").strip()
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title" and self._title_parts is not None:
+            self.title = (
+                "".join(self._title_parts).strip() if self._title_is_text else ""
+            )
+            self._title_parts = None
+
+    def handle_data(self, data: str) -> None:
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+
+    def handle_comment(self, data: str) -> None:
+        if self._title_parts is not None:
+            self._title_is_text = False
+
+
+class StreamingPageParser(PageParser):
+    def parse(self, html: str) -> PageData:
+        parser: _TargetedHTMLParser = _TargetedHTMLParser()
+        parser.feed(html)
+        parser.close()
+        if parser._title_parts is not None:
+            parser.handle_endtag("title")
+        return PageData(
+            parser.links,
+            parser.title or "",
+            parser.description or "",
+            parser.canonical or "",
+        )
+
+
+PARSER_BACKENDS: Dict[str, Callable[[], PageParser]] = {
+    "html.parser": lambda: SoupPageParser("html.parser"),
+    "lxml": lambda: SoupPageParser("lxml"),
+    "streaming": StreamingPageParser,
+}
+
+
+def get_page_parser(backend: str = DEFAULT_PARSER_BACKEND) -> PageParser:
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {backend}")
+    return PARSER_BACKENDS[backend]()
@@ -0,0 +1,63 @@
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from typing import Any, Optional
+
+from app.modules.page_parser.page_parser import PageData, PageParser
+
+PARSE_POOL_MIN_BYTES: int = 32 * 1024
+
+
+def _parse_in_worker(parser: PageParser, html: str) -> PageData:
+    return parser.parse(html)
+
+
+class ParsePool:
+    def __init__(self, workers: int, min_bytes: int = PARSE_POOL_MIN_BYTES) -> None:
+        self.workers: int = max(1, workers)
+        self.min_bytes: int = min_bytes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock: Lock = Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def parse(self, parser: PageParser, html: str) -> PageData:
+        if len(html) < self.min_bytes:
+            return parser.parse(html)
+        return self._get_executor().submit(_parse_in_worker, parser, html).result()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+_shared_pool: Optional[ParsePool] = None
+_shared_pool_lock: Lock = Lock()
+
+
+def get_parse_pool() -> Optional[ParsePool]:
+    with _shared_pool_lock:
+        return _shared_pool
+
+
+def configure_parse_pool(workers: int, **kwargs: Any) -> Optional[ParsePool]:
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is not None:
+            _shared_pool.close()
+            atexit.unregister(_shared_pool.close)
+            _shared_pool = None
+        if workers > 0:
+            _shared_pool = ParsePool(workers, **kwargs)
+            atexit.register(_shared_pool.close)
+        return _shared_pool
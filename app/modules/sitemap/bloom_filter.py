@@ -0,0 +1,51 @@
+import math
+from hashlib import blake2b
+from threading import Lock
+from typing import Iterator
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError(
+                "Bloom filter needs a positive capacity and 0 < error_rate < 1"
+            )
+        self.capacity: int = capacity
+        self.error_rate: float = error_rate
+        self.size: int = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes: int = max(1, round(self.size / capacity * math.log(2)))
+        self._bits: bytearray = bytearray((self.size + 7) // 8)
+        self._count: int = 0
+        self._lock: Lock = Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _positions(self, item: str) -> Iterator[int]:
+        digest: bytes = blake2b(item.encode(), digest_size=16).digest()
+        first: int = int.from_bytes(digest[:8], "little")
+        second: int = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hashes):
+            yield (first + index * second) % self.size
+
+    def __contains__(self, item: object) -> bool:
+        if not isinstance(item, str):
+            return False
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def add(self, item: str) -> bool:
+        added: bool = False
+        with self._lock:
+            for position in self._positions(item):
+                mask: int = 1 << (position & 7)
+                if not self._bits[position >> 3] & mask:
+                    self._bits[position >> 3] |= mask
+                    added = True
+            if added:
+                self._count += 1
+        return added
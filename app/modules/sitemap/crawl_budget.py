@@ -0,0 +1,36 @@
+from threading import Lock
+from typing import Optional
+
+
+class CrawlBudget:
+    def __init__(
+        self, max_pages: Optional[int] = None, max_bytes: Optional[int] = None
+    ) -> None:
+        self.max_pages: Optional[int] = max_pages or None
+        self.max_bytes: Optional[int] = max_bytes or None
+        self.pages: int = 0
+        self.bytes: int = 0
+        self._lock: Lock = Lock()
+
+    @property
+    def exhausted(self) -> bool:
+        return (self.max_pages is not None and self.pages >= self.max_pages) or (
+            self.max_bytes is not None and self.bytes >= self.max_bytes
+        )
+
+    def take(self, pages: int) -> int:
+        with self._lock:
+            if self.exhausted:
+                return 0
+            if self.max_pages is not None:
+                pages = min(pages, self.max_pages - self.pages)
+            self.pages += pages
+            return pages
+
+    def refund(self, pages: int) -> None:
+        with self._lock:
+            self.pages -= pages
+
+    def spend_bytes(self, size: int) -> None:
+        with self._lock:
+            self.bytes += size
@@ -0,0 +1,160 @@
+import json
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.modules.url_rules.canonical import UrlCanonicalizer
+
+
+def crawl_cache_key(
+    root: str,
+    max_depth: int,
+    exclude_substrings: Optional[List[str]] = None,
+    include_rules: Optional[List[str]] = None,
+    seed_sitemaps: bool = False,
+    check_external: bool = False,
+    render_js: bool = False,
+    collapse_duplicates: bool = False,
+    ignore_robots: bool = False,
+    canonicalizer: Optional[UrlCanonicalizer] = None,
+) -> str:
+    key: List[Any] = [
+        (canonicalizer or UrlCanonicalizer()).canonicalize(root),
+        max_depth,
+        sorted(set(exclude_substrings or [])),
+    ]
+    flags: List[bool] = [
+        seed_sitemaps,
+        check_external,
+        render_js,
+        collapse_duplicates,
+        ignore_robots,
+    ]
+    if include_rules or any(flags):
+        key.append(sorted(set(include_rules or [])))
+    while flags and not flags[-1]:
+        flags.pop()
+    key.extend(flags)
+    return json.dumps(key)
+
+
+class CrawlCache:
+    def __init__(
+        self,
+        ttl: float = 3600,
+        max_bytes: int = 256 * 1024 * 1024,
+        path: Optional[str] = None,
+        max_disk_bytes: int = 1024 * 1024 * 1024,
+    ) -> None:
+        self.ttl: float = ttl
+        self.max_bytes: int = max_bytes
+        self.max_disk_bytes: int = max_disk_bytes
+        self._entries: OrderedDict[str, Tuple[float, int, Dict[str, Any]]] = (
+            OrderedDict()
+        )
+        self._size: int = 0
+        self._lock: Lock = Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS crawl_cache ("
+                "key TEXT PRIMARY KEY, created_at REAL, accessed_at REAL, "
+                "size INTEGER, data BLOB)"
+            )
+            self._db.commit()
+
+    def _expired(self, created_at: float) -> bool:
+        return time.time() - created_at > self.ttl
+
+    def _remember(
+        self, key: str, created_at: float, size: int, data: Dict[str, Any]
+    ) -> None:
+        if key in self._entries:
+            self._size -= self._entries.pop(key)[1]
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (created_at, size, data)
+        self._size += size
+        while self._size > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+
+    def _forget(self, key: str) -> None:
+        if key in self._entries:
+            self._size -= self._entries.pop(key)[1]
+        if self._db is not None:
+            self._db.execute("DELETE FROM crawl_cache WHERE key = ?", (key,))
+            self._db.commit()
+
+    def _evict_disk(self, db: sqlite3.Connection) -> None:
+        rows: List[Tuple[str, int]] = db.execute(
+            "SELECT key, size FROM crawl_cache ORDER BY accessed_at DESC"
+        ).fetchall()
+        total: int = 0
+        stale: List[Tuple[str]] = []
+        for key, size in rows:
+            total += size
+            if total > self.max_disk_bytes:
+                stale.append((key,))
+        db.executemany("DELETE FROM crawl_cache WHERE key = ?", stale)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if key in self._entries:
+                created_at, _, data = self._entries[key]
+                if self._expired(created_at):
+                    self._forget(key)
+                    return None
+                self._entries.move_to_end(key)
+                return data
+
+            if self._db is None:
+                return None
+            row: Optional[Tuple[float, int, bytes]] = self._db.execute(
+                "SELECT created_at, size, data FROM crawl_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self._expired(row[0]):
+                self._forget(key)
+                return None
+
+            self._db.execute(
+                "UPDATE crawl_cache SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._db.commit()
+            stored: Dict[str, Any] = pickle.loads(row[2])
+            self._remember(key, row[0], row[1], stored)
+            return stored
+
+    def set(self, key: str, data: Dict[str, Any]) -> None:
+        payload: bytes = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        created_at: float = time.time()
+        with self._lock:
+            self._remember(key, created_at, len(payload), data)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO crawl_cache "
+                    "(key, created_at, accessed_at, size, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, created_at, created_at, len(payload), payload),
+                )
+                self._evict_disk(self._db)
+                self._db.commit()
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._forget(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM crawl_cache")
+                self._db.commit()
@@ -0,0 +1,91 @@
+import json
+import sqlite3
+from threading import Lock
+from typing import Dict, NamedTuple, Optional, Set, Tuple
+
+from app.modules.page_parser.page_parser import PageData
+
+
+class PageState(NamedTuple):
+    etag: str
+    last_modified: str
+    content_hash: str
+    page: PageData
+    status: int = 200
+
+
+class CrawlState:
+    def __init__(self, path: Optional[str] = None) -> None:
+        self._pages: Dict[str, PageState] = {}
+        self._dirty: Set[str] = set()
+        self._lock: Lock = Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS crawl_state ("
+                "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+                "content_hash TEXT, page TEXT, status INTEGER)"
+            )
+            columns: Set[str] = {
+                row[1] for row in self._db.execute("PRAGMA table_info(crawl_state)")
+            }
+            if "status" not in columns:
+                self._db.execute("ALTER TABLE crawl_state ADD COLUMN status INTEGER")
+            self._db.commit()
+
+    def get(self, url: str) -> Optional[PageState]:
+        with self._lock:
+            if url in self._pages or self._db is None:
+                return self._pages.get(url)
+            row: Optional[Tuple[str, str, str, str, Optional[int]]] = self._db.execute(
+                "SELECT etag, last_modified, content_hash, page, status "
+                "FROM crawl_state WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            return PageState(
+                row[0], row[1], row[2], PageData(*json.loads(row[3])), row[4] or 200
+            )
+
+    def set(self, url: str, state: PageState) -> None:
+        with self._lock:
+            self._pages[url] = state
+            self._dirty.add(url)
+
+    def save(self) -> None:
+        with self._lock:
+            if self._db is None:
+                self._dirty.clear()
+                return
+            self._db.executemany(
+                "INSERT OR REPLACE INTO crawl_state "
+                "(url, etag, last_modified, content_hash, page, status) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        url,
+                        self._pages[url].etag,
+                        self._pages[url].last_modified,
+                        self._pages[url].content_hash,
+                        json.dumps(list(self._pages[url].page)),
+                        self._pages[url].status,
+                    )
+                    for url in self._dirty
+                ],
+            )
+            self._db.commit()
+            self._pages.clear()
+            self._dirty.clear()
+
+    @staticmethod
+    def conditional_headers(state: Optional[PageState]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if state is None:
+            return headers
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+        return headers
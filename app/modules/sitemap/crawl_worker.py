@@ -0,0 +1,181 @@
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sys
+from contextlib import nullcontext
+from logging import getLogger
+from typing import IO, Any, Dict, Iterator, List, Optional
+
+from app.modules.exporters.exporters import (
+    SITEMAP_FIELDS,
+    frontier_records,
+    records_to_csv,
+    records_to_ndjson,
+)
+from app.modules.sitemap.frontier import SQLiteFrontierStore
+from app.modules.sitemap.sitemap import Sitemap
+
+logger = getLogger(__name__)
+
+
+def default_worker_id(index: int = 0) -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{index}"
+
+
+def run_worker(
+    root: str,
+    max_depth: int,
+    store_path: str,
+    worker_id: str,
+    **sitemap_options: Any,
+) -> int:
+    store: SQLiteFrontierStore = SQLiteFrontierStore(store_path)
+    try:
+        sitemap: Sitemap = Sitemap(root, max_depth, **sitemap_options)
+        sitemap.crawl_frontier(store, worker_id)
+        logger.info(
+            "Worker %s fetched %d pages (%d errors)",
+            worker_id,
+            sitemap.pages_fetched,
+            sitemap.errors,
+        )
+        return sitemap.pages_fetched
+    finally:
+        store.close()
+
+
+def _run_worker_process(
+    root: str,
+    max_depth: int,
+    store_path: str,
+    index: int,
+    sitemap_options: Dict[str, Any],
+) -> None:
+    run_worker(root, max_depth, store_path, default_worker_id(index), **sitemap_options)
+
+
+def crawl_with_workers(
+    root: str,
+    max_depth: int,
+    store_path: str,
+    workers: int,
+    **sitemap_options: Any,
+) -> int:
+    context = multiprocessing.get_context("spawn")
+    processes: List[Any] = [
+        context.Process(
+            target=_run_worker_process,
+            args=(root, max_depth, store_path, index, sitemap_options),
+        )
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    failed: int = 0
+    for index, process in enumerate(processes):
+        process.join()
+        if process.exitcode != 0:
+            logger.error("Worker %d exited with code %s", index, process.exitcode)
+            failed += 1
+    return failed
+
+
+def assemble(root: str, max_depth: int, store_path: str) -> Sitemap:
+    store: SQLiteFrontierStore = SQLiteFrontierStore(store_path)
+    try:
+        sitemap: Sitemap = Sitemap(root, max_depth)
+        sitemap.load_frontier(store)
+        return sitemap
+    finally:
+        store.close()
+
+
+def report_chunks(
+    root: str, max_depth: int, store_path: str, report_format: str
+) -> Iterator[str]:
+    if report_format == "json":
+        sitemap_data: Dict[str, Any] = assemble(root, max_depth, store_path).get()
+        sitemap_data["external"] = sorted(sitemap_data["external"])
+        yield json.dumps(sitemap_data) + "\n"
+        return
+
+    store: SQLiteFrontierStore = SQLiteFrontierStore(store_path)
+    try:
+        if report_format == "csv":
+            yield from records_to_csv(frontier_records(store), SITEMAP_FIELDS)
+        else:
+            yield from records_to_ndjson(frontier_records(store))
+    finally:
+        store.close()
+
+
+def write_report(
+    root: str,
+    max_depth: int,
+    store_path: str,
+    report_format: str,
+    output: Optional[str] = None,
+) -> None:
+    stream: IO[str]
+    with open(output, "w") if output else nullcontext(sys.stdout) as stream:
+        for chunk in report_chunks(root, max_depth, store_path, report_format):
+            stream.write(chunk)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Crawl a site from a shared frontier store."
+    )
+    parser.add_argument("root")
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--store", required=True, help="SQLite frontier file")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--respect-robots", action="store_true")
+    parser.add_argument("--seed-sitemaps", action="store_true")
+    parser.add_argument("--max-pages", type=int, help="page budget per worker")
+    parser.add_argument("--max-bytes", type=int, help="download budget per worker")
+    parser.add_argument(
+        "--collapse-duplicates",
+        action="store_true",
+        help="honor rel=canonical and skip near-duplicate pages",
+    )
+    parser.add_argument(
+        "--assemble-only",
+        action="store_true",
+        help="only build the result from what the workers wrote",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("json", "ndjson", "csv"),
+        default="json",
+        help="json assembles the sitemap in memory, ndjson and csv stream "
+        "page records straight from the store",
+    )
+    parser.add_argument("--output", help="write the report to a file")
+    args: argparse.Namespace = parser.parse_args(argv)
+
+    failed: int = 0
+    if not args.assemble_only:
+        failed = crawl_with_workers(
+            args.root,
+            args.depth,
+            args.store,
+            args.workers,
+            concurrency=args.concurrency,
+            respect_robots=args.respect_robots,
+            seed_from_sitemaps=args.seed_sitemaps,
+            max_pages=args.max_pages,
+            max_bytes=args.max_bytes,
+            honor_canonical=args.collapse_duplicates,
+            near_duplicate_distance=3 if args.collapse_duplicates else None,
+        )
+    write_report(args.root, args.depth, args.store, args.format, args.output)
+    if failed:
+        sys.exit(f"{failed} of {args.workers} workers failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+FRONTIER_PENDING: str = "pending"
+FRONTIER_LEASED: str = "leased"
+FRONTIER_DONE: str = "done"
+FRONTIER_FAILED: str = "failed"
+
+
+class PageResult(NamedTuple):
+    links: List[str]
+    external: List[str]
+    metadata: Optional[Dict[str, str]]
+    response: Dict[str, Any]
+
+
+class FrontierStore(ABC):
+    @abstractmethod
+    def add(self, urls: Iterable[Tuple[str, int]]) -> None: ...
+
+    @abstractmethod
+    def claim(
+        self, worker_id: str, limit: int, lease_seconds: float
+    ) -> List[Tuple[str, int]]: ...
+
+    @abstractmethod
+    def complete(
+        self, url: str, result: PageResult, new_urls: Iterable[Tuple[str, int]] = ()
+    ) -> None: ...
+
+    @abstractmethod
+    def pending(self) -> int: ...
+
+    @abstractmethod
+    def results(self) -> Iterator[Tuple[str, int, Optional[PageResult]]]: ...
+
+    @abstractmethod
+    def page_rows(self) -> Iterator[Tuple[str, int, PageResult, int]]: ...
+
+    @abstractmethod
+    def external_rows(self) -> Iterator[Tuple[str, int]]: ...
+
+    def is_finished(self) -> bool:
+        return self.pending() == 0
+
+
+class SQLiteFrontierStore(FrontierStore):
+    def __init__(self, path: str, max_attempts: int = 3) -> None:
+        self.path: str = path
+        self.max_attempts: int = max_attempts
+        self._lock: Lock = Lock()
+        self._db: sqlite3.Connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS frontier ("
+            "url TEXT PRIMARY KEY, depth INTEGER NOT NULL, state TEXT NOT NULL, "
+            "worker TEXT, lease_expires REAL, attempts INTEGER NOT NULL DEFAULT 0, "
+            "result TEXT)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS frontier_claim ON frontier (state, depth)"
+        )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def _insert(self, urls: Iterable[Tuple[str, int]]) -> None:
+        self._db.executemany(
+            "INSERT INTO frontier (url, depth, state) VALUES (?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET depth = excluded.depth, "
+            "state = CASE WHEN frontier.state = ? THEN excluded.state "
+            "ELSE frontier.state END, "
+            "attempts = CASE WHEN frontier.state = ? THEN 0 "
+            "ELSE frontier.attempts END "
+            "WHERE excluded.depth < frontier.depth",
+            [
+                (url, depth, FRONTIER_PENDING, FRONTIER_DONE, FRONTIER_DONE)
+                for url, depth in urls
+            ],
+        )
+
+    def add(self, urls: Iterable[Tuple[str, int]]) -> None:
+        with self._transaction():
+            self._insert(urls)
+
+    def claim(
+        self, worker_id: str, limit: int, lease_seconds: float
+    ) -> List[Tuple[str, int]]:
+        now: float = time.time()
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE frontier SET state = ?, result = ? "
+                "WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+                (
+                    FRONTIER_FAILED,
+                    json.dumps(PageResult([], [], None, {"status": None})),
+                    FRONTIER_LEASED,
+                    now,
+                    self.max_attempts,
+                ),
+            )
+            claimed: List[Tuple[str, int]] = db.execute(
+                "SELECT url, depth FROM frontier "
+                "WHERE state = ? OR (state = ? AND lease_expires < ?) "
+                "ORDER BY depth LIMIT ?",
+                (FRONTIER_PENDING, FRONTIER_LEASED, now, limit),
+            ).fetchall()
+            db.executemany(
+                "UPDATE frontier SET state = ?, worker = ?, lease_expires = ?, "
+                "attempts = attempts + 1 WHERE url = ?",
+                [
+                    (FRONTIER_LEASED, worker_id, now + lease_seconds, url)
+                    for url, _ in claimed
+                ],
+            )
+        return claimed
+
+    def complete(
+        self, url: str, result: PageResult, new_urls: Iterable[Tuple[str, int]] = ()
+    ) -> None:
+        state: str = FRONTIER_DONE if result.metadata is not None else FRONTIER_FAILED
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE frontier SET state = ?, result = ?, lease_expires = NULL "
+                "WHERE url = ?",
+                (state, json.dumps(result), url),
+            )
+            self._insert(new_urls)
+
+    def pending(self) -> int:
+        with self._lock:
+            row: Tuple[int] = self._db.execute(
+                "SELECT COUNT(*) FROM frontier WHERE state IN (?, ?)",
+                (FRONTIER_PENDING, FRONTIER_LEASED),
+            ).fetchone()
+        return row[0]
+
+    def results(self) -> Iterator[Tuple[str, int, Optional[PageResult]]]:
+        with self._lock:
+            rows: List[Tuple[str, int, Optional[str]]] = self._db.execute(
+                "SELECT url, depth, result FROM frontier ORDER BY depth, url"
+            ).fetchall()
+        for url, depth, result in rows:
+            yield url, depth, PageResult(*json.loads(result)) if result else None
+
+    def _stream(self, query: str) -> Iterator[Tuple[Any, ...]]:
+        reader: sqlite3.Connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            yield from reader.execute(query)
+        finally:
+            reader.close()
+
+    def page_rows(self) -> Iterator[Tuple[str, int, PageResult, int]]:
+        rows: Iterator[Tuple[Any, ...]] = self._stream(
+            "WITH incoming (target, total) AS ("
+            "SELECT link.value, COUNT(*) FROM frontier, "
+            "json_each(frontier.result, '$[0]') AS link "
+            "WHERE frontier.result IS NOT NULL GROUP BY link.value) "
+            "SELECT url, depth, result, COALESCE(total, 0) FROM frontier "
+            "LEFT JOIN incoming ON incoming.target = frontier.url "
+            "WHERE result IS NOT NULL ORDER BY depth, url"
+        )
+        for url, depth, result, incoming in rows:
+            yield url, depth, PageResult(*json.loads(result)), incoming
+
+    def external_rows(self) -> Iterator[Tuple[str, int]]:
+        for url, incoming in self._stream(
+            "SELECT link.value, COUNT(*) FROM frontier, "
+            "json_each(frontier.result, '$[1]') AS link "
+            "WHERE frontier.result IS NOT NULL GROUP BY link.value ORDER BY link.value"
+        ):
+            yield url, incoming
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
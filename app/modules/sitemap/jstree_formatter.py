@@ -1,63 +1,199 @@
-from typing import List, Set, Dict, Any, Tuple, Deque
-from collections import deque, defaultdict
+from typing import Iterator, List, Dict, Any, Optional, Set, Tuple, Deque
+from collections import deque
 
+EXTERNAL_ROOT_ID: str = "__external__"
+SEEDED_ROOT_ID: str = "__seeded__"
+SEEDED_ROOT_TEXT: str = "From sitemap.xml"
 
-def sitemap_to_jstree_formatter(sitemap: Dict[str, Any]) -> List[Dict[str, Any]]:
-    links_per_page: Dict[str, List[str]] = sitemap.get("internal", {})
-    response_status: Dict[str, Dict[str, Any]] = sitemap.get("response", {})
-    external_links: List[str] = sitemap.get("external", [])
-    root_url: str | None = sitemap.get("root")
-
-    if not root_url:
-        return []
-
-    nodes: List[Dict[str, Any]] = []
-    seen_node_ids: Set[str] = set()
-    url_min_depth: Dict[str, int] = defaultdict(lambda: float("inf"))  # type: ignore
 
+def _min_depths(root_url: str, links_per_page: Dict[str, List[str]]) -> Dict[str, int]:
+    url_min_depth: Dict[str, int] = {}
     queue: Deque[Tuple[str, int]] = deque([(root_url, 0)])
     while queue:
         current, depth = queue.popleft()
-        if depth < url_min_depth[current]:
-            url_min_depth[current] = depth
-            for child in links_per_page.get(current, []):
+        if current in url_min_depth:
+            continue
+        url_min_depth[current] = depth
+        for child in links_per_page.get(current, []):
+            if child not in url_min_depth:
                 queue.append((child, depth + 1))
+    return url_min_depth
 
-    def add_node(node_id: str, parent_id: str, text: str, icon: str) -> str:
-        unique_id: str = f"{parent_id}>{node_id}" if parent_id != "#" else node_id
-        if unique_id not in seen_node_ids:
-            seen_node_ids.add(unique_id)
-            node_data = {
-                "id": unique_id,
-                "parent": parent_id,
-                "text": text,
-                "icon": icon,
-            }
-            if node_id in response_status and "status" in response_status[node_id]:
-                node_data["status"] = response_status[node_id]["status"]
-            nodes.append(node_data)
-        return unique_id
 
-    def recurse(current_url: str, parent_id: str = "#", depth: int = 0) -> None:
-        raw_children: List[str] = links_per_page.get(current_url, [])
+class JsTreeIndex:
+    def __init__(self, sitemap: Dict[str, Any]) -> None:
+        self.root_url: Optional[str] = sitemap.get("root")
+        self.links_per_page: Dict[str, List[str]] = sitemap.get("internal", {})
+        self.response_status: Dict[str, Dict[str, Any]] = sitemap.get("response", {})
+        self.external_links: List[str] = sorted(
+            sitemap.get("external", []), key=lambda x: x.lower()
+        )
+        self.metadata: Dict[str, Dict[str, str]] = sitemap.get("metadata", {})
+        self.incoming: Dict[str, List[str]] = sitemap.get("incoming", {})
+        self.blocked: Set[str] = set(sitemap.get("blocked", []))
+        crawl_depths: Optional[Dict[str, int]] = sitemap.get("depths")
+        self.url_min_depth: Dict[str, int] = crawl_depths or (
+            _min_depths(self.root_url, self.links_per_page) if self.root_url else {}
+        )
+        self.orphans: List[str] = sorted(
+            (
+                url
+                for url in sitemap.get("seeded", [])
+                if url != self.root_url and self._is_orphan(url)
+            ),
+            key=lambda x: x.lower(),
+        )
+
+    def _is_orphan(self, url: str) -> bool:
+        depth: Optional[int] = self.url_min_depth.get(url)
+        return depth is not None and not any(
+            self.url_min_depth.get(parent) == depth - 1
+            for parent in self.incoming.get(url, [])
+        )
+
+    def children(self, url: str) -> List[str]:
+        child_depth: int = self.url_min_depth.get(url, -2) + 1
         visible_children: List[str] = [
-            child for child in raw_children if url_min_depth[child] == depth + 1
+            child
+            for child in self.links_per_page.get(url, [])
+            if self.url_min_depth.get(child) == child_depth
         ]
-
         visible_children.sort(key=lambda u: u.lower())
+        return visible_children
+
+    def node(self, url: str, icon: str) -> Dict[str, Any]:
+        node_data: Dict[str, Any] = {"text": url, "icon": icon}
+        if url in self.response_status and "status" in self.response_status[url]:
+            node_data["status"] = self.response_status[url]["status"]
+        return node_data
+
+    def page_node(self, url: str) -> Dict[str, Any]:
+        has_children: bool = bool(self.children(url))
+        icon: str = "fa fa-folder" if has_children else "fa-regular fa-file"
+        node_data: Dict[str, Any] = self.node(url, icon)
+        node_data["children"] = has_children
+        node_data["crawled"] = url in self.metadata
+        if url in self.blocked:
+            node_data["blocked"] = True
+        return node_data
+
+    def root_nodes(self) -> List[Dict[str, Any]]:
+        if not self.root_url:
+            return []
+        nodes: List[Dict[str, Any]] = [self.page_node(self.root_url)]
+        if self.orphans:
+            nodes.append(
+                {
+                    "id": SEEDED_ROOT_ID,
+                    "text": SEEDED_ROOT_TEXT,
+                    "icon": "fa fa-folder",
+                    "children": True,
+                }
+            )
+        if self.external_links:
+            nodes.append(
+                {
+                    "id": EXTERNAL_ROOT_ID,
+                    "text": "External Links",
+                    "icon": "fa fa-folder",
+                    "children": True,
+                }
+            )
+        return nodes
 
-        icon: str = "fa fa-folder" if visible_children else "fa-regular fa-file"
-        node_uid: str = add_node(current_url, parent_id, current_url, icon)
+    def child_nodes(self, url: str) -> List[Dict[str, Any]]:
+        if url == EXTERNAL_ROOT_ID:
+            return [self.node(ext, "fa fa-link") for ext in self.external_links]
+        if url == SEEDED_ROOT_ID:
+            return [self.page_node(orphan) for orphan in self.orphans]
+        return [self.page_node(child) for child in self.children(url)]
 
-        for child in visible_children:
-            recurse(child, node_uid, depth + 1)
+    def details(self, url: str) -> Dict[str, Any]:
+        return {
+            "url": url,
+            "metadata": self.metadata.get(url),
+            "incoming": self.incoming.get(url, []),
+        }
 
-    recurse(root_url)
+    def walk(self, start: Optional[str] = None) -> Iterator[Tuple[str, int, List[str]]]:
+        start = start or self.root_url
+        if not start:
+            return
+        stack: List[Tuple[str, int]] = [(start, 0)]
+        while stack:
+            url, depth = stack.pop()
+            children: List[str] = self.children(url)
+            yield url, depth, children
+            stack.extend((child, depth + 1) for child in reversed(children))
 
-    if external_links:
-        external_root: str = "__external__"
-        add_node(external_root, "#", "External Links", "fa fa-folder")
-        for ext in sorted(external_links, key=lambda x: x.lower()):
-            add_node(ext, external_root, ext, "fa fa-link")
+
+def _append_subtree(
+    nodes: List[Dict[str, Any]], index: JsTreeIndex, start: str, parent_id: str
+) -> None:
+    parent_ids: List[str] = [parent_id]
+    for url, depth, children in index.walk(start):
+        del parent_ids[depth + 1 :]
+        icon: str = "fa fa-folder" if children else "fa-regular fa-file"
+        node_id: str = f"node-{len(nodes)}"
+        nodes.append({"id": node_id, "parent": parent_ids[-1], **index.node(url, icon)})
+        parent_ids.append(node_id)
+
+
+def sitemap_to_jstree_formatter(sitemap: Dict[str, Any]) -> List[Dict[str, Any]]:
+    index: JsTreeIndex = JsTreeIndex(sitemap)
+    if not index.root_url:
+        return []
+
+    nodes: List[Dict[str, Any]] = []
+    _append_subtree(nodes, index, index.root_url, "#")
+    if index.orphans:
+        nodes.append(
+            {
+                "id": SEEDED_ROOT_ID,
+                "parent": "#",
+                "text": SEEDED_ROOT_TEXT,
+                "icon": "fa fa-folder",
+            }
+        )
+        for orphan in index.orphans:
+            _append_subtree(nodes, index, orphan, SEEDED_ROOT_ID)
+
+    if index.external_links:
+        nodes.append(
+            {
+                "id": EXTERNAL_ROOT_ID,
+                "parent": "#",
+                "text": "External Links",
+                "icon": "fa fa-folder",
+            }
+        )
+        for position, ext in enumerate(index.external_links):
+            nodes.append(
+                {
+                    "id": f"{EXTERNAL_ROOT_ID}-{position}",
+                    "parent": EXTERNAL_ROOT_ID,
+                    **index.node(ext, "fa fa-link"),
+                }
+            )
 
     return nodes
+
+
+def sitemap_to_text_outline(
+    sitemap: Dict[str, Any],
+    include_internal: bool = True,
+    include_external: bool = True,
+) -> Iterator[str]:
+    index: JsTreeIndex = JsTreeIndex(sitemap)
+    if include_internal:
+        for url, depth, _ in index.walk():
+            yield f"{'  ' * depth}- {url}\n"
+        if index.orphans:
+            yield f"- {SEEDED_ROOT_TEXT}\n"
+            for orphan in index.orphans:
+                for url, depth, _ in index.walk(orphan):
+                    yield f"{'  ' * (depth + 1)}- {url}\n"
+    if include_external and index.external_links:
+        yield "- External Links\n"
+        for ext in index.external_links:
+            yield f"  - {ext}\n"
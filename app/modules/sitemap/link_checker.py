@@ -0,0 +1,136 @@
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from requests import ConnectionError, RequestException, Response
+
+from app.modules.http_client.http_client import HttpClient, get_http_client
+from app.modules.metrics.metrics import Counter
+
+LINK_CHECKS: Counter = Counter(
+    "qatools_link_checks_total",
+    "External link checks by outcome.",
+    labelnames=("result",),
+)
+
+LinkStatus = Dict[str, Any]
+
+CHECKED_SCHEMES: Tuple[str, ...] = ("http", "https")
+
+
+class LinkCheckCache:
+    def __init__(self, ttl: float = 24 * 3600, max_entries: int = 100_000) -> None:
+        self.ttl: float = ttl
+        self.max_entries: int = max_entries
+        self._entries: OrderedDict[str, Tuple[float, LinkStatus]] = OrderedDict()
+        self._lock: Lock = Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, url: str) -> Optional[LinkStatus]:
+        with self._lock:
+            entry: Optional[Tuple[float, LinkStatus]] = self._entries.get(url)
+            if entry is None:
+                return None
+            checked_at, status = entry
+            if time.time() - checked_at > self.ttl:
+                del self._entries[url]
+                return None
+            self._entries.move_to_end(url)
+            return status
+
+    def set(self, url: str, status: LinkStatus) -> None:
+        with self._lock:
+            self._entries[url] = (time.time(), status)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class LinkChecker:
+    def __init__(
+        self,
+        client: Optional[HttpClient] = None,
+        concurrency: int = 8,
+        per_host_concurrency: int = 2,
+        cache: Optional[LinkCheckCache] = None,
+    ) -> None:
+        self.client: HttpClient = client or get_http_client()
+        self.concurrency: int = max(1, concurrency)
+        self.per_host_concurrency: int = max(1, per_host_concurrency)
+        self.cache: Optional[LinkCheckCache] = cache
+        self._host_slots: Dict[str, BoundedSemaphore] = {}
+        self._unreachable_hosts: Dict[str, str] = {}
+        self._lock: Lock = Lock()
+
+    def _host_slot(self, netloc: str) -> BoundedSemaphore:
+        with self._lock:
+            if netloc not in self._host_slots:
+                self._host_slots[netloc] = BoundedSemaphore(self.per_host_concurrency)
+            return self._host_slots[netloc]
+
+    def _request(self, url: str) -> LinkStatus:
+        response: Response = self.client.head(url, allow_redirects=True)
+        method: str = "HEAD"
+        if response.status_code >= 400:
+            response = self.client.get(url, allow_redirects=True, stream=True)
+            response.close()
+            method = "GET"
+        return {"status": response.status_code, "method": method}
+
+    def _check_one(self, url: str) -> LinkStatus:
+        netloc: str = urlparse(url).netloc
+        with self._host_slot(netloc):
+            unreachable: Optional[str] = self._unreachable_hosts.get(netloc)
+            if unreachable is not None:
+                LINK_CHECKS.inc(result="skipped")
+                return {"status": None, "error": unreachable}
+            try:
+                status: LinkStatus = self._request(url)
+            except ConnectionError as e:
+                with self._lock:
+                    self._unreachable_hosts[netloc] = str(e)
+                LINK_CHECKS.inc(result="error")
+                return {"status": None, "error": str(e)}
+            except RequestException as e:
+                LINK_CHECKS.inc(result="error")
+                return {"status": None, "error": str(e)}
+        LINK_CHECKS.inc(result="checked")
+        return status
+
+    def check(
+        self,
+        urls: Iterable[str],
+        on_checked: Optional[Callable[[int], None]] = None,
+    ) -> Dict[str, LinkStatus]:
+        results: Dict[str, LinkStatus] = {}
+        pending: List[str] = []
+        for url in dict.fromkeys(urls):
+            if urlparse(url).scheme.lower() not in CHECKED_SCHEMES:
+                continue
+            cached: Optional[LinkStatus] = self.cache.get(url) if self.cache else None
+            if cached is not None:
+                LINK_CHECKS.inc(result="cached")
+                results[url] = cached
+            else:
+                pending.append(url)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for index, (url, status) in enumerate(
+                zip(pending, executor.map(self._check_one, pending))
+            ):
+                results[url] = status
+                if self.cache is not None and status["status"] is not None:
+                    self.cache.set(url, status)
+                if on_checked is not None:
+                    on_checked(len(pending) - index - 1)
+        return results
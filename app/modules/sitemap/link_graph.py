@@ -0,0 +1,76 @@
+from array import array
+from typing import Dict, Iterable, List
+
+
+class LinkGraph:
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._urls: List[str] = []
+        self._outgoing: Dict[int, array[int]] = {}
+        self._incoming: Dict[int, array[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._ids
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(targets) for targets in self._incoming.values())
+
+    def intern(self, url: str) -> int:
+        node_id: int | None = self._ids.get(url)
+        if node_id is None:
+            node_id = len(self._urls)
+            self._ids[url] = node_id
+            self._urls.append(url)
+        return node_id
+
+    def url(self, node_id: int) -> str:
+        return self._urls[node_id]
+
+    def _unlink(self, page_id: int) -> None:
+        for target_id, sources in self._incoming.items():
+            if page_id in sources:
+                self._incoming[target_id] = array(
+                    "I", (source_id for source_id in sources if source_id != page_id)
+                )
+
+    def add_page(
+        self, url: str, internal: Iterable[str], external: Iterable[str] = ()
+    ) -> None:
+        page_id: int = self.intern(url)
+        if page_id in self._outgoing:
+            self._unlink(page_id)
+
+        internal_ids: array[int] = array("I", dict.fromkeys(map(self.intern, internal)))
+        external_ids: array[int] = array("I", dict.fromkeys(map(self.intern, external)))
+        self._outgoing[page_id] = internal_ids
+        self._incoming.setdefault(page_id, array("I"))
+        for target_id in (*internal_ids, *external_ids):
+            self._incoming.setdefault(target_id, array("I")).append(page_id)
+
+    def is_page(self, url: str) -> bool:
+        return self._ids.get(url, -1) in self._outgoing
+
+    def links(self, url: str) -> List[str]:
+        return [self._urls[target_id] for target_id in self._outgoing[self._ids[url]]]
+
+    def incoming(self, url: str) -> List[str]:
+        node_id: int | None = self._ids.get(url)
+        if node_id is None or node_id not in self._incoming:
+            return []
+        return [self._urls[source_id] for source_id in self._incoming[node_id]]
+
+    def internal_links(self) -> Dict[str, List[str]]:
+        return {
+            self._urls[page_id]: [self._urls[target_id] for target_id in targets]
+            for page_id, targets in self._outgoing.items()
+        }
+
+    def incoming_links(self) -> Dict[str, List[str]]:
+        return {
+            self._urls[node_id]: [self._urls[source_id] for source_id in sources]
+            for node_id, sources in self._incoming.items()
+        }
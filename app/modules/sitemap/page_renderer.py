@@ -0,0 +1,98 @@
+import re
+import time
+from logging import getLogger
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+
+from app.modules.metrics.metrics import Counter
+from app.modules.page_parser.page_parser import PageData, visible_text
+from app.modules.sitemap.crawl_budget import CrawlBudget
+
+if TYPE_CHECKING:
+    from app.modules.meta_tags.browser_pool import BrowserPool
+
+logger = getLogger(__name__)
+
+FRAMEWORK_MARKERS: Tuple[str, ...] = (
+    'id="root"',
+    'id="app"',
+    'id="__next"',
+    'id="___gatsby"',
+    "__next_data__",
+    "__nuxt__",
+    "data-reactroot",
+    "data-server-rendered",
+    "data-v-app",
+    "ng-version",
+    "ng-app",
+)
+NOSCRIPT_PATTERN: re.Pattern[str] = re.compile(
+    r"<noscript\b[^>]*>[^<]*enable javascript", re.IGNORECASE
+)
+LINK_COUNT_SCRIPT: str = "return document.querySelectorAll('a[href]').length"
+
+PAGE_RENDERS: Counter = Counter(
+    "qatools_page_renders_total",
+    "Pages handed to the headless browser by outcome.",
+    labelnames=("result",),
+)
+
+
+def visible_text_length(html: str) -> int:
+    return len("".join(visible_text(html).split()))
+
+
+class PageRenderer:
+    def __init__(
+        self,
+        pool: "BrowserPool",
+        max_pages: Optional[int] = None,
+        min_links: int = 3,
+        min_text_chars: int = 200,
+        timeout: float = 20,
+        settle_seconds: float = 2,
+        poll_interval: float = 0.1,
+    ) -> None:
+        self.pool: "BrowserPool" = pool
+        self.budget: CrawlBudget = CrawlBudget(max_pages)
+        self.min_links: int = min_links
+        self.min_text_chars: int = min_text_chars
+        self.timeout: float = timeout
+        self.settle_seconds: float = settle_seconds
+        self.poll_interval: float = poll_interval
+
+    def reason(self, html: str, page: PageData) -> Optional[str]:
+        if len(page.links) >= self.min_links:
+            return None
+        lowered: str = html.lower()
+        if any(marker in lowered for marker in FRAMEWORK_MARKERS):
+            return "framework"
+        if NOSCRIPT_PATTERN.search(html):
+            return "noscript"
+        if visible_text_length(html) < self.min_text_chars:
+            return "empty"
+        return None
+
+    def _settle(self, driver: Any) -> None:
+        deadline: float = time.monotonic() + self.settle_seconds
+        while (
+            driver.execute_script(LINK_COUNT_SCRIPT) < self.min_links
+            and time.monotonic() < deadline
+        ):
+            time.sleep(self.poll_interval)
+
+    def render(self, url: str) -> Optional[str]:
+        if not self.budget.take(1):
+            PAGE_RENDERS.inc(result="over_budget")
+            return None
+        try:
+            with self.pool.session(timeout=self.timeout) as driver:
+                driver.set_page_load_timeout(self.timeout)
+                driver.get(url)
+                self._settle(driver)
+                html: str = driver.page_source
+        except Exception as e:
+            logger.warning("Failed to render %s: %s", url, e)
+            PAGE_RENDERS.inc(result="failed")
+            return None
+        PAGE_RENDERS.inc(result="rendered")
+        return html
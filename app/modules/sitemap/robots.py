@@ -0,0 +1,134 @@
+import io
+import zlib
+from logging import getLogger
+from typing import Deque, Dict, Iterator, List, Set, Tuple
+from collections import deque
+from urllib.parse import urlparse, ParseResult
+from urllib.robotparser import RobotFileParser
+from xml.etree.ElementTree import ParseError, iterparse
+
+from requests import RequestException, Response
+
+from app.modules.http_client.http_client import HttpClient
+
+logger = getLogger(__name__)
+
+ROBOTS_USER_AGENT: str = "qatools"
+SITEMAP_NAMESPACE: str = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+MAX_SITEMAP_FILES: int = 50
+MAX_SITEMAP_URLS: int = 50000
+MAX_SITEMAP_BYTES: int = 50 * 1024 * 1024
+SITEMAP_CHUNK_SIZE: int = 64 * 1024
+
+
+def site_root(url: str) -> str:
+    parsed_url: ParseResult = urlparse(url)
+    return f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+
+class RobotsPolicy:
+    def __init__(
+        self, robots_txt: str = "", user_agent: str = ROBOTS_USER_AGENT
+    ) -> None:
+        self.user_agent: str = user_agent
+        self._parser: RobotFileParser = RobotFileParser()
+        self._parser.parse(robots_txt.splitlines())
+
+    def can_fetch(self, url: str) -> bool:
+        return self._parser.can_fetch(self.user_agent, url)
+
+    @property
+    def crawl_delay(self) -> float:
+        delay: float = float(self._parser.crawl_delay(self.user_agent) or 0)
+        request_rate = self._parser.request_rate(self.user_agent)
+        if request_rate is not None and request_rate.requests > 0:
+            delay = max(delay, request_rate.seconds / request_rate.requests)
+        return delay
+
+    @property
+    def sitemaps(self) -> List[str]:
+        return self._parser.site_maps() or []
+
+
+def fetch_robots(client: HttpClient, url: str) -> RobotsPolicy:
+    robots_url: str = f"{site_root(url)}/robots.txt"
+    try:
+        response: Response = client.get(robots_url)
+    except RequestException as e:
+        logger.warning("Could not fetch %s: %s", robots_url, e)
+        return RobotsPolicy()
+    if response.status_code >= 400:
+        return RobotsPolicy()
+    return RobotsPolicy(response.text)
+
+
+def _read_sitemap(response: Response, max_bytes: int) -> bytes:
+    body: bytearray = bytearray()
+    for chunk in response.iter_content(chunk_size=SITEMAP_CHUNK_SIZE):
+        body.extend(chunk)
+        if len(body) > max_bytes:
+            raise ValueError(f"sitemap is larger than {max_bytes} bytes")
+    return bytes(body)
+
+
+def _gunzip(content: bytes, max_bytes: int) -> bytes:
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    body: bytearray = bytearray()
+    while content and not decompressor.eof:
+        body.extend(decompressor.decompress(content, SITEMAP_CHUNK_SIZE))
+        if len(body) > max_bytes:
+            raise ValueError(f"sitemap expands beyond {max_bytes} bytes")
+        content = decompressor.unconsumed_tail
+    return bytes(body)
+
+
+def _sitemap_entries(content: bytes, max_bytes: int) -> Iterator[Tuple[str, str]]:
+    if content[:2] == b"\x1f\x8b":
+        content = _gunzip(content, max_bytes)
+    loc: str = ""
+    for _, element in iterparse(io.BytesIO(content)):
+        tag: str = element.tag.replace(SITEMAP_NAMESPACE, "")
+        if tag == "loc":
+            loc = (element.text or "").strip()
+        elif tag in ("url", "sitemap"):
+            if loc:
+                yield tag, loc
+            loc = ""
+            element.clear()
+
+
+def fetch_sitemap_urls(
+    client: HttpClient,
+    sitemap_urls: List[str],
+    max_files: int = MAX_SITEMAP_FILES,
+    max_urls: int = MAX_SITEMAP_URLS,
+    max_bytes: int = MAX_SITEMAP_BYTES,
+) -> List[str]:
+    page_urls: Dict[str, None] = {}
+    queue: Deque[str] = deque(sitemap_urls)
+    seen: Set[str] = set(sitemap_urls)
+    fetched: int = 0
+
+    while queue and fetched < max_files and len(page_urls) < max_urls:
+        sitemap_url: str = queue.popleft()
+        fetched += 1
+        try:
+            response: Response = client.get(sitemap_url, stream=True)
+            try:
+                response.raise_for_status()
+                content: bytes = _read_sitemap(response, max_bytes)
+            finally:
+                response.close()
+            for tag, loc in _sitemap_entries(content, max_bytes):
+                if tag == "sitemap":
+                    if loc not in seen:
+                        seen.add(loc)
+                        queue.append(loc)
+                    continue
+                page_urls[loc] = None
+                if len(page_urls) >= max_urls:
+                    break
+        except (RequestException, ParseError, OSError, ValueError) as e:
+            logger.warning("Could not read sitemap %s: %s", sitemap_url, e)
+
+    return list(page_urls)
@@ -0,0 +1,71 @@
+import re
+from hashlib import blake2b
+from threading import Lock
+from typing import Dict, List, Optional, Set, Tuple
+
+SIMHASH_BITS: int = 64
+WORD_PATTERN: re.Pattern[str] = re.compile(r"\w+")
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(blake2b(feature.encode(), digest_size=8).digest(), "big")
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    words: List[str] = WORD_PATTERN.findall(text.lower())
+    features: Set[str] = {
+        " ".join(words[index : index + shingle_size])
+        for index in range(max(1, len(words) - shingle_size + 1))
+    }
+    features.discard("")
+    if not features:
+        return 0
+
+    planes: List[int] = []
+    for feature in features:
+        carry: int = _feature_hash(feature)
+        for index, plane in enumerate(planes):
+            planes[index] = plane ^ carry
+            carry &= plane
+            if not carry:
+                break
+        if carry:
+            planes.append(carry)
+
+    fingerprint: int = 0
+    for bit in range(SIMHASH_BITS):
+        ones: int = sum(((plane >> bit) & 1) << i for i, plane in enumerate(planes))
+        if ones * 2 > len(features):
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class SimhashIndex:
+    def __init__(self, max_distance: int = 3) -> None:
+        self.max_distance: int = max_distance
+        self.blocks: int = max_distance + 1
+        self._block_bits: int = -(-SIMHASH_BITS // self.blocks)
+        self._buckets: Dict[Tuple[int, int], List[Tuple[int, str]]] = {}
+        self._lock: Lock = Lock()
+
+    def _keys(self, fingerprint: int) -> List[Tuple[int, int]]:
+        mask: int = (1 << self._block_bits) - 1
+        return [
+            (block, (fingerprint >> (block * self._block_bits)) & mask)
+            for block in range(self.blocks)
+        ]
+
+    def add(self, fingerprint: int, url: str) -> Optional[str]:
+        keys: List[Tuple[int, int]] = self._keys(fingerprint)
+        with self._lock:
+            for key in keys:
+                for other, other_url in self._buckets.get(key, []):
+                    if hamming_distance(fingerprint, other) <= self.max_distance:
+                        return other_url
+            for key in keys:
+                self._buckets.setdefault(key, []).append((fingerprint, url))
+        return None
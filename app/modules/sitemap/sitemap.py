@@ -1,137 +1,651 @@
-from typing import List, Set, Dict, Any, Optional, Tuple
-from requests import get, Response, RequestException
-from bs4 import BeautifulSoup, Tag
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from hashlib import sha256
+from threading import BoundedSemaphore, Lock
+from typing import Callable, Iterator, List, Set, Dict, Any, Optional, Tuple
+from requests import Response, RequestException
 from urllib.parse import urlparse, urljoin, ParseResult
 from logging import getLogger
 
+from app.modules.http_client.http_client import HttpClient, get_http_client
+from app.modules.metrics.metrics import Counter, Gauge, Histogram
+from app.modules.page_parser.page_parser import (
+    PageData,
+    PageParser,
+    get_page_parser,
+    visible_text,
+)
+from app.modules.page_parser.parse_pool import ParsePool
+from app.modules.sitemap.bloom_filter import BloomFilter
+from app.modules.sitemap.crawl_budget import CrawlBudget
+from app.modules.sitemap.crawl_state import CrawlState, PageState
+from app.modules.sitemap.frontier import FrontierStore, PageResult
+from app.modules.sitemap.link_checker import LinkChecker
+from app.modules.sitemap.link_graph import LinkGraph
+from app.modules.sitemap.page_renderer import PageRenderer
+from app.modules.sitemap.simhash import SimhashIndex, simhash
+from app.modules.sitemap.robots import (
+    RobotsPolicy,
+    fetch_robots,
+    fetch_sitemap_urls,
+    site_root,
+)
+from app.modules.url_rules.canonical import UrlCanonicalizer
+from app.modules.url_rules.url_rules import UrlRules
+
 logger = getLogger(__name__)
 
+HTML_CONTENT_TYPES: Tuple[str, ...] = ("text/html", "application/xhtml+xml")
+MAX_PAGE_BYTES: int = 5 * 1024 * 1024
+BODY_CHUNK_SIZE: int = 64 * 1024
+
+CRAWL_PHASE_SECONDS: Histogram = Histogram(
+    "qatools_crawl_phase_seconds",
+    "Time spent in each crawl phase per page.",
+    labelnames=("phase",),
+)
+CRAWL_RESPONSES: Counter = Counter(
+    "qatools_crawl_responses_total",
+    "Crawl responses by HTTP status.",
+    labelnames=("status",),
+)
+CRAWL_RESPONSE_BYTES: Counter = Counter(
+    "qatools_crawl_response_bytes_total", "Response body bytes downloaded by crawls."
+)
+CRAWL_PAGES: Counter = Counter(
+    "qatools_crawl_pages_total",
+    "Crawled pages by outcome.",
+    labelnames=("result",),
+)
+CRAWL_REQUESTS_IN_FLIGHT: Gauge = Gauge(
+    "qatools_crawl_requests_in_flight", "Crawl requests currently waiting on a host."
+)
+CRAWL_DUPLICATES: Counter = Counter(
+    "qatools_crawl_duplicates_total",
+    "Crawled pages collapsed into another page, by reason.",
+    labelnames=("reason",),
+)
+CRAWLS_IN_PROGRESS: Gauge = Gauge(
+    "qatools_crawls_in_progress", "Sitemap crawls currently running."
+)
+
 
 class Sitemap:
     def __init__(
-        self, root: str, max_depth: int, exclude_substrings: Optional[List[str]] = None
+        self,
+        root: str,
+        max_depth: int,
+        exclude_substrings: Optional[List[str]] = None,
+        concurrency: int = 1,
+        per_host_concurrency: Optional[int] = None,
+        client: Optional[HttpClient] = None,
+        parser: Optional[PageParser] = None,
+        on_progress: Optional[Callable[..., None]] = None,
+        state: Optional[CrawlState] = None,
+        include_rules: Optional[List[str]] = None,
+        respect_robots: bool = False,
+        seed_from_sitemaps: bool = False,
+        parse_pool: Optional[ParsePool] = None,
+        max_pages: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        link_checker: Optional[LinkChecker] = None,
+        max_page_bytes: int = MAX_PAGE_BYTES,
+        renderer: Optional[PageRenderer] = None,
+        canonicalizer: Optional[UrlCanonicalizer] = None,
+        honor_canonical: bool = False,
+        near_duplicate_distance: Optional[int] = None,
     ) -> None:
-        self.root: str = Sitemap._normalize_url(root)
+        self.canonicalizer: UrlCanonicalizer = canonicalizer or UrlCanonicalizer()
+        self.honor_canonical: bool = honor_canonical
+        self.root: str = self.canonicalizer.canonicalize(root)
         self.max_depth: int = max_depth
         self.exclude_substrings: List[str] = exclude_substrings or []
-        self.internal_links: Dict[str, List[str]] = {}
+        self.include_rules: List[str] = include_rules or []
+        self.rules: UrlRules = UrlRules(self.include_rules, self.exclude_substrings)
+        self.concurrency: int = max(1, concurrency)
+        self.per_host_concurrency: int = max(
+            1, per_host_concurrency or self.concurrency
+        )
+        self.client: HttpClient = client or get_http_client()
+        self.parser: PageParser = parser or get_page_parser()
+        self.parse_pool: Optional[ParsePool] = parse_pool
+        self.link_checker: Optional[LinkChecker] = link_checker
+        self.max_page_bytes: int = max_page_bytes
+        self.renderer: Optional[PageRenderer] = renderer
+        self.on_progress: Optional[Callable[..., None]] = on_progress
+        self.state: Optional[CrawlState] = state
+        self.respect_robots: bool = respect_robots
+        self.seed_from_sitemaps: bool = seed_from_sitemaps
+        self.robots: RobotsPolicy = RobotsPolicy()
+        self.blocked: Set[str] = set()
+        self.seeded: List[str] = []
+        self.budget: CrawlBudget = CrawlBudget(max_pages, max_bytes)
+        self.truncated: bool = False
+        self.pages_fetched: int = 0
+        self.pages_reused: int = 0
+        self.pages_skipped: int = 0
+        self.pages_rendered: int = 0
+        self.pages_collapsed: int = 0
+        self.errors: int = 0
+        self._counters_lock: Lock = Lock()
+        self.graph: LinkGraph = LinkGraph()
         self.external_links: Set[str] = set()
         self.metadata: Dict[str, Dict[str, str]] = {}
-        self.incoming_links: Dict[str, List[str]] = {}
         self.response_data: Dict[str, Dict[str, Any]] = {}
+        self.depths: Dict[str, int] = {}
+        self._host_slots: Dict[str, BoundedSemaphore] = {}
+        self._host_slots_lock: Lock = Lock()
+        self._host_delays: Dict[str, float] = {}
+        self._host_next_request: Dict[str, float] = {}
+        self._seen: Optional[BloomFilter] = None
+        self._fingerprints: Optional[SimhashIndex] = (
+            SimhashIndex(near_duplicate_distance)
+            if near_duplicate_distance is not None
+            else None
+        )
 
     @staticmethod
-    def _normalize_url(url: str) -> str:
-        return url.rstrip("/") if url != "/" else url
+    def _is_html(content_type: str) -> bool:
+        media_type: str = content_type.split(";")[0].strip().lower()
+        return not media_type or media_type in HTML_CONTENT_TYPES
 
-    def _request_get(self, url: str) -> Optional[Response]:
+    def _read_body(self, response: Response) -> Tuple[int, bool]:
+        body: bytearray = bytearray()
+        truncated: bool = False
+        for chunk in response.iter_content(chunk_size=BODY_CHUNK_SIZE):
+            body.extend(chunk)
+            if len(body) > self.max_page_bytes:
+                del body[self.max_page_bytes :]
+                truncated = True
+                break
+        response._content = bytes(body)
+        return len(body), truncated
+
+    def _request_get(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> Optional[Response]:
+        started: float = time.perf_counter()
         try:
-            response: Response = get(url, timeout=10)
-            response.raise_for_status()
+            with CRAWL_REQUESTS_IN_FLIGHT.track_inprogress():
+                response: Response = self.client.get(url, headers=headers, stream=True)
+            try:
+                response.raise_for_status()
+                content_type: str = response.headers.get("Content-Type", "")
+                html: bool = Sitemap._is_html(content_type)
+                size, truncated = self._read_body(response) if html else (0, False)
+            finally:
+                response.close()
         except RequestException as e:
             status: Optional[int] = getattr(e.response, "status_code", None)
             self.response_data[url] = {"status": status}
+            CRAWL_RESPONSES.inc(status=str(status or "error"))
+            return None
+
+        total: float = time.perf_counter() - started
+        ttfb: float = min(total, response.elapsed.total_seconds())
+        CRAWL_PHASE_SECONDS.observe(ttfb, phase="ttfb")
+        CRAWL_PHASE_SECONDS.observe(total - ttfb, phase="download")
+        CRAWL_RESPONSES.inc(status=str(response.status_code))
+        CRAWL_RESPONSE_BYTES.inc(size)
+        self.budget.spend_bytes(size)
+        self.response_data[url] = {
+            "status": response.status_code,
+            "ttfb_ms": round(ttfb * 1000, 1),
+            "download_ms": round((total - ttfb) * 1000, 1),
+            "bytes": size,
+        }
+        if content_type:
+            self.response_data[url]["content_type"] = content_type
+        if truncated:
+            self.response_data[url]["truncated"] = True
+        if not html:
+            self.response_data[url]["skipped"] = True
+            with self._counters_lock:
+                self.pages_skipped += 1
             return None
         return response
 
-    @staticmethod
-    def _extract_tags(soup: BeautifulSoup) -> Tuple[str, str, str]:
-        title: str = (
-            soup.title.string.strip() if soup.title and soup.title.string else ""
-        )
-        description_tag: Optional[Tag] = soup.find(  # type: ignore
-            "meta", attrs={"name": "description"}
+    def _parse(self, url: str, html: str) -> PageData:
+        started: float = time.perf_counter()
+        page: PageData = (
+            self.parse_pool.parse(self.parser, html)
+            if self.parse_pool is not None
+            else self.parser.parse(html)
         )
-        description: str = (
-            description_tag["content"].strip()  # type: ignore
-            if description_tag and "content" in description_tag.attrs
-            else ""
-        )
-        canonical_tag: Optional[Tag] = soup.find("link", rel="canonical")  # type: ignore
-        canonical: str = (
-            canonical_tag["href"].strip()  # type: ignore
-            if canonical_tag and "href" in canonical_tag.attrs
-            else ""
+        elapsed: float = time.perf_counter() - started
+        CRAWL_PHASE_SECONDS.observe(elapsed, phase="parse")
+        self.response_data[url]["parse_ms"] = round(elapsed * 1000, 1)
+        return page
+
+    def _render(
+        self, renderer: PageRenderer, url: str, page: PageData, reason: str
+    ) -> Optional[PageData]:
+        started: float = time.perf_counter()
+        with self._host_turn(url):
+            html: Optional[str] = renderer.render(url)
+        elapsed: float = time.perf_counter() - started
+        CRAWL_PHASE_SECONDS.observe(elapsed, phase="render")
+        self.response_data[url]["render_ms"] = round(elapsed * 1000, 1)
+        if html is None:
+            self.response_data[url]["render_failed"] = reason
+            return None
+
+        rendered: PageData = self._parse(url, html)
+        self.response_data[url]["rendered"] = reason
+        with self._counters_lock:
+            self.pages_rendered += 1
+        return self._fingerprint(
+            PageData(
+                list(dict.fromkeys([*page.links, *rendered.links])),
+                rendered.title or page.title,
+                rendered.description or page.description,
+                page.canonical or rendered.canonical,
+            ),
+            html,
         )
-        return title, description, canonical
 
-    def _should_exclude(self, url: str) -> bool:
-        return any(substring in url for substring in self.exclude_substrings)
+    def _fingerprint(self, page: PageData, html: str) -> PageData:
+        if self._fingerprints is None:
+            return page
+        return page._replace(fingerprint=simhash(visible_text(html)))
+
+    def _render_reason(self, html: str, page: PageData) -> Optional[str]:
+        return self.renderer.reason(html, page) if self.renderer else None
+
+    def _parse_page(self, url: str, html: str) -> PageData:
+        page: PageData = self._parse(url, html)
+        if self.renderer is not None:
+            reason: Optional[str] = self.renderer.reason(html, page)
+            if reason is not None:
+                rendered: Optional[PageData] = self._render(
+                    self.renderer, url, page, reason
+                )
+                if rendered is not None:
+                    return rendered
+        return self._fingerprint(page, html)
 
-    def _process_page_a_tags(self, url: str, soup: BeautifulSoup) -> None:
-        normalized_url: str = Sitemap._normalize_url(url)
+    def _extract_links(self, url: str, hrefs: List[str]) -> Tuple[List[str], List[str]]:
+        normalized_url: str = self.canonicalizer.canonicalize(url)
         parsed_url: ParseResult = urlparse(url)
         base_url: str = f"{parsed_url.scheme}://{parsed_url.netloc}"
-        page_links: List[str] = []
-
-        for a_tag in soup.find_all("a", href=True):
-            if not isinstance(a_tag, Tag):
-                continue
+        page_links: Dict[str, None] = {}
+        page_external_links: Dict[str, None] = {}
 
-            href: str = str(a_tag["href"])
+        for href in hrefs:
             full_url: str = urljoin(base_url, href)
-            clean_url: str = Sitemap._normalize_url(full_url.split("#")[0])
-            if self._should_exclude(clean_url):
-                continue
-
+            clean_url: str = self.canonicalizer.canonicalize(full_url)
             parsed_href: ParseResult = urlparse(clean_url)
 
             if parsed_href.netloc == parsed_url.netloc:
-                if clean_url != normalized_url and clean_url not in page_links:
-                    page_links.append(clean_url)
-            else:
-                self.external_links.add(clean_url)
-                if clean_url not in self.incoming_links:
-                    self.incoming_links[clean_url] = []
-                if normalized_url not in self.incoming_links[clean_url]:
-                    self.incoming_links[clean_url].append(normalized_url)
-
-        self.internal_links[normalized_url] = page_links
-
-    def _extract_links(
-        self, url: str, visited: Optional[Set[str]] = None, current_depth: int = 0
-    ) -> None:
-        if visited is None:
-            visited = set()
+                if clean_url != normalized_url and self.rules.allows(clean_url):
+                    page_links[clean_url] = None
+            elif not self.rules.excludes(clean_url):
+                page_external_links[clean_url] = None
+
+        return list(page_links), list(page_external_links)
+
+    def _process_page_a_tags(
+        self, url: str, hrefs: List[str]
+    ) -> Tuple[List[str], List[str]]:
+        page_links, page_external_links = self._extract_links(url, hrefs)
+        self.external_links.update(page_external_links)
+        self.graph.add_page(
+            self.canonicalizer.canonicalize(url), page_links, page_external_links
+        )
+        return page_links, page_external_links
 
-        normalized_url: str = Sitemap._normalize_url(url)
-        if normalized_url in visited or self._should_exclude(normalized_url):
+    @contextmanager
+    def _host_turn(self, url: str) -> Iterator[None]:
+        netloc: str = urlparse(url).netloc
+        with self._host_slots_lock:
+            if netloc not in self._host_slots:
+                self._host_slots[netloc] = BoundedSemaphore(self.per_host_concurrency)
+            slot: BoundedSemaphore = self._host_slots[netloc]
+
+        with slot:
+            delay: float = self._host_delays.get(netloc, 0)
+            if delay > 0:
+                with self._host_slots_lock:
+                    now: float = time.monotonic()
+                    start: float = max(now, self._host_next_request.get(netloc, now))
+                    self._host_next_request[netloc] = start + delay
+                time.sleep(start - now)
+            yield
+
+    def _robots_allow(self, url: str) -> bool:
+        if not self.respect_robots or self.robots.can_fetch(url):
+            return True
+        self.blocked.add(url)
+        return False
+
+    def _load_robots(self) -> None:
+        if not self.respect_robots and not self.seed_from_sitemaps:
             return
+        self.robots = fetch_robots(self.client, self.root)
+        if self.respect_robots:
+            self._host_delays[urlparse(self.root).netloc] = self.robots.crawl_delay
+        if self.seed_from_sitemaps:
+            netloc: str = urlparse(self.root).netloc
+            sitemap_urls: List[str] = self.robots.sitemaps or [
+                f"{site_root(self.root)}/sitemap.xml"
+            ]
+            self.seeded = [
+                url
+                for url in dict.fromkeys(
+                    self.canonicalizer.canonicalize(url)
+                    for url in fetch_sitemap_urls(self.client, sitemap_urls)
+                )
+                if urlparse(url).netloc == netloc and self.rules.allows(url)
+            ]
 
-        visited.add(normalized_url)
-        response: Optional[Response] = self._request_get(url)
+    def _seed_frontier(self, frontier: List[str]) -> None:
+        for url in self.seeded:
+            if url in self.depths:
+                continue
+            self.depths[url] = 1
+            if self._robots_allow(url):
+                frontier.append(url)
+
+    def _fetch_page(self, url: str) -> Optional[PageData]:
+        previous: Optional[PageState] = self.state.get(url) if self.state else None
+        with self._host_turn(url):
+            response: Optional[Response] = self._request_get(
+                url,
+                (
+                    None
+                    if self.renderer
+                    or (previous and self._needs_fingerprint(previous.page))
+                    else CrawlState.conditional_headers(previous)
+                ),
+            )
         if not response:
-            return
+            return None
+        if self.state is None:
+            return self._parse_page(url, response.text)
 
-        soup: BeautifulSoup = BeautifulSoup(response.text, "html.parser")
-        self._process_page_a_tags(url, soup)
-        title, description, canonical = Sitemap._extract_tags(soup)
-        self.metadata[normalized_url] = {
-            "title": title,
-            "description": description,
-            "canonical": canonical,
+        if response.status_code == 304 and previous is not None:
+            self.response_data[url]["status"] = previous.status
+            self.response_data[url]["not_modified"] = True
+            self._count_reused()
+            return previous.page
+
+        content_hash: str = sha256(response.content).hexdigest()
+        if (
+            previous is not None
+            and previous.content_hash == content_hash
+            and self._render_reason(response.text, previous.page) is None
+        ):
+            self._count_reused()
+            page: PageData = (
+                self._fingerprint(previous.page, response.text)
+                if self._needs_fingerprint(previous.page)
+                else previous.page
+            )
+        else:
+            page = self._parse_page(url, response.text)
+        self.state.set(
+            url,
+            PageState(
+                response.headers.get("ETag", ""),
+                response.headers.get("Last-Modified", ""),
+                content_hash,
+                page,
+                response.status_code,
+            ),
+        )
+        return page
+
+    def _needs_fingerprint(self, page: PageData) -> bool:
+        return self._fingerprints is not None and not page.fingerprint
+
+    def _count_failure(self, url: str) -> None:
+        if not self.response_data.get(url, {}).get("skipped"):
+            self.errors += 1
+
+    def _count_reused(self) -> None:
+        with self._counters_lock:
+            self.pages_reused += 1
+
+    def _process_page(
+        self,
+        url: str,
+        page: PageData,
+        retain: bool = True,
+        duplicate_of: Optional[str] = None,
+    ) -> PageResult:
+        started: float = time.perf_counter()
+        links: List[str]
+        external: List[str]
+        if duplicate_of is not None:
+            links, external = [duplicate_of], []
+            if retain:
+                self.graph.add_page(self.canonicalizer.canonicalize(url), links)
+        elif retain:
+            links, external = self._process_page_a_tags(url, page.links)
+        else:
+            links, external = self._extract_links(url, page.links)
+        elapsed: float = time.perf_counter() - started
+        CRAWL_PHASE_SECONDS.observe(elapsed, phase="links")
+        response: Dict[str, Any] = (
+            self.response_data.get(url, {})
+            if retain
+            else self.response_data.pop(url, {})
+        )
+        if response:
+            response["links_ms"] = round(elapsed * 1000, 1)
+        metadata: Dict[str, str] = {
+            "title": page.title,
+            "description": page.description,
+            "canonical": page.canonical,
         }
+        if retain:
+            self.metadata[self.canonicalizer.canonicalize(url)] = metadata
+        return PageResult(links, external, metadata, response)
+
+    def _duplicate_of(
+        self, url: str, page: PageData, response: Dict[str, Any]
+    ) -> Optional[str]:
+        original: Optional[str] = None
+        reason: str = "canonical"
+        if self.honor_canonical and page.canonical:
+            canonical: str = self.canonicalizer.canonicalize(
+                urljoin(url, page.canonical)
+            )
+            if (
+                canonical != url
+                and urlparse(canonical).netloc == urlparse(url).netloc
+                and self.rules.allows(canonical)
+            ):
+                original = canonical
+        if original is None and self._fingerprints is not None and page.fingerprint:
+            original = self._fingerprints.add(page.fingerprint, url)
+            reason = "near_duplicate"
+        if original is None:
+            return None
+        response["duplicate_of"] = original
+        self.pages_collapsed += 1
+        CRAWL_DUPLICATES.inc(reason=reason)
+        return original
+
+    def _report_progress(self, queue_size: int) -> None:
+        if self.on_progress is not None:
+            self.on_progress(
+                pages_fetched=self.pages_fetched,
+                queue_size=queue_size,
+                errors=self.errors,
+            )
+
+    def _crawl(self) -> None:
+        self._load_robots()
+        if self.rules.excludes(self.root) or not self._robots_allow(self.root):
+            return
+
+        self.depths[self.root] = 0
+        frontier: List[str] = [self.root]
+        depth: int = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while frontier:
+                allowed: int = self.budget.take(len(frontier))
+                if allowed < len(frontier):
+                    self.truncated = True
+                    frontier = frontier[:allowed]
+                next_frontier: List[str] = []
+                pages: Iterator[Optional[PageData]] = executor.map(
+                    self._fetch_page, frontier
+                )
+                for index, (url, page) in enumerate(zip(frontier, pages)):
+                    if page is None:
+                        self._count_failure(url)
+                    else:
+                        self.pages_fetched += 1
+                        duplicate_of: Optional[str] = self._duplicate_of(
+                            url, page, self.response_data.setdefault(url, {})
+                        )
+                        result: PageResult = self._process_page(
+                            url, page, duplicate_of=duplicate_of
+                        )
+                        for link in result.links:
+                            if link in self.depths:
+                                continue
+                            self.depths[link] = depth + 1
+                            if depth < self.max_depth and self._robots_allow(link):
+                                next_frontier.append(link)
+
+                    self._report_progress(
+                        len(frontier) - index - 1 + len(next_frontier)
+                    )
+
+                if depth == 0 and self.max_depth > 0:
+                    self._seed_frontier(next_frontier)
+                frontier = next_frontier
+                depth += 1
+
+    def _frontier_result(
+        self, url: str, depth: int, page: Optional[PageData]
+    ) -> Tuple[PageResult, List[Tuple[str, int]]]:
+        if page is None:
+            self._count_failure(url)
+            return PageResult([], [], None, self.response_data.pop(url, {})), []
 
-        if current_depth < self.max_depth:
-            for link in self.internal_links[normalized_url]:
-                self._extract_links(
-                    link, visited=visited, current_depth=current_depth + 1
+        self.pages_fetched += 1
+        duplicate_of: Optional[str] = self._duplicate_of(
+            url, page, self.response_data.setdefault(url, {})
+        )
+        result: PageResult = self._process_page(
+            url, page, retain=False, duplicate_of=duplicate_of
+        )
+        if depth >= self.max_depth:
+            return result, []
+        new_urls: List[Tuple[str, int]] = [
+            (link, depth + 1)
+            for link in result.links
+            if self._mark_seen(link) and self._robots_allow(link)
+        ]
+        return result, new_urls
+
+    def _mark_seen(self, url: str) -> bool:
+        return self._seen is None or self._seen.add(url)
+
+    def crawl_frontier(
+        self,
+        store: FrontierStore,
+        worker_id: str,
+        batch_size: Optional[int] = None,
+        lease_seconds: float = 60,
+        poll_interval: float = 0.5,
+        expected_urls: int = 1_000_000,
+    ) -> None:
+        self._seen = BloomFilter(expected_urls)
+        self._load_robots()
+        if self.rules.excludes(self.root) or not self._robots_allow(self.root):
+            return
+
+        self._mark_seen(self.root)
+        store.add([(self.root, 0)])
+        if self.max_depth > 0:
+            store.add(
+                [
+                    (url, 1)
+                    for url in self.seeded
+                    if self._mark_seen(url) and self._robots_allow(url)
+                ]
+            )
+        with CRAWLS_IN_PROGRESS.track_inprogress(), ThreadPoolExecutor(
+            max_workers=self.concurrency
+        ) as executor:
+            while True:
+                allowed: int = self.budget.take(batch_size or self.concurrency * 4)
+                if not allowed:
+                    self.truncated = not store.is_finished()
+                    break
+                claimed: List[Tuple[str, int]] = store.claim(
+                    worker_id, allowed, lease_seconds
+                )
+                self.budget.refund(allowed - len(claimed))
+                if not claimed:
+                    if store.is_finished():
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                pages: Iterator[Optional[PageData]] = executor.map(
+                    self._fetch_page, [url for url, _ in claimed]
                 )
+                for (url, depth), page in zip(claimed, pages):
+                    store.complete(url, *self._frontier_result(url, depth, page))
+                    self._report_progress(store.pending())
 
-    def _process_incoming_links(self) -> None:
-        for parent_url, children in self.internal_links.items():
-            for child_url in children:
-                if child_url not in self.incoming_links:
-                    self.incoming_links[child_url] = []
-                self.incoming_links[child_url].append(parent_url)
+        self._count_pages()
+        if self.state is not None:
+            self.state.save()
 
-        for url in self.internal_links:
-            if url not in self.incoming_links:
-                self.incoming_links[url] = []
+    def load_frontier(self, store: FrontierStore) -> None:
+        self.truncated = not store.is_finished()
+        for url, depth, result in store.results():
+            self.depths[url] = min(depth, self.depths.get(url, depth))
+            if result is None:
+                continue
+            if result.response:
+                self.response_data[url] = result.response
+            if result.metadata is None:
+                continue
+            self.graph.add_page(url, result.links, result.external)
+            self.external_links.update(result.external)
+            self.metadata[url] = result.metadata
+            for link in result.links:
+                self.depths[link] = min(depth + 1, self.depths.get(link, depth + 1))
+
+    @property
+    def internal_links(self) -> Dict[str, List[str]]:
+        return self.graph.internal_links()
+
+    @property
+    def incoming_links(self) -> Dict[str, List[str]]:
+        return self.graph.incoming_links()
+
+    def _count_pages(self) -> None:
+        CRAWL_PAGES.inc(self.pages_fetched - self.pages_reused, result="fetched")
+        CRAWL_PAGES.inc(self.pages_reused, result="reused")
+        CRAWL_PAGES.inc(self.errors, result="error")
+        CRAWL_PAGES.inc(self.pages_skipped, result="skipped")
+
+    def check_external_links(self) -> None:
+        if self.link_checker is None:
+            return
+        self.response_data.update(
+            self.link_checker.check(
+                sorted(self.external_links), on_checked=self._report_progress
+            )
+        )
 
     def collect(self) -> None:
-        self._extract_links(self.root)
-        self._process_incoming_links()
+        with CRAWLS_IN_PROGRESS.track_inprogress():
+            self._crawl()
+            self.check_external_links()
+        self._count_pages()
+        if self.state is not None:
+            self.state.save()
 
     def get(self) -> Dict[str, Any]:
         return {
@@ -141,4 +655,8 @@ class Sitemap:
             "metadata": self.metadata,
             "incoming": self.incoming_links,
             "response": self.response_data,
+            "depths": self.depths,
+            "seeded": self.seeded,
+            "blocked": sorted(self.blocked),
+            "truncated": self.truncated,
         }
@@ -0,0 +1,95 @@
+import re
+from fnmatch import translate
+from functools import lru_cache
+from typing import Callable, Iterable, List, Optional, Pattern, Tuple
+from urllib.parse import SplitResult, unquote_plus, urlsplit, urlunsplit
+
+from app.modules.url_rules.url_rules import MATCH_CACHE_SIZE
+
+TRACKING_PARAMS: Tuple[str, ...] = (
+    "utm_*",
+    "gclid",
+    "gbraid",
+    "wbraid",
+    "dclid",
+    "fbclid",
+    "msclkid",
+    "yclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "_ga",
+    "_gl",
+)
+SESSION_PARAMS: Tuple[str, ...] = (
+    "jsessionid",
+    "phpsessid",
+    "aspsessionid*",
+    "sessionid",
+    "cfid",
+    "cftoken",
+)
+DEFAULT_PORTS: Tuple[Tuple[str, int], ...] = (("http", 80), ("https", 443))
+
+
+def compile_params(patterns: Iterable[str]) -> Optional[Pattern[str]]:
+    unique: List[str] = list(dict.fromkeys(p.lower() for p in patterns if p))
+    if not unique:
+        return None
+    return re.compile("|".join(rf"(?:{translate(p)})" for p in unique))
+
+
+class UrlCanonicalizer:
+    def __init__(
+        self,
+        drop_params: Iterable[str] = (*TRACKING_PARAMS, *SESSION_PARAMS),
+        sort_query: bool = True,
+        lowercase_path: bool = False,
+        cache_size: int = MATCH_CACHE_SIZE,
+    ) -> None:
+        self.drop_params: Optional[Pattern[str]] = compile_params(drop_params)
+        self.sort_query: bool = sort_query
+        self.lowercase_path: bool = lowercase_path
+        self.canonicalize: Callable[[str], str] = lru_cache(maxsize=cache_size)(
+            self._canonicalize
+        )
+
+    def _keeps(self, name: str) -> bool:
+        return self.drop_params is None or not self.drop_params.match(name.lower())
+
+    def _path(self, path: str) -> str:
+        segment, *params = path.split(";")
+        kept: List[str] = [p for p in params if self._keeps(p.split("=", 1)[0])]
+        if self.lowercase_path:
+            segment = segment.lower()
+        segment = segment.rstrip("/") or "/"
+        return ";".join([segment, *kept])
+
+    def _query(self, query: str) -> str:
+        pairs: List[str] = [
+            pair
+            for pair in query.split("&")
+            if pair and self._keeps(unquote_plus(pair.split("=", 1)[0]))
+        ]
+        if self.sort_query:
+            pairs.sort()
+        return "&".join(pairs)
+
+    def _canonicalize(self, url: str) -> str:
+        try:
+            parts: SplitResult = urlsplit(url.strip())
+            port: Optional[int] = parts.port
+        except ValueError:
+            return url.split("#")[0].rstrip("/") or url
+        scheme: str = parts.scheme.lower()
+        netloc: str = (parts.hostname or "").rstrip(".")
+        if ":" in netloc:
+            netloc = f"[{netloc}]"
+        if port is not None and (scheme, port) not in DEFAULT_PORTS:
+            netloc = f"{netloc}:{port}"
+        if parts.username or parts.password:
+            netloc = f"{parts.netloc.rsplit('@', 1)[0]}@{netloc}"
+        canonical: str = urlunsplit(
+            (scheme, netloc, self._path(parts.path), self._query(parts.query), "")
+        )
+        return canonical.rstrip("/") if canonical != "/" else canonical
@@ -0,0 +1,52 @@
+import re
+from fnmatch import translate
+from functools import lru_cache
+from typing import Callable, List, Optional, Pattern
+
+REGEX_PREFIX: str = "re:"
+GLOB_PREFIX: str = "glob:"
+MATCH_CACHE_SIZE: int = 65536
+
+
+def _rule_to_pattern(rule: str) -> str:
+    if rule.startswith(REGEX_PREFIX):
+        return f"(?:{rule[len(REGEX_PREFIX):]})"
+    if rule.startswith(GLOB_PREFIX):
+        return rf"\A{translate(rule[len(GLOB_PREFIX):])}"
+    return re.escape(rule)
+
+
+def compile_rules(rules: Optional[List[str]]) -> Optional[Pattern[str]]:
+    unique_rules: List[str] = list(dict.fromkeys(rule for rule in rules or [] if rule))
+    if not unique_rules:
+        return None
+    for rule in unique_rules:
+        try:
+            re.compile(_rule_to_pattern(rule))
+        except re.error as e:
+            raise ValueError(f"Invalid URL rule {rule!r}: {e}") from e
+    return re.compile("|".join(_rule_to_pattern(rule) for rule in unique_rules))
+
+
+class UrlRules:
+    def __init__(
+        self,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        cache_size: int = MATCH_CACHE_SIZE,
+    ) -> None:
+        self.include: Optional[Pattern[str]] = compile_rules(include)
+        self.exclude: Optional[Pattern[str]] = compile_rules(exclude)
+        self.excludes: Callable[[str], bool] = lru_cache(maxsize=cache_size)(
+            self._excludes
+        )
+        self.allows: Callable[[str], bool] = lru_cache(maxsize=cache_size)(self._allows)
+
+    def includes(self, url: str) -> bool:
+        return self.include is None or self.include.search(url) is not None
+
+    def _excludes(self, url: str) -> bool:
+        return self.exclude is not None and self.exclude.search(url) is not None
+
+    def _allows(self, url: str) -> bool:
+        return self.includes(url) and not self.excludes(url)
@@ -0,0 +1,178 @@
+import gzip
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+import pytest
+from flask import Flask, jsonify
+from flask.wrappers import Response
+
+from app.modules.api.api import (
+    ApiRecord,
+    OrjsonProvider,
+    RecordCache,
+    filter_records,
+    gzip_response,
+    meta_tags_api_records,
+    paginate,
+    sitemap_api_records,
+    status_matcher,
+)
+
+SITEMAP: Dict[str, Any] = {
+    "root": "https://example.com",
+    "internal": {
+        "https://example.com": ["https://example.com/a"],
+        "https://example.com/a": [],
+    },
+    "external": {"https://z.example.org", "https://external.com"},
+    "metadata": {"https://example.com": {"title": "Home", "description": ""}},
+    "incoming": {"https://example.com/a": ["https://example.com"]},
+    "response": {
+        "https://example.com": {"status": 200, "ttfb_ms": 12.5},
+        "https://example.com/a": {"status": 404},
+        "https://example.com/down": {"status": None},
+        "https://external.com": {"status": 301},
+    },
+    "depths": {"https://example.com": 0, "https://example.com/a": 1},
+    "blocked": ["https://example.com/private"],
+}
+
+
+def _urls(records: Any) -> List[str]:
+    return [record["url"] for record in records]
+
+
+def test_sitemap_api_records_include_nodes_metadata_and_incoming() -> None:
+    records: List[ApiRecord] = sitemap_api_records(SITEMAP)
+    assert _urls(records) == [
+        "https://example.com",
+        "https://example.com/a",
+        "https://example.com/down",
+        "https://example.com/private",
+        "https://external.com",
+        "https://z.example.org",
+    ]
+    assert records[0] == {
+        "url": "https://example.com",
+        "type": "internal",
+        "depth": 0,
+        "status": 200,
+        "response": {"status": 200, "ttfb_ms": 12.5},
+        "metadata": {"title": "Home", "description": ""},
+        "incoming": [],
+        "blocked": False,
+    }
+    assert records[1]["incoming"] == ["https://example.com"]
+    assert records[3]["type"] == "internal"
+    assert records[3]["blocked"] is True
+    assert records[5]["type"] == "external"
+    assert records[5]["response"] is None
+
+
+def test_meta_tags_api_records() -> None:
+    assert meta_tags_api_records({"https://example.com": {"title": "T"}}) == [
+        {"url": "https://example.com", "tags": {"title": "T"}}
+    ]
+
+
+@pytest.mark.parametrize(
+    "status, expected",
+    [
+        ("ok", ["https://example.com", "https://external.com"]),
+        ("error", ["https://example.com/a", "https://example.com/down"]),
+        ("4xx", ["https://example.com/a"]),
+        ("3xx", ["https://external.com"]),
+        ("200", ["https://example.com"]),
+    ],
+)
+def test_filter_records_by_status(status: str, expected: List[str]) -> None:
+    records: List[ApiRecord] = sitemap_api_records(SITEMAP)
+    assert _urls(filter_records(records, status=status)) == expected
+
+
+def test_status_matcher_rejects_unknown_filters() -> None:
+    with pytest.raises(ValueError):
+        status_matcher("broken")
+    with pytest.raises(ValueError):
+        status_matcher("9xx")
+
+
+def test_filter_records_by_depth_prefix_and_type() -> None:
+    records: List[ApiRecord] = sitemap_api_records(SITEMAP)
+    assert _urls(filter_records(records, depth=1)) == ["https://example.com/a"]
+    assert _urls(filter_records(records, prefix="https://example.com/")) == [
+        "https://example.com/a",
+        "https://example.com/down",
+        "https://example.com/private",
+    ]
+    assert _urls(filter_records(records, link_type="external")) == [
+        "https://external.com",
+        "https://z.example.org",
+    ]
+    assert _urls(filter_records(records, status="ok", link_type="internal")) == [
+        "https://example.com"
+    ]
+    assert filter_records(records) is records
+
+
+def test_paginate_counts_total_and_next_offset() -> None:
+    records: List[ApiRecord] = [{"url": str(index)} for index in range(5)]
+    page: Dict[str, Any] = paginate(iter(records), offset=2, limit=2)
+    assert page == {
+        "total": 5,
+        "offset": 2,
+        "limit": 2,
+        "next_offset": 4,
+        "items": [{"url": "2"}, {"url": "3"}],
+    }
+    last: Dict[str, Any] = paginate(records, offset=4, limit=2)
+    assert last["items"] == [{"url": "4"}]
+    assert last["next_offset"] is None
+    assert paginate(records, offset=10, limit=2)["items"] == []
+
+
+def test_orjson_provider_serializes_responses() -> None:
+    app: Flask = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    with app.app_context():
+        response: Response = jsonify({"url": "https://example.com/é", 1: [None]})
+        assert response.mimetype == "application/json"
+        assert response.get_data() == (
+            '{"url":"https://example.com/é","1":[null]}'.encode()
+        )
+        assert app.json.loads(app.json.dumps({"a": [1, 2]})) == {"a": [1, 2]}
+
+
+def test_gzip_response_compresses_large_bodies() -> None:
+    body: bytes = b'{"items":[' + b'"x",' * 500 + b'"x"]}'
+    response: Response = gzip_response(
+        Response(body, mimetype="application/json"), min_bytes=1024
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.vary
+    assert gzip.decompress(response.get_data()) == body
+    assert len(response.get_data()) < len(body)
+
+
+def test_gzip_response_leaves_small_or_special_responses_alone() -> None:
+    small: Response = gzip_response(Response(b"{}"), min_bytes=1024)
+    assert "Content-Encoding" not in small.headers
+    not_modified: Response = gzip_response(Response(status=304), min_bytes=0)
+    assert "Content-Encoding" not in not_modified.headers
+    streamed: Response = gzip_response(Response(iter([b"{}"])), min_bytes=0)
+    assert "Content-Encoding" not in streamed.headers
+
+
+def test_record_cache_builds_once_and_evicts_oldest() -> None:
+    cache: RecordCache[List[ApiRecord]] = RecordCache(max_entries=2)
+    build: MagicMock = MagicMock(return_value=[{"url": "a"}])
+    assert cache.get_or_build(("1", "sitemap"), build) == [{"url": "a"}]
+    assert cache.get_or_build(("1", "sitemap"), build) == [{"url": "a"}]
+    build.assert_called_once()
+
+    cache.get_or_build(("2", "sitemap"), build)
+    cache.get_or_build(("1", "sitemap"), build)
+    cache.get_or_build(("3", "sitemap"), build)
+    assert len(cache) == 2
+    cache.get_or_build(("2", "sitemap"), build)
+    assert build.call_count == 4
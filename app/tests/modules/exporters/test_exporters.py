@@ -0,0 +1,209 @@
+import csv
+import json
+from typing import Any, Dict, Iterator, List
+from unittest.mock import MagicMock
+from xml.etree import ElementTree
+
+from app.modules.exporters.exporters import (
+    META_TAGS_FIELDS,
+    SITEMAP_FIELDS,
+    frontier_records,
+    meta_tags_records,
+    records_to_csv,
+    records_to_ndjson,
+    sitemap_page_records,
+    sitemap_records,
+    sitemap_to_xml,
+)
+from app.modules.sitemap.frontier import PageResult
+
+SITEMAP: Dict[str, Any] = {
+    "root": "https://example.com",
+    "internal": {
+        "https://example.com": ["https://example.com/a?x=1&y=2"],
+        "https://example.com/a?x=1&y=2": [],
+        "https://example.com/gone": [],
+    },
+    "external": ["https://external.com"],
+    "metadata": {"https://example.com": {"title": 'Home, "sweet"', "description": ""}},
+    "incoming": {"https://example.com/a?x=1&y=2": ["https://example.com"]},
+    "response": {
+        "https://example.com/gone": {"status": 410},
+        "https://example.com/broken": {"status": 500},
+    },
+    "depths": {"https://example.com": 0, "https://example.com/a?x=1&y=2": 1},
+}
+
+
+def test_sitemap_to_xml_is_valid_and_skips_errors() -> None:
+    document: str = "".join(sitemap_to_xml(SITEMAP))
+    root: ElementTree.Element = ElementTree.fromstring(document)
+    namespace: str = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+    locs: List[str] = [loc.text or "" for loc in root.iter(f"{namespace}loc")]
+    assert locs == ["https://example.com", "https://example.com/a?x=1&y=2"]
+    assert "&amp;" in document
+
+
+def test_sitemap_to_xml_skips_collapsed_duplicates() -> None:
+    sitemap: Dict[str, Any] = {
+        "internal": {"https://example.com/a": [], "https://example.com/a-print": []},
+        "response": {
+            "https://example.com/a": {"status": 200},
+            "https://example.com/a-print": {
+                "status": 200,
+                "duplicate_of": "https://example.com/a",
+            },
+        },
+    }
+    assert "".join(sitemap_to_xml(sitemap)).count("<loc>") == 1
+
+
+def test_sitemap_to_xml_yields_one_chunk_per_url() -> None:
+    chunks: Iterator[str] = sitemap_to_xml(
+        {"internal": {f"https://example.com/{i}": [] for i in range(1000)}}
+    )
+    assert next(chunks).startswith("<?xml")
+    assert next(chunks) == "  <url><loc>https://example.com/0</loc></url>\n"
+    assert len(list(chunks)) == 1000
+
+
+def test_sitemap_records() -> None:
+    records: List[Dict[str, Any]] = list(sitemap_records(SITEMAP))
+    assert [(record["url"], record["type"]) for record in records] == [
+        ("https://example.com", "internal"),
+        ("https://example.com/a?x=1&y=2", "internal"),
+        ("https://example.com/gone", "internal"),
+        ("https://example.com/broken", "internal"),
+        ("https://external.com", "external"),
+    ]
+    assert records[1] == {
+        "url": "https://example.com/a?x=1&y=2",
+        "type": "internal",
+        "depth": 1,
+        "status": None,
+        "title": "",
+        "description": "",
+        "incoming": 1,
+    }
+    assert records[3]["status"] == 500
+
+
+def test_sitemap_records_do_not_repeat_checked_external_links() -> None:
+    sitemap: Dict[str, Any] = {
+        **SITEMAP,
+        "response": {**SITEMAP["response"], "https://external.com": {"status": 404}},
+    }
+    records: List[Dict[str, Any]] = list(sitemap_records(sitemap))
+    assert [record["url"] for record in records].count("https://external.com") == 1
+    assert records[-1]["type"] == "external"
+    assert records[-1]["status"] == 404
+
+
+def test_sitemap_records_are_derived_from_page_records() -> None:
+    sitemap: Dict[str, Any] = {
+        **SITEMAP,
+        "blocked": ["https://example.com/gone", "https://example.com/private"],
+    }
+    pages: List[Dict[str, Any]] = list(sitemap_page_records(sitemap))
+    rows: List[Dict[str, Any]] = list(sitemap_records(sitemap))
+
+    assert [page["url"] for page in pages] == [row["url"] for row in rows]
+    assert pages[0]["metadata"] == {"title": 'Home, "sweet"', "description": ""}
+    assert pages[1]["incoming"] == ["https://example.com"]
+    assert pages[2]["response"] == {"status": 410}
+    assert [page["url"] for page in pages if page["blocked"]] == [
+        "https://example.com/gone",
+        "https://example.com/private",
+    ]
+    assert rows[4] == {
+        "url": "https://example.com/private",
+        "type": "internal",
+        "depth": None,
+        "status": None,
+        "title": "",
+        "description": "",
+        "incoming": 0,
+    }
+
+
+def test_frontier_records_stream_from_store() -> None:
+    store: MagicMock = MagicMock()
+    store.page_rows.return_value = iter(
+        [
+            (
+                "https://example.com",
+                0,
+                PageResult(
+                    [], [], {"title": "Home", "description": "D"}, {"status": 200}
+                ),
+                0,
+            ),
+            (
+                "https://example.com/gone",
+                1,
+                PageResult([], [], None, {"status": 410}),
+                2,
+            ),
+        ]
+    )
+    store.external_rows.return_value = iter([("https://external.com", 3)])
+
+    records: List[Dict[str, Any]] = list(frontier_records(store))
+    assert records[0] == {
+        "url": "https://example.com",
+        "type": "internal",
+        "depth": 0,
+        "status": 200,
+        "title": "Home",
+        "description": "D",
+        "incoming": 0,
+    }
+    assert (records[1]["status"], records[1]["title"], records[1]["incoming"]) == (
+        410,
+        "",
+        2,
+    )
+    assert records[2] == {
+        "url": "https://external.com",
+        "type": "external",
+        "depth": None,
+        "status": None,
+        "title": "",
+        "description": "",
+        "incoming": 3,
+    }
+
+
+def test_records_to_ndjson() -> None:
+    lines: List[str] = list(records_to_ndjson(sitemap_records(SITEMAP)))
+    assert len(lines) == 5
+    assert all(line.endswith("\n") for line in lines)
+    assert json.loads(lines[0])["title"] == 'Home, "sweet"'
+
+
+def test_records_to_csv_yields_quoted_rows() -> None:
+    rows: List[str] = list(records_to_csv(sitemap_records(SITEMAP), SITEMAP_FIELDS))
+    assert rows[0] == ",".join(SITEMAP_FIELDS) + "\r\n"
+    assert len(rows) == 6
+    parsed: List[Dict[str, str]] = list(csv.DictReader("".join(rows).splitlines()))
+    assert parsed[0]["title"] == 'Home, "sweet"'
+    assert parsed[0]["depth"] == "0"
+
+
+def test_meta_tags_records_to_csv() -> None:
+    meta_tags: Dict[str, Dict[str, str]] = {
+        "https://example.com": {
+            "title": "Home",
+            "description": "Desc",
+            "bytes_saved": "10",
+        },
+        "https://example.com/a": {},
+    }
+    rows: List[str] = list(
+        records_to_csv(meta_tags_records(meta_tags), META_TAGS_FIELDS)
+    )
+    assert rows == [
+        "url,title,description\r\n",
+        "https://example.com,Home,Desc\r\n",
+        "https://example.com/a,,\r\n",
+    ]
@@ -0,0 +1,92 @@
+from email.message import Message
+from unittest.mock import patch, MagicMock
+from urllib.request import Request
+from requests.adapters import HTTPAdapter
+from app.modules.http_client import http_client
+from app.modules.http_client.http_client import (
+    DEFAULT_HEADERS,
+    HttpClient,
+    configure_http_client,
+    get_http_client,
+)
+
+
+def test_default_headers_and_custom_headers_are_merged() -> None:
+    client: HttpClient = HttpClient(headers={"Accept-Language": "en"})
+    assert client.session.headers["User-Agent"] == DEFAULT_HEADERS["User-Agent"]
+    assert client.session.headers["Accept-Language"] == "en"
+
+
+@patch("app.modules.http_client.http_client.Session.get")
+def test_get_applies_default_timeout(mock_get: MagicMock) -> None:
+    client: HttpClient = HttpClient(timeout=3)
+    client.get("https://example.com")
+    mock_get.assert_called_once_with("https://example.com", timeout=3)
+
+
+@patch("app.modules.http_client.http_client.Session.get")
+def test_get_keeps_explicit_timeout(mock_get: MagicMock) -> None:
+    client: HttpClient = HttpClient(timeout=3)
+    client.get("https://example.com", timeout=1, stream=True)
+    mock_get.assert_called_once_with("https://example.com", timeout=1, stream=True)
+
+
+@patch("app.modules.http_client.http_client.Session.head")
+def test_head_applies_default_timeout(mock_head: MagicMock) -> None:
+    client: HttpClient = HttpClient(timeout=5)
+    client.head("https://example.com")
+    mock_head.assert_called_once_with("https://example.com", timeout=5)
+
+
+def test_pool_sizes_per_host() -> None:
+    client: HttpClient = HttpClient(
+        pool_maxsize=4, host_pool_sizes={"big.example.com": 32}
+    )
+    default_adapter = client.session.get_adapter("https://example.com/page")
+    host_adapter = client.session.get_adapter("https://big.example.com/page")
+
+    assert isinstance(default_adapter, HTTPAdapter)
+    assert isinstance(host_adapter, HTTPAdapter)
+    assert default_adapter._pool_maxsize == 4  # type: ignore[attr-defined]
+    assert host_adapter._pool_maxsize == 32  # type: ignore[attr-defined]
+    assert client.session.get_adapter("http://big.example.com/") is host_adapter
+
+
+def test_retry_configuration() -> None:
+    client: HttpClient = HttpClient(retries=5, backoff_factor=1, retry_statuses=[503])
+    adapter = client.session.get_adapter("https://example.com")
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter.max_retries.total == 5
+    assert adapter.max_retries.backoff_factor == 1
+    assert adapter.max_retries.status_forcelist == frozenset({503})
+    assert adapter.max_retries.raise_on_status is False
+
+
+def test_shared_client_is_reused_and_reconfigurable() -> None:
+    with patch.object(http_client, "_shared_client", None):
+        first: HttpClient = get_http_client()
+        assert get_http_client() is first
+
+        with patch.object(first, "close") as mock_close:
+            configured: HttpClient = configure_http_client(timeout=2)
+        mock_close.assert_called_once()
+        assert configured is not first
+        assert configured.timeout == 2
+        assert get_http_client() is configured
+
+
+@patch("app.modules.http_client.http_client.Session.close")
+def test_close_closes_session(mock_close: MagicMock) -> None:
+    HttpClient().close()
+    mock_close.assert_called_once()
+
+
+def test_session_does_not_keep_cookies_between_requests() -> None:
+    client: HttpClient = HttpClient()
+    headers: Message = Message()
+    headers["Set-Cookie"] = "session=abc; Path=/"
+    client.session.cookies.extract_cookies(
+        MagicMock(info=MagicMock(return_value=headers)),
+        Request("https://example.com/"),
+    )
+    assert len(client.session.cookies) == 0
@@ -0,0 +1,84 @@
+from threading import Event
+from typing import Any
+from app.modules.jobs.jobs import (
+    JOB_FAILED,
+    JOB_FINISHED,
+    JOB_PENDING,
+    JOB_RUNNING,
+    Job,
+    JobManager,
+)
+
+
+def test_job_reports_progress() -> None:
+    job: Job = Job("sitemap", {"url": "https://example.com"})
+    assert job.status == JOB_PENDING
+    assert not job.done
+
+    job.update(pages_fetched=3, queue_size=7)
+    job.update(errors=1)
+
+    assert job.to_dict() == {
+        "id": job.id,
+        "kind": "sitemap",
+        "status": JOB_PENDING,
+        "progress": {"pages_fetched": 3, "queue_size": 7, "errors": 1},
+        "error": None,
+    }
+
+
+def test_submit_runs_in_background_and_returns_result() -> None:
+    manager: JobManager = JobManager(max_workers=1)
+    release: Event = Event()
+
+    def work(job: Job) -> str:
+        job.update(pages_fetched=1)
+        release.wait(1)
+        return "done"
+
+    job: Job = manager.submit("sitemap", work)
+    assert manager.get(job.id) is job
+    assert not job.wait(0.01)
+    assert job.status == JOB_RUNNING
+
+    release.set()
+    assert job.wait(1)
+    assert job.status == JOB_FINISHED
+    assert job.result == "done"
+    assert job.progress == {"pages_fetched": 1}
+    assert job.finished_at is not None
+    manager.shutdown()
+
+
+def test_failed_job_records_error() -> None:
+    manager: JobManager = JobManager(max_workers=1)
+
+    def work(job: Job) -> Any:
+        raise RuntimeError("crawl exploded")
+
+    job: Job = manager.submit("sitemap", work)
+    assert job.wait(1)
+    assert job.status == JOB_FAILED
+    assert job.error == "crawl exploded"
+    assert job.result is None
+    manager.shutdown()
+
+
+def test_unknown_job_returns_none() -> None:
+    assert JobManager().get("missing") is None
+
+
+def test_finished_jobs_are_pruned() -> None:
+    manager: JobManager = JobManager(max_workers=1, max_jobs=2)
+    finished: list[Job] = []
+    for _ in range(3):
+        job: Job = manager.submit("meta_tags", lambda job: None)
+        job.wait(1)
+        finished.append(job)
+
+    manager.submit("meta_tags", lambda job: None).wait(1)
+
+    assert manager.get(finished[0].id) is None
+    assert manager.get(finished[1].id) is None
+    assert manager.get(finished[2].id) is finished[2]
+    manager.shutdown()
@@ -0,0 +1,172 @@
+import time
+import pytest
+from queue import Empty
+from threading import Thread
+from unittest.mock import patch, MagicMock
+from typing import Any, List
+from app.modules.meta_tags import browser_pool
+from app.modules.meta_tags.browser_pool import (
+    BLOCKED_URL_PATTERNS,
+    BrowserPool,
+    configure_browser_pool,
+    create_driver,
+    get_browser_pool,
+)
+
+
+def _driver_factory(drivers: List[MagicMock]) -> MagicMock:
+    def create() -> MagicMock:
+        driver: MagicMock = MagicMock()
+        drivers.append(driver)
+        return driver
+
+    return MagicMock(side_effect=create)
+
+
+@patch("app.modules.meta_tags.browser_pool.webdriver.Chrome")
+@patch("app.modules.meta_tags.browser_pool.Service")
+def test_create_driver_blocks_heavy_resources(
+    mock_service: MagicMock, mock_chrome: MagicMock
+) -> None:
+    driver: MagicMock = MagicMock()
+    mock_chrome.return_value = driver
+
+    assert create_driver() is driver
+
+    options = mock_chrome.call_args.kwargs["options"]
+    assert "--headless=new" in options.arguments
+    prefs = options.experimental_options["prefs"]
+    assert prefs["profile.managed_default_content_settings.images"] == 2
+    assert prefs["profile.managed_default_content_settings.stylesheets"] == 2
+    driver.execute_cdp_cmd.assert_any_call(
+        "Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS}
+    )
+
+
+def test_sessions_are_reused() -> None:
+    drivers: List[MagicMock] = []
+    pool: BrowserPool = BrowserPool(size=2, driver_factory=_driver_factory(drivers))
+
+    with pool.session() as first:
+        pass
+    with pool.session() as second:
+        pass
+
+    assert first is second
+    assert len(drivers) == 1
+
+
+def test_pool_is_size_bounded() -> None:
+    drivers: List[MagicMock] = []
+    pool: BrowserPool = BrowserPool(size=1, driver_factory=_driver_factory(drivers))
+
+    with pool.session():
+        with pytest.raises(Empty):
+            with pool.session(timeout=0.01):
+                pass
+
+    assert len(drivers) == 1
+
+
+def test_session_recycled_after_max_pages() -> None:
+    drivers: List[MagicMock] = []
+    pool: BrowserPool = BrowserPool(
+        size=1, max_pages_per_session=2, driver_factory=_driver_factory(drivers)
+    )
+
+    for _ in range(3):
+        with pool.session():
+            pass
+
+    assert len(drivers) == 2
+    drivers[0].quit.assert_called_once()
+    drivers[1].quit.assert_not_called()
+
+
+def test_waiting_caller_gets_a_new_session_after_recycle() -> None:
+    drivers: List[MagicMock] = []
+    pool: BrowserPool = BrowserPool(
+        size=1, max_pages_per_session=1, driver_factory=_driver_factory(drivers)
+    )
+    served: List[Any] = []
+
+    def wait_for_session() -> None:
+        with pool.session(timeout=5) as driver:
+            served.append(driver)
+
+    with pool.session():
+        waiter: Thread = Thread(target=wait_for_session)
+        waiter.start()
+        time.sleep(0.05)
+    waiter.join(timeout=5)
+
+    assert served == [drivers[1]]
+    drivers[0].quit.assert_called_once()
+
+
+def test_session_recycled_after_crash() -> None:
+    drivers: List[MagicMock] = []
+    pool: BrowserPool = BrowserPool(size=1, driver_factory=_driver_factory(drivers))
+
+    with pytest.raises(RuntimeError):
+        with pool.session():
+            raise RuntimeError("chrome not reachable")
+    with pool.session() as driver:
+        pass
+
+    assert len(drivers) == 2
+    assert driver is drivers[1]
+    drivers[0].quit.assert_called_once()
+
+
+def test_failed_quit_is_logged() -> None:
+    drivers: List[MagicMock] = []
+    pool: BrowserPool = BrowserPool(size=1, driver_factory=_driver_factory(drivers))
+    with pool.session():
+        pass
+    drivers[0].quit.side_effect = Exception("already gone")
+
+    pool.close()
+
+    with pool.session():
+        pass
+    assert len(drivers) == 2
+
+
+def test_failed_driver_start_frees_slot() -> None:
+    factory: MagicMock = MagicMock(side_effect=[Exception("no chromium"), MagicMock()])
+    pool: BrowserPool = BrowserPool(size=1, driver_factory=factory)
+
+    with pytest.raises(Exception, match="no chromium"):
+        with pool.session():
+            pass
+    with pool.session():
+        pass
+
+    assert factory.call_count == 2
+
+
+def test_close_quits_idle_sessions() -> None:
+    drivers: List[MagicMock] = []
+    pool: BrowserPool = BrowserPool(size=2, driver_factory=_driver_factory(drivers))
+    with pool.session():
+        with pool.session():
+            pass
+
+    pool.close()
+
+    assert len(drivers) == 2
+    for driver in drivers:
+        driver.quit.assert_called_once()
+
+
+def test_shared_pool_is_reused_and_reconfigurable() -> None:
+    with patch.object(browser_pool, "_shared_pool", None):
+        first: BrowserPool = get_browser_pool()
+        assert get_browser_pool() is first
+
+        with patch.object(first, "close") as mock_close:
+            configured: BrowserPool = configure_browser_pool(size=4)
+        mock_close.assert_called_once()
+        assert configured.size == 4
+        assert get_browser_pool() is configured
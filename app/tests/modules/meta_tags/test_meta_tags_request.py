@@ -1,4 +1,5 @@
 from unittest.mock import patch, Mock
+from typing import Iterator, List, Optional
 from app.modules.meta_tags.meta_tags_request import get_meta_tags_request
 
 
@@ -6,7 +7,7 @@ def test_empty_url_list() -> None:
     assert get_meta_tags_request([]) is None
 
 
-@patch("app.modules.meta_tags.meta_tags_request.requests.get")
+@patch("app.modules.http_client.http_client.HttpClient.get")
 def test_valid_title_and_description(mock_get: Mock) -> None:
     mock_response = Mock()
     mock_response.status_code = 200
@@ -24,7 +25,7 @@ def test_valid_title_and_description(mock_get: Mock) -> None:
     }
 
 
-@patch("app.modules.meta_tags.meta_tags_request.requests.get")
+@patch("app.modules.http_client.http_client.HttpClient.get")
 def test_missing_title_and_description(mock_get: Mock) -> None:
     mock_response = Mock()
     mock_response.status_code = 200
@@ -35,7 +36,7 @@ def test_missing_title_and_description(mock_get: Mock) -> None:
     assert result == {"http://no-title.com": {"title": "", "description": ""}}
 
 
-@patch("app.modules.meta_tags.meta_tags_request.requests.get")
+@patch("app.modules.http_client.http_client.HttpClient.get")
 def test_request_exception(mock_get: Mock) -> None:
     mock_get.side_effect = Exception("Connection failed")
 
@@ -46,3 +47,111 @@ def test_request_exception(mock_get: Mock) -> None:
             "description": "Error: Connection failed",
         }
     }
+
+
+def _streamed_response(
+    chunks: List[bytes], content_length: Optional[int] = None
+) -> Mock:
+    consumed: List[int] = [0]
+
+    def iter_content(chunk_size: int) -> Iterator[bytes]:
+        for chunk in chunks:
+            consumed[0] += len(chunk)
+            yield chunk
+
+    mock_response = Mock()
+    mock_response.encoding = "utf-8"
+    mock_response.headers = (
+        {"Content-Length": str(content_length)} if content_length is not None else {}
+    )
+    mock_response.iter_content.side_effect = iter_content
+    mock_response.raw.tell.side_effect = lambda: consumed[0]
+    return mock_response
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get")
+def test_head_only_stops_after_head(mock_get: Mock) -> None:
+    body: bytes = b"<p>" + b"x" * 5000 + b"</p></body></html>"
+    mock_response: Mock = _streamed_response(
+        [
+            b"<html><head><title>Head Title</title>",
+            b"<meta name='description' content='Head description.'></HE",
+            b"AD><body>",
+            body,
+        ],
+        content_length=1000 + len(body),
+    )
+    mock_get.return_value = mock_response
+
+    result = get_meta_tags_request(["http://example.com"], head_only=True)
+    assert result is not None
+    assert result["http://example.com"]["title"] == "Head Title"
+    assert result["http://example.com"]["description"] == "Head description."
+    bytes_read: int = mock_response.raw.tell()
+    assert result["http://example.com"]["bytes_saved"] == str(
+        1000 + len(body) - bytes_read
+    )
+    mock_get.assert_called_once_with("http://example.com", stream=True)
+    mock_response.close.assert_called_once()
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get")
+def test_head_only_respects_byte_cap(mock_get: Mock) -> None:
+    mock_response: Mock = _streamed_response(
+        [b"<title>Capped</title>", b"<meta name='description' content='Late'>"]
+    )
+    mock_get.return_value = mock_response
+
+    result = get_meta_tags_request(
+        ["http://example.com"], head_only=True, head_max_bytes=21
+    )
+    assert result == {"http://example.com": {"title": "Capped", "description": ""}}
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get")
+def test_head_only_reads_short_page_fully(mock_get: Mock) -> None:
+    mock_get.return_value = _streamed_response(
+        [b"<title>Short</title>"], content_length=20
+    )
+
+    result = get_meta_tags_request(["http://example.com"], head_only=True)
+    assert result == {
+        "http://example.com": {
+            "title": "Short",
+            "description": "",
+            "bytes_saved": "0",
+        }
+    }
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get")
+def test_head_only_closes_response_on_error(mock_get: Mock) -> None:
+    mock_response = Mock()
+    mock_response.raise_for_status.side_effect = Exception("404 Client Error")
+    mock_get.return_value = mock_response
+
+    result = get_meta_tags_request(["http://fail.com"], head_only=True)
+    assert result == {
+        "http://fail.com": {
+            "title": "Error: 404 Client Error",
+            "description": "Error: 404 Client Error",
+        }
+    }
+    mock_response.close.assert_called_once()
+    mock_response.iter_content.assert_not_called()
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get")
+def test_progress_is_reported(mock_get: Mock) -> None:
+    mock_response = Mock()
+    mock_response.text = "<title>Ok</title>"
+    mock_get.side_effect = [Exception("Connection failed"), mock_response]
+    on_progress = Mock()
+
+    get_meta_tags_request(
+        ["http://fail.com", "http://example.com"], on_progress=on_progress
+    )
+    assert [call.kwargs for call in on_progress.call_args_list] == [
+        {"pages_fetched": 0, "queue_size": 1, "errors": 1},
+        {"pages_fetched": 1, "queue_size": 0, "errors": 1},
+    ]
@@ -1,6 +1,7 @@
 from unittest.mock import patch, MagicMock
-from typing import Dict
+from typing import Dict, List
 from selenium.webdriver.remote.webelement import WebElement
+from app.modules.meta_tags.browser_pool import BrowserPool
 from app.modules.meta_tags.meta_tags_selenium import get_meta_tags_selenium
 
 
@@ -8,8 +9,8 @@ def test_empty_url_list_returns_none() -> None:
     assert get_meta_tags_selenium([]) is None
 
 
-@patch("app.modules.meta_tags.meta_tags_selenium.webdriver.Chrome")
-@patch("app.modules.meta_tags.meta_tags_selenium.Service")
+@patch("app.modules.meta_tags.browser_pool.webdriver.Chrome")
+@patch("app.modules.meta_tags.browser_pool.Service")
 def test_valid_title_and_description(
     mock_service: MagicMock, mock_webdriver: MagicMock
 ) -> None:
@@ -23,16 +24,16 @@ def test_valid_title_and_description(
     mock_webdriver.return_value = mock_driver
 
     result: Dict[str, Dict[str, str]] | None = get_meta_tags_selenium(
-        ["http://example.com"]
+        ["http://example.com"], pool=BrowserPool(size=1)
     )
     assert result == {
         "http://example.com": {"title": "Test Title", "description": "Test Description"}
     }
-    mock_driver.quit.assert_called_once()
+    mock_driver.quit.assert_not_called()
 
 
-@patch("app.modules.meta_tags.meta_tags_selenium.webdriver.Chrome")
-@patch("app.modules.meta_tags.meta_tags_selenium.Service")
+@patch("app.modules.meta_tags.browser_pool.webdriver.Chrome")
+@patch("app.modules.meta_tags.browser_pool.Service")
 def test_missing_description_tag(
     mock_service: MagicMock, mock_webdriver: MagicMock
 ) -> None:
@@ -42,16 +43,16 @@ def test_missing_description_tag(
     mock_webdriver.return_value = mock_driver
 
     result: Dict[str, Dict[str, str]] | None = get_meta_tags_selenium(
-        ["http://nodec.com"]
+        ["http://nodec.com"], pool=BrowserPool(size=1)
     )
     assert result == {
         "http://nodec.com": {"title": "Title without description", "description": ""}
     }
-    mock_driver.quit.assert_called_once()
+    mock_driver.quit.assert_not_called()
 
 
-@patch("app.modules.meta_tags.meta_tags_selenium.webdriver.Chrome")
-@patch("app.modules.meta_tags.meta_tags_selenium.Service")
+@patch("app.modules.meta_tags.browser_pool.webdriver.Chrome")
+@patch("app.modules.meta_tags.browser_pool.Service")
 def test_invalid_url_format_skipped(
     mock_service: MagicMock, mock_webdriver: MagicMock
 ) -> None:
@@ -59,7 +60,7 @@ def test_invalid_url_format_skipped(
     mock_webdriver.return_value = mock_driver
 
     result: Dict[str, Dict[str, str]] | None = get_meta_tags_selenium(
-        ["", "ftp://bad", "not-a-url"]
+        ["", "ftp://bad", "not-a-url"], pool=BrowserPool(size=1)
     )
     assert result == {
         "": {
@@ -75,11 +76,11 @@ def test_invalid_url_format_skipped(
             "description": "Error: URL must start with http or https",
         },
     }
-    mock_driver.quit.assert_called_once()
+    mock_webdriver.assert_not_called()
 
 
-@patch("app.modules.meta_tags.meta_tags_selenium.webdriver.Chrome")
-@patch("app.modules.meta_tags.meta_tags_selenium.Service")
+@patch("app.modules.meta_tags.browser_pool.webdriver.Chrome")
+@patch("app.modules.meta_tags.browser_pool.Service")
 def test_selenium_driver_exception(
     mock_service: MagicMock, mock_webdriver: MagicMock
 ) -> None:
@@ -88,9 +89,57 @@ def test_selenium_driver_exception(
     mock_webdriver.return_value = mock_driver
 
     result: Dict[str, Dict[str, str]] | None = get_meta_tags_selenium(
-        ["http://crash.com"]
+        ["http://crash.com"], pool=BrowserPool(size=1)
     )
     assert result == {
         "http://crash.com": {"title": "Error: crash", "description": "Error: crash"}
     }
     mock_driver.quit.assert_called_once()
+
+
+@patch("app.modules.meta_tags.meta_tags_selenium.get_browser_pool")
+def test_shared_pool_reuses_sessions_across_calls(mock_get_pool: MagicMock) -> None:
+    mock_driver: MagicMock = MagicMock()
+    mock_driver.title = "Pooled"
+    mock_driver.find_element.side_effect = Exception("not found")
+    factory: MagicMock = MagicMock(return_value=mock_driver)
+    mock_get_pool.return_value = BrowserPool(size=2, driver_factory=factory)
+
+    urls: List[str] = [f"http://example.com/{index}" for index in range(6)]
+    first: Dict[str, Dict[str, str]] | None = get_meta_tags_selenium(urls)
+    second: Dict[str, Dict[str, str]] | None = get_meta_tags_selenium(urls[:1])
+
+    assert first is not None and list(first) == urls
+    assert all(tags["title"] == "Pooled" for tags in first.values())
+    assert second == {urls[0]: {"title": "Pooled", "description": ""}}
+    assert 1 <= factory.call_count <= 2
+    assert mock_driver.get.call_count == 7
+    mock_driver.quit.assert_not_called()
+
+
+def test_progress_is_reported() -> None:
+    mock_driver: MagicMock = MagicMock()
+    mock_driver.title = "Title"
+    on_progress: MagicMock = MagicMock()
+
+    get_meta_tags_selenium(
+        ["not-a-url", "http://example.com"],
+        pool=BrowserPool(size=1, driver_factory=lambda: mock_driver),
+        on_progress=on_progress,
+    )
+    assert [call.kwargs for call in on_progress.call_args_list] == [
+        {"pages_fetched": 0, "queue_size": 1, "errors": 1},
+        {"pages_fetched": 1, "queue_size": 0, "errors": 1},
+    ]
+
+
+def test_busy_pool_times_out_instead_of_hanging() -> None:
+    pool: BrowserPool = BrowserPool(size=1, driver_factory=MagicMock)
+    with pool.session():
+        result: Dict[str, Dict[str, str]] | None = get_meta_tags_selenium(
+            ["http://busy.com"], pool=pool, session_timeout=0.01
+        )
+    assert result is not None
+    assert result["http://busy.com"]["title"].startswith(
+        "Error: No browser session became free"
+    )
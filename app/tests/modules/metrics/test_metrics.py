@@ -0,0 +1,75 @@
+import pytest
+
+from app.modules.metrics.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+)
+
+
+def test_counter_renders_labelled_samples() -> None:
+    registry: MetricsRegistry = MetricsRegistry()
+    counter: Counter = Counter(
+        "requests_total", "Requests.", labelnames=("status",), registry=registry
+    )
+    counter.inc(status="200")
+    counter.inc(2, status="404")
+    counter.inc(0.5, status='a"b\\c\n')
+
+    assert counter.value(status="404") == 2
+    assert registry.render() == (
+        "# HELP requests_total Requests.\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{status="200"} 1\n'
+        'requests_total{status="404"} 2\n'
+        'requests_total{status="a\\"b\\\\c\\n"} 0.5\n'
+    )
+
+
+def test_counter_rejects_bad_usage() -> None:
+    registry: MetricsRegistry = MetricsRegistry()
+    counter: Counter = Counter("total", "Total.", registry=registry)
+    with pytest.raises(ValueError, match="only be incremented"):
+        counter.inc(-1)
+    with pytest.raises(ValueError, match="expects labels"):
+        counter.inc(status="200")
+    with pytest.raises(ValueError, match="already registered"):
+        Counter("total", "Total.", registry=registry)
+
+
+def test_gauge_tracks_in_progress() -> None:
+    registry: MetricsRegistry = MetricsRegistry()
+    gauge: Gauge = Gauge("in_flight", "In flight.", registry=registry)
+    with gauge.track_inprogress():
+        with gauge.track_inprogress():
+            assert gauge.value() == 2
+    assert gauge.value() == 0
+    gauge.set(-3)
+    assert registry.render().endswith("# TYPE in_flight gauge\nin_flight -3\n")
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    registry: MetricsRegistry = MetricsRegistry()
+    histogram: Histogram = Histogram(
+        "latency_seconds",
+        "Latency.",
+        labelnames=("phase",),
+        buckets=(1, 0.1),
+        registry=registry,
+    )
+    histogram.observe(0.05, phase="parse")
+    histogram.observe(0.1, phase="parse")
+    histogram.observe(5, phase="parse")
+    with histogram.time(phase="links"):
+        pass
+
+    assert histogram.count(phase="parse") == 3
+    assert histogram.count(phase="links") == 1
+    rendered: str = registry.render()
+    assert 'latency_seconds_bucket{phase="parse",le="0.1"} 2\n' in rendered
+    assert 'latency_seconds_bucket{phase="parse",le="1"} 2\n' in rendered
+    assert 'latency_seconds_bucket{phase="parse",le="+Inf"} 3\n' in rendered
+    assert 'latency_seconds_sum{phase="parse"} 5.15\n' in rendered
+    assert 'latency_seconds_count{phase="parse"} 3\n' in rendered
+    assert 'latency_seconds_count{phase="links"} 1\n' in rendered
@@ -0,0 +1,123 @@
+import pytest
+from unittest.mock import patch
+from typing import List
+from bs4 import BeautifulSoup
+from app.modules.page_parser.page_parser import (
+    PARSER_BACKENDS,
+    PageData,
+    PageParser,
+    SoupPageParser,
+    StreamingPageParser,
+    get_page_parser,
+)
+
+BACKENDS: List[str] = sorted(PARSER_BACKENDS)
+
+PARITY_PAGES: List[str] = [
+    """
+    <html>
+      <head>
+        <title> Example &amp; Title </title>
+        <meta name="description" content=" Test description. ">
+        <link rel="canonical" href=" https://example.com/home ">
+      </head>
+      <body>
+        <a href="https://example.com/about">About</a>
+        <a href="/team#people">Team</a>
+        <a name="anchor">No href</a>
+        <a href>Empty</a>
+        <a href="https://external.com?a=1&amp;b=2">External</a>
+        <script>var html = '<a href="/in-script">x</a>';</script>
+      </body>
+    </html>
+    """,
+    "<html><head></head><body></body></html>",
+    "<html><head><title></title></head><body></body></html>",
+    "<title>Unclosed",
+    """
+    <head>
+      <meta name="Description" content="Wrong case">
+      <meta name="description">
+      <meta name="description" content="Second">
+      <link rel="alternate canonical" href="/canonical">
+      <link rel="canonical" href="/second">
+    </head>
+    """,
+    """
+    <head><link rel="canonical"><title>First</title><title>Second</title></head>
+    <body><a href="/one"><a href="/two">Two</a></a><A HREF="/three">3</A></body>
+    """,
+    """
+    <body>
+      <nav>%s</nav>
+    </body>
+    """
+    % "".join(f'<a href="/page-{index}">Page {index}</a>' for index in range(200)),
+]
+
+
+@pytest.mark.parametrize("html", PARITY_PAGES)
+def test_backends_return_identical_page_data(html: str) -> None:
+    results: List[PageData] = [get_page_parser(name).parse(html) for name in BACKENDS]
+    assert all(result == results[0] for result in results[1:])
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        "<title>Nested <b>markup</b></title><a href='/x'>x</a>",
+        "<title>Comment<!-- inside --></title>",
+    ],
+)
+def test_streaming_matches_html_parser_on_markup_in_title(html: str) -> None:
+    # lxml treats <title> as raw text, html.parser builds child nodes.
+    expected: PageData = get_page_parser("html.parser").parse(html)
+    assert get_page_parser("streaming").parse(html) == expected
+    assert expected.title == ""
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backend_extracts_links_and_metadata(backend: str) -> None:
+    page: PageData = get_page_parser(backend).parse(PARITY_PAGES[0])
+    assert page.links == [
+        "https://example.com/about",
+        "/team#people",
+        "",
+        "https://external.com?a=1&b=2",
+    ]
+    assert page.title == "Example & Title"
+    assert page.description == "Test description."
+    assert page.canonical == "https://example.com/home"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backend_with_missing_elements(backend: str) -> None:
+    page: PageData = get_page_parser(backend).parse(PARITY_PAGES[1])
+    assert page == PageData([], "", "", "")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backend_with_empty_title(backend: str) -> None:
+    page: PageData = get_page_parser(backend).parse(PARITY_PAGES[2])
+    assert page.title == ""
+
+
+def test_get_page_parser_backends() -> None:
+    assert isinstance(get_page_parser(), StreamingPageParser)
+    html_parser: PageParser = get_page_parser("html.parser")
+    lxml_parser: PageParser = get_page_parser("lxml")
+    assert isinstance(html_parser, SoupPageParser)
+    assert html_parser.features == "html.parser"
+    assert isinstance(lxml_parser, SoupPageParser)
+    assert lxml_parser.features == "lxml"
+
+
+def test_get_page_parser_unknown_backend() -> None:
+    with pytest.raises(ValueError, match="Unknown parser backend: html5"):
+        get_page_parser("html5")
+
+
+def test_soup_parser_skips_non_tag_instance() -> None:
+    soup: BeautifulSoup = BeautifulSoup("<html><body></body></html>", "html.parser")
+    with patch.object(soup, "find_all", return_value=["not-a-tag"]):
+        assert SoupPageParser._extract_links(soup) == []
@@ -0,0 +1,51 @@
+from unittest.mock import MagicMock, patch
+
+from app.modules.page_parser.page_parser import PageData, get_page_parser
+from app.modules.page_parser.parse_pool import (
+    ParsePool,
+    _parse_in_worker,
+    configure_parse_pool,
+    get_parse_pool,
+)
+
+HTML: str = (
+    '<html><head><title>Title</title><meta name="description" content="Desc">'
+    '</head><body><a href="/a">A</a><a href="/b">B</a></body></html>'
+)
+
+
+def test_worker_function_parses_with_given_parser() -> None:
+    assert _parse_in_worker(get_page_parser(), HTML).links == ["/a", "/b"]
+
+
+def test_small_pages_are_parsed_inline() -> None:
+    pool: ParsePool = ParsePool(workers=2)
+    parser: MagicMock = MagicMock(wraps=get_page_parser())
+    page: PageData = pool.parse(parser, HTML)
+    parser.parse.assert_called_once_with(HTML)
+    assert pool._executor is None
+    assert page.title == "Title"
+    pool.close()
+
+
+def test_large_pages_are_parsed_in_worker_processes() -> None:
+    pool: ParsePool = ParsePool(workers=1, min_bytes=0)
+    try:
+        for backend in ("streaming", "html.parser"):
+            parser = get_page_parser(backend)
+            assert pool.parse(parser, HTML) == parser.parse(HTML)
+        assert pool._executor is not None
+    finally:
+        pool.close()
+    assert pool._executor is None
+
+
+def test_configure_parse_pool_replaces_shared_pool() -> None:
+    with patch("app.modules.page_parser.parse_pool.atexit") as mock_atexit:
+        assert configure_parse_pool(0) is None
+        first: ParsePool | None = configure_parse_pool(3, min_bytes=10)
+        assert first is not None and first.workers == 3 and first.min_bytes == 10
+        assert get_parse_pool() is first
+        assert configure_parse_pool(0) is None
+        assert get_parse_pool() is None
+    mock_atexit.unregister.assert_called_once_with(first.close)
@@ -0,0 +1,35 @@
+import pytest
+
+from app.modules.sitemap.bloom_filter import BloomFilter
+
+
+def test_added_items_are_always_found() -> None:
+    bloom: BloomFilter = BloomFilter(1000)
+    urls: list[str] = [f"https://example.com/{index}" for index in range(1000)]
+
+    assert all(bloom.add(url) for url in urls[:10])
+    for url in urls[10:]:
+        bloom.add(url)
+
+    assert all(url in bloom for url in urls)
+    assert not bloom.add(urls[0])
+    assert len(bloom) <= 1000
+    assert 1 not in bloom
+
+
+def test_false_positive_rate_stays_near_target() -> None:
+    bloom: BloomFilter = BloomFilter(5000, error_rate=0.01)
+    for index in range(5000):
+        bloom.add(f"https://example.com/seen/{index}")
+
+    false_positives: int = sum(
+        f"https://example.com/unseen/{index}" in bloom for index in range(10000)
+    )
+    assert false_positives < 300
+    assert len(bloom._bits) < 5000 * 2
+
+
+@pytest.mark.parametrize("capacity, error_rate", [(0, 0.01), (10, 0), (10, 1)])
+def test_invalid_parameters(capacity: int, error_rate: float) -> None:
+    with pytest.raises(ValueError):
+        BloomFilter(capacity, error_rate)
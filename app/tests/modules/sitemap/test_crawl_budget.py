@@ -0,0 +1,30 @@
+from app.modules.sitemap.crawl_budget import CrawlBudget
+
+
+def test_unlimited_budget_allows_everything() -> None:
+    budget: CrawlBudget = CrawlBudget(max_pages=0)
+    budget.spend_bytes(10**12)
+
+    assert budget.take(10**6) == 10**6
+    assert not budget.exhausted
+
+
+def test_page_budget_is_shared_between_takes() -> None:
+    budget: CrawlBudget = CrawlBudget(max_pages=5)
+
+    assert budget.take(3) == 3
+    assert budget.take(3) == 2
+    assert budget.exhausted
+    assert budget.take(1) == 0
+
+    budget.refund(2)
+    assert budget.take(4) == 2
+
+
+def test_byte_budget_stops_new_pages() -> None:
+    budget: CrawlBudget = CrawlBudget(max_bytes=100)
+
+    assert budget.take(2) == 2
+    budget.spend_bytes(100)
+    assert budget.exhausted
+    assert budget.take(2) == 0
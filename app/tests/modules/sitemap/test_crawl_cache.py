@@ -0,0 +1,163 @@
+import pickle
+from pathlib import Path
+from unittest.mock import patch
+from typing import Any, Dict
+from app.modules.sitemap.crawl_cache import CrawlCache, crawl_cache_key
+from app.modules.url_rules.canonical import UrlCanonicalizer
+
+SITEMAP_DATA: Dict[str, Any] = {
+    "root": "https://example.com",
+    "internal": {"https://example.com": ["https://example.com/about"]},
+    "external": {"https://external.com"},
+    "metadata": {},
+    "incoming": {},
+    "response": {},
+}
+
+
+def test_cache_key_normalizes_inputs() -> None:
+    assert crawl_cache_key("https://example.com/", 2, ["b", "a", "a"]) == (
+        crawl_cache_key("https://example.com", 2, ["a", "b"])
+    )
+    assert crawl_cache_key("https://example.com", 2) != crawl_cache_key(
+        "https://example.com", 3
+    )
+    assert crawl_cache_key("https://example.com", 2, None) == crawl_cache_key(
+        "https://example.com", 2, [], []
+    )
+    assert crawl_cache_key("https://example.com", 2, [], ["/blog/"]) != (
+        crawl_cache_key("https://example.com", 2)
+    )
+    assert crawl_cache_key("https://example.com", 2, [], [], True) != (
+        crawl_cache_key("https://example.com", 2, [], [], False)
+    )
+    assert crawl_cache_key("https://example.com", 2, [], [], False, True) != (
+        crawl_cache_key("https://example.com", 2)
+    )
+    assert crawl_cache_key("https://example.com", 2, [], [], False, False, True) != (
+        crawl_cache_key("https://example.com", 2, [], [], False, True)
+    )
+    assert crawl_cache_key(
+        "https://example.com", 2, [], [], False, False, False, True
+    ) != crawl_cache_key("https://example.com", 2, [], [], False, False, True)
+    assert crawl_cache_key(
+        "https://example.com", 2, [], [], False, False, False, False, True
+    ) != crawl_cache_key("https://example.com", 2)
+    assert crawl_cache_key("https://example.com", 2, [], [], False, False, True) == (
+        '["https://example.com", 2, [], [], false, false, true]'
+    )
+
+
+def test_cache_key_uses_the_crawl_canonicalizer() -> None:
+    assert crawl_cache_key("https://Example.com:443/?utm_source=x", 2) == (
+        crawl_cache_key("https://example.com", 2)
+    )
+    assert crawl_cache_key("https://example.com/?b=2&a=1", 2) == (
+        crawl_cache_key("https://example.com?a=1&b=2", 2)
+    )
+    assert crawl_cache_key(
+        "https://example.com/?ref=x", 2, canonicalizer=UrlCanonicalizer(["ref"])
+    ) == crawl_cache_key("https://example.com", 2)
+
+
+def test_memory_cache_hit_and_miss() -> None:
+    cache: CrawlCache = CrawlCache()
+    assert cache.get("key") is None
+    cache.set("key", SITEMAP_DATA)
+    assert cache.get("key") is SITEMAP_DATA
+
+
+def test_entries_expire_after_ttl() -> None:
+    cache: CrawlCache = CrawlCache(ttl=10)
+    with patch("app.modules.sitemap.crawl_cache.time.time", return_value=100):
+        cache.set("key", SITEMAP_DATA)
+    with patch("app.modules.sitemap.crawl_cache.time.time", return_value=105):
+        assert cache.get("key") is SITEMAP_DATA
+    with patch("app.modules.sitemap.crawl_cache.time.time", return_value=111):
+        assert cache.get("key") is None
+
+
+def test_least_recently_used_entries_are_evicted_by_size() -> None:
+    entry_size: int = len(pickle.dumps({"n": 0}, protocol=pickle.HIGHEST_PROTOCOL))
+    cache: CrawlCache = CrawlCache(max_bytes=entry_size * 2)
+    cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    cache.get("a")
+    cache.set("c", {"n": 3})
+
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("b") is None
+    assert cache.get("c") == {"n": 3}
+
+
+def test_entries_larger_than_budget_are_not_kept_in_memory() -> None:
+    cache: CrawlCache = CrawlCache(max_bytes=10)
+    cache.set("key", SITEMAP_DATA)
+    assert cache.get("key") is None
+
+
+def test_set_replaces_existing_entry() -> None:
+    cache: CrawlCache = CrawlCache()
+    cache.set("key", {"n": 1})
+    cache.set("key", {"n": 2})
+    assert cache.get("key") == {"n": 2}
+    assert cache._size == len(pickle.dumps({"n": 2}, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def test_invalidate_and_clear() -> None:
+    cache: CrawlCache = CrawlCache()
+    cache.set("a", SITEMAP_DATA)
+    cache.set("b", SITEMAP_DATA)
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") is SITEMAP_DATA
+
+    cache.clear()
+    assert cache.get("b") is None
+
+
+def test_disk_store_survives_new_cache_instance(tmp_path: Path) -> None:
+    path: str = str(tmp_path / "cache.sqlite3")
+    CrawlCache(path=path).set("key", SITEMAP_DATA)
+
+    reopened: CrawlCache = CrawlCache(path=path)
+    assert reopened.get("key") == SITEMAP_DATA
+    assert reopened.get("missing") is None
+
+
+def test_disk_entries_expire_and_invalidate(tmp_path: Path) -> None:
+    path: str = str(tmp_path / "cache.sqlite3")
+    with patch("app.modules.sitemap.crawl_cache.time.time", return_value=100):
+        CrawlCache(path=path).set("old", SITEMAP_DATA)
+        CrawlCache(path=path).set("other", SITEMAP_DATA)
+
+    with patch("app.modules.sitemap.crawl_cache.time.time", return_value=5000):
+        assert CrawlCache(ttl=60, path=path).get("old") is None
+
+    cache: CrawlCache = CrawlCache(ttl=float("inf"), path=path)
+    cache.invalidate("other")
+    assert CrawlCache(ttl=float("inf"), path=path).get("other") is None
+
+    cache.set("fresh", SITEMAP_DATA)
+    cache.clear()
+    assert CrawlCache(path=path).get("fresh") is None
+
+
+def test_disk_store_evicts_least_recently_used(tmp_path: Path) -> None:
+    path: str = str(tmp_path / "cache.sqlite3")
+    entry_size: int = len(pickle.dumps({"n": 0}, protocol=pickle.HIGHEST_PROTOCOL))
+    cache: CrawlCache = CrawlCache(path=path, max_disk_bytes=entry_size * 2)
+    with patch("app.modules.sitemap.crawl_cache.time.time", return_value=100):
+        cache.set("a", {"n": 1})
+    with patch("app.modules.sitemap.crawl_cache.time.time", return_value=200):
+        cache.set("b", {"n": 2})
+    with patch("app.modules.sitemap.crawl_cache.time.time", return_value=300):
+        CrawlCache(path=path).get("a")
+    with patch("app.modules.sitemap.crawl_cache.time.time", return_value=400):
+        cache.set("c", {"n": 3})
+
+    reopened: CrawlCache = CrawlCache(ttl=float("inf"), path=path)
+    assert reopened.get("a") == {"n": 1}
+    assert reopened.get("b") is None
+    assert reopened.get("c") == {"n": 3}
@@ -0,0 +1,74 @@
+import sqlite3
+from pathlib import Path
+from app.modules.page_parser.page_parser import PageData
+from app.modules.sitemap.crawl_state import CrawlState, PageState
+
+PAGE_STATE: PageState = PageState(
+    '"abc"',
+    "Wed, 21 Oct 2015 07:28:00 GMT",
+    "hash",
+    PageData(["/about"], "Title", "Description", "https://example.com"),
+)
+
+
+def test_in_memory_state() -> None:
+    state: CrawlState = CrawlState()
+    assert state.get("https://example.com") is None
+    state.set("https://example.com", PAGE_STATE)
+    state.save()
+    assert state.get("https://example.com") == PAGE_STATE
+
+
+def test_state_is_persisted_on_save(tmp_path: Path) -> None:
+    path: str = str(tmp_path / "state.sqlite3")
+    state: CrawlState = CrawlState(path=path)
+    state.set("https://example.com", PAGE_STATE)
+    assert CrawlState(path=path).get("https://example.com") is None
+
+    state.save()
+    reopened: CrawlState = CrawlState(path=path)
+    assert reopened.get("https://example.com") == PAGE_STATE
+    assert reopened.get("https://example.com/missing") is None
+
+
+def test_saved_pages_are_not_kept_in_memory(tmp_path: Path) -> None:
+    state: CrawlState = CrawlState(path=str(tmp_path / "state.sqlite3"))
+    state.set("https://example.com", PAGE_STATE._replace(status=203))
+    state.save()
+    assert state._pages == {}
+    assert state.get("https://example.com") == PAGE_STATE._replace(status=203)
+    assert state._pages == {}
+
+
+def test_state_without_status_column_is_migrated(tmp_path: Path) -> None:
+    path: str = str(tmp_path / "state.sqlite3")
+    db: sqlite3.Connection = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE crawl_state (url TEXT PRIMARY KEY, etag TEXT, "
+        "last_modified TEXT, content_hash TEXT, page TEXT)"
+    )
+    db.execute(
+        "INSERT INTO crawl_state VALUES (?, ?, ?, ?, ?)",
+        ("https://example.com", '"abc"', "", "hash", '[[], "T", "", ""]'),
+    )
+    db.commit()
+    db.close()
+
+    state: CrawlState = CrawlState(path=path)
+    assert state.get("https://example.com") == PageState(
+        '"abc"', "", "hash", PageData([], "T", "", "")
+    )
+    state.set("https://example.com/a", PAGE_STATE)
+    state.save()
+    assert CrawlState(path=path).get("https://example.com/a") == PAGE_STATE
+
+
+def test_conditional_headers() -> None:
+    assert CrawlState.conditional_headers(None) == {}
+    assert CrawlState.conditional_headers(PAGE_STATE) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+    }
+    assert CrawlState.conditional_headers(PAGE_STATE._replace(etag="")) == {
+        "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+    }
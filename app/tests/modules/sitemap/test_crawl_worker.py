@@ -0,0 +1,171 @@
+import json
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.modules.sitemap.crawl_worker import (
+    _run_worker_process,
+    assemble,
+    crawl_with_workers,
+    default_worker_id,
+    main,
+    run_worker,
+)
+
+PAGES: Dict[str, str] = {
+    "https://example.com": '<title>Home</title><a href="/a">A</a>'
+    '<a href="https://external.com">E</a>',
+    "https://example.com/a": "<title>A</title>",
+}
+
+
+def _response(url: str, **kwargs: Any) -> MagicMock:
+    response_mock: MagicMock = MagicMock()
+    response_mock.status_code = 200
+    response_mock.text = PAGES.get(url, "")
+    response_mock.content = response_mock.text.encode()
+    response_mock.headers = {"Content-Type": "text/html"}
+    response_mock.iter_content.return_value = [response_mock.content]
+    response_mock.elapsed = timedelta(0)
+    response_mock.raise_for_status.return_value = None
+    return response_mock
+
+
+def test_default_worker_id_is_unique_per_index() -> None:
+    assert default_worker_id(0) != default_worker_id(1)
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get", side_effect=_response)
+def test_run_worker_then_assemble(mock_get: MagicMock, tmp_path: Path) -> None:
+    path: str = str(tmp_path / "frontier.db")
+
+    assert run_worker("https://example.com", 1, path, "w1", concurrency=2) == 2
+    _run_worker_process("https://example.com", 1, path, 1, {})
+    sitemap = assemble("https://example.com", 1, path)
+
+    assert mock_get.call_count == 2
+    assert sitemap.internal_links == {
+        "https://example.com": ["https://example.com/a"],
+        "https://example.com/a": [],
+    }
+    assert sitemap.metadata["https://example.com/a"]["title"] == "A"
+
+
+@patch("app.modules.sitemap.crawl_worker.multiprocessing.get_context")
+def test_crawl_with_workers_spawns_processes(mock_context: MagicMock) -> None:
+    mock_context.return_value.Process.return_value.exitcode = 0
+    assert crawl_with_workers("https://example.com", 2, "f.db", 3, concurrency=4) == 0
+
+    process_factory: MagicMock = mock_context.return_value.Process
+    assert process_factory.call_count == 3
+    assert process_factory.call_args.kwargs["args"] == (
+        "https://example.com",
+        2,
+        "f.db",
+        2,
+        {"concurrency": 4},
+    )
+    assert process_factory.return_value.join.call_count == 3
+
+
+@patch("app.modules.sitemap.crawl_worker.multiprocessing.get_context")
+def test_crawl_with_workers_counts_failed_workers(
+    mock_context: MagicMock, caplog: pytest.LogCaptureFixture
+) -> None:
+    processes: List[MagicMock] = [MagicMock(exitcode=0), MagicMock(exitcode=1)]
+    mock_context.return_value.Process.side_effect = processes
+    assert crawl_with_workers("https://example.com", 2, "f.db", 2) == 1
+    assert "Worker 1 exited with code 1" in caplog.text
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get", side_effect=_response)
+def test_main_writes_assembled_json(
+    mock_get: MagicMock, tmp_path: Path, capsys: Any
+) -> None:
+    path: str = str(tmp_path / "frontier.db")
+    output: Path = tmp_path / "sitemap.json"
+    run_worker("https://example.com", 1, path, "w1")
+
+    main(["https://example.com", "--depth", "1", "--store", path, "--assemble-only"])
+    printed: Dict[str, Any] = json.loads(capsys.readouterr().out)
+    main(
+        [
+            "https://example.com",
+            "--depth=1",
+            f"--store={path}",
+            "--assemble-only",
+            f"--output={output}",
+        ]
+    )
+
+    assert json.loads(output.read_text()) == printed
+    assert printed["external"] == ["https://external.com"]
+    assert printed["depths"] == {"https://example.com": 0, "https://example.com/a": 1}
+    assert printed["truncated"] is False
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get", side_effect=_response)
+def test_main_streams_records_from_store(
+    mock_get: MagicMock, tmp_path: Path, capsys: Any
+) -> None:
+    path: str = str(tmp_path / "frontier.db")
+    run_worker("https://example.com", 1, path, "w1")
+
+    main(["https://example.com", "--store", path, "--assemble-only", "--format=ndjson"])
+    records: List[Dict[str, Any]] = [
+        json.loads(line) for line in capsys.readouterr().out.splitlines()
+    ]
+    main(["https://example.com", "--store", path, "--assemble-only", "--format=csv"])
+    rows: List[str] = capsys.readouterr().out.splitlines()
+
+    assert [(record["url"], record["incoming"]) for record in records] == [
+        ("https://example.com", 0),
+        ("https://example.com/a", 1),
+        ("https://external.com", 1),
+    ]
+    assert records[1]["title"] == "A"
+    assert records[2]["type"] == "external"
+    assert rows[0] == "url,type,depth,status,title,description,incoming"
+    assert rows[2] == "https://example.com/a,internal,1,200,A,,1"
+    assert len(rows) == 4
+
+
+@patch("app.modules.sitemap.crawl_worker.write_report")
+@patch("app.modules.sitemap.crawl_worker.crawl_with_workers", return_value=0)
+def test_main_crawls_with_workers(
+    mock_crawl: MagicMock, mock_report: MagicMock
+) -> None:
+    main(["https://example.com", "--store", "f.db", "--workers", "2"])
+
+    mock_crawl.assert_called_once_with(
+        "https://example.com",
+        2,
+        "f.db",
+        2,
+        concurrency=8,
+        respect_robots=False,
+        seed_from_sitemaps=False,
+        max_pages=None,
+        max_bytes=None,
+        honor_canonical=False,
+        near_duplicate_distance=None,
+    )
+    mock_report.assert_called_once_with("https://example.com", 2, "f.db", "json", None)
+
+    mock_crawl.reset_mock()
+    main(["https://example.com", "--store", "f.db", "--collapse-duplicates"])
+    assert mock_crawl.call_args.kwargs["honor_canonical"] is True
+    assert mock_crawl.call_args.kwargs["near_duplicate_distance"] == 3
+
+
+@patch("app.modules.sitemap.crawl_worker.write_report")
+@patch("app.modules.sitemap.crawl_worker.crawl_with_workers", return_value=2)
+def test_main_exits_non_zero_when_workers_fail(
+    mock_crawl: MagicMock, mock_report: MagicMock
+) -> None:
+    with pytest.raises(SystemExit, match="2 of 2 workers failed"):
+        main(["https://example.com", "--store", "f.db", "--workers", "2"])
+    mock_report.assert_called_once()
@@ -0,0 +1,141 @@
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+from unittest.mock import patch
+
+import pytest
+
+from app.modules.sitemap.frontier import PageResult, SQLiteFrontierStore
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> Iterator[SQLiteFrontierStore]:
+    frontier_store: SQLiteFrontierStore = SQLiteFrontierStore(
+        str(tmp_path / "frontier.db"), max_attempts=2
+    )
+    yield frontier_store
+    frontier_store.close()
+
+
+def _page(links: List[str]) -> PageResult:
+    return PageResult(links, [], {"title": "T"}, {"status": 200})
+
+
+def test_claim_returns_shallowest_urls_first(store: SQLiteFrontierStore) -> None:
+    store.add([("https://example.com/deep", 2), ("https://example.com", 0)])
+    store.add([("https://example.com/a", 1)])
+
+    assert store.claim("w1", 2, 60) == [
+        ("https://example.com", 0),
+        ("https://example.com/a", 1),
+    ]
+    assert store.claim("w2", 10, 60) == [("https://example.com/deep", 2)]
+    assert store.claim("w2", 10, 60) == []
+    assert store.pending() == 3
+    assert not store.is_finished()
+
+
+def test_add_keeps_minimum_depth(store: SQLiteFrontierStore) -> None:
+    store.add([("https://example.com/a", 3)])
+    store.add([("https://example.com/a", 1), ("https://example.com/a", 2)])
+
+    assert store.claim("w1", 10, 60) == [("https://example.com/a", 1)]
+
+
+def test_done_url_found_at_lower_depth_is_queued_again(
+    store: SQLiteFrontierStore,
+) -> None:
+    store.add([("https://example.com/a", 2), ("https://example.com/b", 2)])
+    store.claim("w1", 10, 60)
+    store.complete("https://example.com/a", _page([]))
+    store.complete("https://example.com/b", PageResult([], [], None, {"status": 404}))
+    assert store.is_finished()
+
+    store.add([("https://example.com/a", 1), ("https://example.com/b", 1)])
+    store.add([("https://example.com/a", 2)])
+    assert store.claim("w1", 10, 60) == [("https://example.com/a", 1)]
+    assert [(url, depth) for url, depth, _ in store.results()] == [
+        ("https://example.com/a", 1),
+        ("https://example.com/b", 1),
+    ]
+
+
+def test_complete_stores_result_and_adds_links(store: SQLiteFrontierStore) -> None:
+    store.add([("https://example.com", 0)])
+    store.claim("w1", 10, 60)
+    store.complete(
+        "https://example.com",
+        _page(["https://example.com/a"]),
+        [("https://example.com/a", 1), ("https://example.com", 1)],
+    )
+
+    assert store.claim("w1", 10, 60) == [("https://example.com/a", 1)]
+    store.complete("https://example.com/a", PageResult([], [], None, {"status": 404}))
+
+    assert store.is_finished()
+    results: List[Tuple[str, int, Optional[PageResult]]] = list(store.results())
+    assert results == [
+        ("https://example.com", 0, _page(["https://example.com/a"])),
+        ("https://example.com/a", 1, PageResult([], [], None, {"status": 404})),
+    ]
+
+
+def test_expired_lease_is_reclaimed_then_failed(
+    store: SQLiteFrontierStore,
+) -> None:
+    store.add([("https://example.com", 0)])
+    with patch("app.modules.sitemap.frontier.time.time", return_value=100.0):
+        assert store.claim("w1", 10, 5) == [("https://example.com", 0)]
+    with patch("app.modules.sitemap.frontier.time.time", return_value=106.0):
+        assert store.claim("w2", 10, 5) == [("https://example.com", 0)]
+    with patch("app.modules.sitemap.frontier.time.time", return_value=112.0):
+        assert store.claim("w3", 10, 5) == []
+
+    assert store.is_finished()
+    assert list(store.results()) == [
+        ("https://example.com", 0, PageResult([], [], None, {"status": None}))
+    ]
+
+
+def test_unvisited_urls_have_no_result(store: SQLiteFrontierStore) -> None:
+    store.add([("https://example.com", 0)])
+
+    assert list(store.results()) == [("https://example.com", 0, None)]
+
+
+def test_failed_transaction_is_rolled_back(store: SQLiteFrontierStore) -> None:
+    with pytest.raises(ValueError):
+        store.add([("https://example.com", 0), ("https://example.com/a",)])  # type: ignore[list-item]
+
+    assert list(store.results()) == []
+
+
+def test_page_and_external_rows_count_incoming_links(
+    store: SQLiteFrontierStore,
+) -> None:
+    store.add([("https://example.com", 0)])
+    store.claim("w1", 10, 60)
+    store.complete(
+        "https://example.com",
+        PageResult(
+            ["https://example.com/a", "https://example.com/b"],
+            ["https://external.com"],
+            {"title": "Home"},
+            {"status": 200},
+        ),
+        [("https://example.com/a", 1), ("https://example.com/b", 1)],
+    )
+    store.claim("w1", 10, 60)
+    store.complete(
+        "https://example.com/a",
+        PageResult(
+            ["https://example.com/b"], ["https://external.com"], {"title": "A"}, {}
+        ),
+    )
+
+    assert [
+        (url, depth, incoming) for url, depth, _, incoming in store.page_rows()
+    ] == [
+        ("https://example.com", 0, 0),
+        ("https://example.com/a", 1, 1),
+    ]
+    assert list(store.external_rows()) == [("https://external.com", 2)]
@@ -1,5 +1,9 @@
 from typing import Any, Dict, List
-from app.modules.sitemap.jstree_formatter import sitemap_to_jstree_formatter
+from app.modules.sitemap.jstree_formatter import (
+    JsTreeIndex,
+    sitemap_to_jstree_formatter,
+    sitemap_to_text_outline,
+)
 
 
 def test_empty_root_returns_empty_list() -> None:
@@ -21,7 +25,7 @@ def test_root_with_no_children() -> None:
     }
     result: List[Dict[str, Any]] = sitemap_to_jstree_formatter(sitemap)
     assert len(result) == 1
-    assert result[0]["id"] == "https://example.com"
+    assert result[0]["text"] == "https://example.com"
     assert result[0]["parent"] == "#"
     assert result[0]["icon"] == "fa-regular fa-file"
 
@@ -38,12 +42,13 @@ def test_internal_links_hierarchy() -> None:
         "response": {},
     }
     result: List[Dict[str, Any]] = sitemap_to_jstree_formatter(sitemap)
-    ids = [node["id"] for node in result]
-    assert "https://example.com" in ids
-    assert "https://example.com>https://example.com/about" in ids
-    assert (
-        "https://example.com>https://example.com/about>https://example.com/team" in ids
-    )
+    assert [(node["text"], node["parent"]) for node in result] == [
+        ("https://example.com", "#"),
+        ("https://example.com/about", result[0]["id"]),
+        ("https://example.com/team", result[1]["id"]),
+    ]
+    assert len({node["id"] for node in result}) == 3
+    assert all(len(node["id"]) < 10 for node in result)
     assert all("status" not in node for node in result)
 
 
@@ -68,9 +73,236 @@ def test_external_links_added() -> None:
         "response": {},
     }
     result: List[Dict[str, Any]] = sitemap_to_jstree_formatter(sitemap)
-    external_ids = [node["id"] for node in result if node["parent"] == "__external__"]
+    external_texts = [
+        node["text"] for node in result if node["parent"] == "__external__"
+    ]
     assert "__external__" in [node["id"] for node in result]
-    assert sorted(external_ids) == [
-        "__external__>https://external.com",
-        "__external__>https://z.com",
+    assert external_texts == ["https://external.com", "https://z.com"]
+
+
+def test_crawl_depths_are_reused() -> None:
+    sitemap: Dict[str, Any] = {
+        "root": "https://example.com",
+        "internal": {
+            "https://example.com": [
+                "https://example.com/about",
+                "https://example.com/team",
+            ],
+            "https://example.com/about": ["https://example.com/team"],
+        },
+        "external": [],
+        "response": {},
+        "depths": {
+            "https://example.com": 0,
+            "https://example.com/about": 1,
+            "https://example.com/team": 2,
+        },
+    }
+    result: List[Dict[str, Any]] = sitemap_to_jstree_formatter(sitemap)
+    assert [(node["text"], node["parent"]) for node in result] == [
+        ("https://example.com", "#"),
+        ("https://example.com/about", result[0]["id"]),
+        ("https://example.com/team", result[1]["id"]),
+    ]
+
+
+def test_shared_child_is_listed_under_each_parent_at_min_depth() -> None:
+    sitemap: Dict[str, Any] = {
+        "root": "https://example.com",
+        "internal": {
+            "https://example.com": ["https://example.com/b", "https://example.com/a"],
+            "https://example.com/a": ["https://example.com/c"],
+            "https://example.com/b": ["https://example.com/c", "https://example.com"],
+        },
+        "external": [],
+        "response": {},
+    }
+    result: List[Dict[str, Any]] = sitemap_to_jstree_formatter(sitemap)
+    texts: List[str] = [node["text"] for node in result]
+    assert texts == [
+        "https://example.com",
+        "https://example.com/a",
+        "https://example.com/c",
+        "https://example.com/b",
+        "https://example.com/c",
+    ]
+    assert result[2]["parent"] == result[1]["id"]
+    assert result[4]["parent"] == result[3]["id"]
+
+
+def test_deep_tree_is_formatted_without_recursion() -> None:
+    chain_length: int = 3000
+    urls: List[str] = [f"https://example.com/{index}" for index in range(chain_length)]
+    sitemap: Dict[str, Any] = {
+        "root": urls[0],
+        "internal": {url: [child] for url, child in zip(urls, urls[1:])},
+        "external": [],
+        "response": {},
+        "depths": {url: index for index, url in enumerate(urls)},
+    }
+    result: List[Dict[str, Any]] = sitemap_to_jstree_formatter(sitemap)
+    assert len(result) == chain_length
+    assert result[-1]["parent"] == result[-2]["id"]
+    assert max(len(node["id"]) for node in result) < 12
+
+
+def test_index_lazy_nodes_and_details() -> None:
+    sitemap: Dict[str, Any] = {
+        "root": "https://example.com",
+        "internal": {
+            "https://example.com": ["https://example.com/about"],
+            "https://example.com/about": [],
+        },
+        "external": ["https://external.com"],
+        "metadata": {"https://example.com": {"title": "Home"}},
+        "incoming": {"https://example.com/about": ["https://example.com"]},
+        "response": {"https://example.com/about": {"status": 404}},
+    }
+    index: JsTreeIndex = JsTreeIndex(sitemap)
+
+    assert index.root_nodes() == [
+        {
+            "text": "https://example.com",
+            "icon": "fa fa-folder",
+            "children": True,
+            "crawled": True,
+        },
+        {
+            "id": "__external__",
+            "text": "External Links",
+            "icon": "fa fa-folder",
+            "children": True,
+        },
+    ]
+    assert index.child_nodes("https://example.com") == [
+        {
+            "text": "https://example.com/about",
+            "icon": "fa-regular fa-file",
+            "status": 404,
+            "children": False,
+            "crawled": False,
+        }
+    ]
+    assert index.child_nodes("https://unknown.com") == []
+    assert index.details("https://example.com/about") == {
+        "url": "https://example.com/about",
+        "metadata": None,
+        "incoming": ["https://example.com"],
+    }
+    assert JsTreeIndex({"root": None}).root_nodes() == []
+
+
+def test_text_outline() -> None:
+    sitemap: Dict[str, Any] = {
+        "root": "https://example.com",
+        "internal": {"https://example.com": ["https://example.com/about"]},
+        "external": ["https://external.com"],
+        "response": {},
+    }
+    assert "".join(sitemap_to_text_outline(sitemap)) == (
+        "- https://example.com\n"
+        "  - https://example.com/about\n"
+        "- External Links\n"
+        "  - https://external.com\n"
+    )
+    assert "".join(sitemap_to_text_outline(sitemap, include_internal=False)) == (
+        "- External Links\n  - https://external.com\n"
+    )
+    assert list(sitemap_to_text_outline({"root": None}, include_external=False)) == []
+
+
+SEEDED_SITEMAP: Dict[str, Any] = {
+    "root": "https://example.com",
+    "internal": {
+        "https://example.com": ["https://example.com/a"],
+        "https://example.com/a": [],
+        "https://example.com/deep": ["https://example.com/deep/child"],
+        "https://example.com/deep/child": [],
+    },
+    "external": [],
+    "incoming": {
+        "https://example.com/a": ["https://example.com"],
+        "https://example.com/deep/child": ["https://example.com/deep"],
+    },
+    "response": {},
+    "depths": {
+        "https://example.com": 0,
+        "https://example.com/a": 1,
+        "https://example.com/deep": 1,
+        "https://example.com/deep/child": 2,
+    },
+    "seeded": [
+        "https://example.com",
+        "https://example.com/a",
+        "https://example.com/deep",
+        "https://example.com/unfetched",
+    ],
+}
+
+
+def test_seeded_orphans_get_their_own_folder() -> None:
+    index: JsTreeIndex = JsTreeIndex(SEEDED_SITEMAP)
+    assert index.orphans == ["https://example.com/deep"]
+    assert [node.get("id", node["text"]) for node in index.root_nodes()] == [
+        "https://example.com",
+        "__seeded__",
+    ]
+    assert [node["text"] for node in index.child_nodes("__seeded__")] == [
+        "https://example.com/deep"
+    ]
+
+    result: List[Dict[str, Any]] = sitemap_to_jstree_formatter(SEEDED_SITEMAP)
+    assert [(node["text"], node["parent"]) for node in result] == [
+        ("https://example.com", "#"),
+        ("https://example.com/a", "node-0"),
+        ("From sitemap.xml", "#"),
+        ("https://example.com/deep", "__seeded__"),
+        ("https://example.com/deep/child", "node-3"),
+    ]
+    assert "".join(sitemap_to_text_outline(SEEDED_SITEMAP)) == (
+        "- https://example.com\n"
+        "  - https://example.com/a\n"
+        "- From sitemap.xml\n"
+        "  - https://example.com/deep\n"
+        "    - https://example.com/deep/child\n"
+    )
+
+
+def test_external_nodes_carry_link_check_status() -> None:
+    index: JsTreeIndex = JsTreeIndex(
+        {
+            "root": "https://example.com",
+            "internal": {"https://example.com": []},
+            "external": ["https://broken.com", "https://ok.com"],
+            "response": {
+                "https://broken.com": {"status": None, "error": "refused"},
+                "https://ok.com": {"status": 200, "method": "HEAD"},
+            },
+        }
+    )
+
+    assert index.child_nodes("__external__") == [
+        {"text": "https://broken.com", "icon": "fa fa-link", "status": None},
+        {"text": "https://ok.com", "icon": "fa fa-link", "status": 200},
+    ]
+
+
+def test_robots_blocked_pages_are_marked() -> None:
+    index: JsTreeIndex = JsTreeIndex(
+        {
+            "root": "https://example.com",
+            "internal": {"https://example.com": ["https://example.com/private"]},
+            "metadata": {"https://example.com": {"title": "Home"}},
+            "depths": {"https://example.com": 0, "https://example.com/private": 1},
+            "blocked": ["https://example.com/private"],
+        }
+    )
+    assert index.child_nodes("https://example.com") == [
+        {
+            "text": "https://example.com/private",
+            "icon": "fa-regular fa-file",
+            "children": False,
+            "crawled": False,
+            "blocked": True,
+        }
     ]
@@ -0,0 +1,134 @@
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+from requests import ConnectionError, Timeout
+
+from app.modules.sitemap.link_checker import LINK_CHECKS, LinkCheckCache, LinkChecker
+
+
+def _response(status_code: int) -> MagicMock:
+    response_mock: MagicMock = MagicMock()
+    response_mock.status_code = status_code
+    return response_mock
+
+
+def _client(head: Dict[str, Any], get: Dict[str, Any]) -> MagicMock:
+    def respond(statuses: Dict[str, Any]) -> Any:
+        def side_effect(url: str, **kwargs: Any) -> MagicMock:
+            status: Any = statuses[url]
+            if isinstance(status, Exception):
+                raise status
+            return _response(status)
+
+        return side_effect
+
+    client: MagicMock = MagicMock()
+    client.head.side_effect = respond(head)
+    client.get.side_effect = respond(get)
+    return client
+
+
+def test_cache_expires_and_evicts_least_recently_used() -> None:
+    cache: LinkCheckCache = LinkCheckCache(ttl=60, max_entries=2)
+    with patch("app.modules.sitemap.link_checker.time.time", return_value=100.0):
+        cache.set("https://a.com", {"status": 200})
+        cache.set("https://b.com", {"status": 404})
+        assert cache.get("https://a.com") == {"status": 200}
+        cache.set("https://c.com", {"status": 200})
+    assert len(cache) == 2
+
+    with patch("app.modules.sitemap.link_checker.time.time", return_value=150.0):
+        assert cache.get("https://b.com") is None
+        assert cache.get("https://a.com") == {"status": 200}
+    with patch("app.modules.sitemap.link_checker.time.time", return_value=200.0):
+        assert cache.get("https://c.com") is None
+    assert len(cache) == 1
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_head_first_with_get_fallback() -> None:
+    client: MagicMock = _client(
+        head={"https://a.com": 200, "https://b.com": 405, "https://c.com": 404},
+        get={"https://b.com": 200, "https://c.com": 404},
+    )
+    checker: LinkChecker = LinkChecker(client=client, concurrency=4)
+
+    results: Dict[str, Dict[str, Any]] = checker.check(
+        ["https://a.com", "https://b.com", "https://c.com", "https://a.com"]
+    )
+
+    assert results == {
+        "https://a.com": {"status": 200, "method": "HEAD"},
+        "https://b.com": {"status": 200, "method": "GET"},
+        "https://c.com": {"status": 404, "method": "GET"},
+    }
+    assert client.head.call_count == 3
+    assert client.get.call_args.kwargs == {"allow_redirects": True, "stream": True}
+
+
+def test_only_http_links_are_checked() -> None:
+    client: MagicMock = _client(head={"HTTPS://a.com": 200}, get={})
+    checker: LinkChecker = LinkChecker(client=client, cache=LinkCheckCache())
+
+    results: Dict[str, Dict[str, Any]] = checker.check(
+        [
+            "mailto:team@example.com",
+            "tel:+15555550100",
+            "javascript:void(0)",
+            "HTTPS://a.com",
+        ]
+    )
+
+    assert results == {"HTTPS://a.com": {"status": 200, "method": "HEAD"}}
+    assert client.head.call_count == 1
+    assert checker.cache is not None and len(checker.cache) == 1
+
+
+def test_unreachable_host_is_not_retried_for_other_urls() -> None:
+    client: MagicMock = _client(
+        head={
+            "https://down.com/1": ConnectionError("refused"),
+            "https://down.com/2": 200,
+            "https://slow.com": Timeout("timed out"),
+        },
+        get={},
+    )
+    checker: LinkChecker = LinkChecker(client=client, concurrency=1)
+    skipped: float = LINK_CHECKS.value(result="skipped")
+
+    results: Dict[str, Dict[str, Any]] = checker.check(
+        ["https://down.com/1", "https://down.com/2", "https://slow.com"]
+    )
+
+    assert results == {
+        "https://down.com/1": {"status": None, "error": "refused"},
+        "https://down.com/2": {"status": None, "error": "refused"},
+        "https://slow.com": {"status": None, "error": "timed out"},
+    }
+    assert client.head.call_count == 2
+    assert LINK_CHECKS.value(result="skipped") == skipped + 1
+
+
+def test_cached_results_are_reused_across_checkers() -> None:
+    cache: LinkCheckCache = LinkCheckCache()
+    client: MagicMock = _client(
+        head={"https://a.com": 200, "https://b.com": Timeout("timed out")}, get={}
+    )
+    remaining: List[int] = []
+
+    LinkChecker(client=client, cache=cache).check(
+        ["https://a.com", "https://b.com"], on_checked=remaining.append
+    )
+    results: Dict[str, Dict[str, Any]] = LinkChecker(client=client, cache=cache).check(
+        ["https://a.com", "https://b.com"]
+    )
+
+    assert remaining == [1, 0]
+    assert results["https://a.com"] == {"status": 200, "method": "HEAD"}
+    assert [call.args[0] for call in client.head.call_args_list] == [
+        "https://a.com",
+        "https://b.com",
+        "https://b.com",
+    ]
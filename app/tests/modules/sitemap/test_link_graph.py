@@ -0,0 +1,68 @@
+from app.modules.sitemap.link_graph import LinkGraph
+
+
+def test_urls_are_interned() -> None:
+    graph: LinkGraph = LinkGraph()
+    first: int = graph.intern("https://example.com")
+    assert graph.intern("https://example.com") == first
+    assert graph.intern("https://example.com/about") == first + 1
+    assert graph.url(first) == "https://example.com"
+    assert len(graph) == 2
+    assert "https://example.com/about" in graph
+    assert "https://example.com/missing" not in graph
+
+
+def test_add_page_dedupes_and_keeps_link_order() -> None:
+    graph: LinkGraph = LinkGraph()
+    graph.add_page(
+        "https://example.com",
+        ["https://example.com/b", "https://example.com/a", "https://example.com/b"],
+        ["https://external.com", "https://external.com"],
+    )
+
+    assert graph.links("https://example.com") == [
+        "https://example.com/b",
+        "https://example.com/a",
+    ]
+    assert graph.incoming("https://external.com") == ["https://example.com"]
+    assert graph.incoming("https://example.com") == []
+    assert graph.incoming("https://example.com/missing") == []
+    assert graph.is_page("https://example.com")
+    assert not graph.is_page("https://example.com/a")
+    assert not graph.is_page("https://example.com/missing")
+    assert graph.edge_count == 3
+
+
+def test_exports_match_dict_format() -> None:
+    graph: LinkGraph = LinkGraph()
+    graph.add_page("https://example.com", ["https://example.com/a"])
+    graph.add_page(
+        "https://example.com/a", ["https://example.com/b"], ["https://external.com"]
+    )
+    graph.add_page("https://example.com/b", ["https://example.com/a"])
+
+    assert graph.internal_links() == {
+        "https://example.com": ["https://example.com/a"],
+        "https://example.com/a": ["https://example.com/b"],
+        "https://example.com/b": ["https://example.com/a"],
+    }
+    assert graph.incoming_links() == {
+        "https://example.com": [],
+        "https://example.com/a": ["https://example.com", "https://example.com/b"],
+        "https://example.com/b": ["https://example.com/a"],
+        "https://external.com": ["https://example.com/a"],
+    }
+
+
+def test_readding_page_replaces_its_edges() -> None:
+    graph: LinkGraph = LinkGraph()
+    graph.add_page("https://example.com", ["https://example.com/a"])
+    graph.add_page("https://example.com/a", ["https://example.com/b"])
+    graph.add_page("https://example.com", ["https://example.com/b"])
+
+    assert graph.links("https://example.com") == ["https://example.com/b"]
+    assert graph.incoming("https://example.com/a") == []
+    assert graph.incoming("https://example.com/b") == [
+        "https://example.com/a",
+        "https://example.com",
+    ]
@@ -0,0 +1,111 @@
+from typing import Any, List, Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.modules.meta_tags.browser_pool import BrowserPool
+from app.modules.page_parser.page_parser import PageData
+from app.modules.sitemap.page_renderer import (
+    PAGE_RENDERS,
+    PageRenderer,
+    visible_text_length,
+)
+
+ARTICLE: str = "<p>" + "Plenty of server rendered words. " * 20 + "</p>"
+
+
+def _page(links: int = 0) -> PageData:
+    return PageData([f"/{index}" for index in range(links)], "", "", "")
+
+
+def _pool(driver: MagicMock) -> BrowserPool:
+    return BrowserPool(size=1, driver_factory=MagicMock(return_value=driver))
+
+
+def _driver(page_source: str = "<a href='/x'>X</a>", **kwargs: Any) -> MagicMock:
+    driver: MagicMock = MagicMock(**kwargs)
+    driver.page_source = page_source
+    driver.execute_script.return_value = 5
+    return driver
+
+
+def test_visible_text_length_ignores_markup_and_scripts() -> None:
+    html: str = (
+        "<html><head><style>body { color: red }</style></head><body>"
+        "<script>var app = 'lots of code';</script><p>Hi  there</p></body></html>"
+    )
+    assert visible_text_length(html) == len("Hithere")
+
+
+@pytest.mark.parametrize(
+    "html, links, expected",
+    [
+        ('<div id="root"></div><script src="/bundle.js"></script>', 0, "framework"),
+        ('<script id="__NEXT_DATA__">{}</script>' + ARTICLE, 1, "framework"),
+        (
+            "<noscript>Please enable JavaScript to run this app.</noscript>",
+            0,
+            "noscript",
+        ),
+        ("<body><p>Loading…</p></body>", 2, "empty"),
+        (ARTICLE, 1, None),
+        ('<div id="root"></div>', 3, None),
+    ],
+)
+def test_reason_flags_pages_that_look_client_rendered(
+    html: str, links: int, expected: Optional[str]
+) -> None:
+    renderer: PageRenderer = PageRenderer(MagicMock())
+    assert renderer.reason(html, _page(links)) == expected
+
+
+def test_render_returns_dom_after_links_appear() -> None:
+    driver: MagicMock = _driver()
+    driver.execute_script.side_effect = [0, 1, 4]
+    renderer: PageRenderer = PageRenderer(_pool(driver), poll_interval=0)
+    rendered: float = PAGE_RENDERS.value(result="rendered")
+
+    assert renderer.render("https://example.com/app") == "<a href='/x'>X</a>"
+    driver.set_page_load_timeout.assert_called_once_with(20)
+    driver.get.assert_called_once_with("https://example.com/app")
+    assert driver.execute_script.call_count == 3
+    assert PAGE_RENDERS.value(result="rendered") == rendered + 1
+
+
+def test_render_stops_waiting_after_settle_timeout() -> None:
+    driver: MagicMock = _driver()
+    driver.execute_script.return_value = 0
+    renderer: PageRenderer = PageRenderer(
+        _pool(driver), settle_seconds=0.05, poll_interval=0.01
+    )
+    assert renderer.render("https://example.com/app") == driver.page_source
+    assert driver.execute_script.call_count >= 2
+
+
+def test_render_failure_discards_the_browser_session() -> None:
+    drivers: List[MagicMock] = []
+
+    def create() -> MagicMock:
+        driver: MagicMock = _driver()
+        driver.get.side_effect = RuntimeError("timeout")
+        drivers.append(driver)
+        return driver
+
+    pool: BrowserPool = BrowserPool(size=1, driver_factory=create)
+    renderer: PageRenderer = PageRenderer(pool)
+    failed: float = PAGE_RENDERS.value(result="failed")
+
+    assert renderer.render("https://example.com/app") is None
+    assert PAGE_RENDERS.value(result="failed") == failed + 1
+    drivers[0].quit.assert_called_once_with()
+
+
+def test_render_respects_page_budget() -> None:
+    driver: MagicMock = _driver()
+    renderer: PageRenderer = PageRenderer(_pool(driver), max_pages=1)
+    over_budget: float = PAGE_RENDERS.value(result="over_budget")
+
+    assert renderer.render("https://example.com/one") is not None
+    assert renderer.render("https://example.com/two") is None
+    assert driver.get.call_count == 1
+    assert PAGE_RENDERS.value(result="over_budget") == over_budget + 1
@@ -0,0 +1,186 @@
+import gzip
+from typing import Any, Dict
+from unittest.mock import MagicMock
+
+import pytest
+from requests import HTTPError, RequestException
+
+from app.modules.sitemap.robots import (
+    RobotsPolicy,
+    fetch_robots,
+    fetch_sitemap_urls,
+    site_root,
+)
+
+ROBOTS_TXT: str = """
+User-agent: *
+Disallow: /private
+Allow: /private/public
+Crawl-delay: 2
+
+Sitemap: https://example.com/sitemap_index.xml
+"""
+
+URLSET: str = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc> https://example.com/a </loc><lastmod>2025-01-01</lastmod></url>
+  <url><loc>https://example.com/b</loc></url>
+  <url><lastmod>2025-01-01</lastmod></url>
+</urlset>
+"""
+
+SITEMAP_INDEX: str = """<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://example.com/pages.xml</loc></sitemap>
+  <sitemap><loc>https://example.com/posts.xml.gz</loc></sitemap>
+  <sitemap><loc>https://example.com/sitemap_index.xml</loc></sitemap>
+</sitemapindex>
+"""
+
+POSTS: str = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://example.com/b</loc></url>
+  <url><loc>https://example.com/posts/1</loc></url>
+</urlset>
+"""
+
+
+def _response(status: int = 200, body: Any = "") -> MagicMock:
+    response: MagicMock = MagicMock()
+    response.status_code = status
+    response.text = body if isinstance(body, str) else ""
+    response.content = body.encode() if isinstance(body, str) else body
+    response.iter_content.side_effect = lambda **kwargs: iter(
+        [response.content[:10], response.content[10:]]
+    )
+    if status >= 400:
+        response.raise_for_status.side_effect = HTTPError(f"{status}")
+    return response
+
+
+def _client(pages: Dict[str, MagicMock]) -> MagicMock:
+    client: MagicMock = MagicMock()
+    client.get.side_effect = lambda url, **kwargs: pages.get(url, _response(404))
+    return client
+
+
+def test_site_root() -> None:
+    assert site_root("https://example.com/a/b?c=1") == "https://example.com"
+
+
+def test_robots_policy_rules_and_delay() -> None:
+    policy: RobotsPolicy = RobotsPolicy(ROBOTS_TXT)
+    assert policy.can_fetch("https://example.com/about")
+    assert not policy.can_fetch("https://example.com/private/page")
+    assert policy.crawl_delay == 2
+    assert policy.sitemaps == ["https://example.com/sitemap_index.xml"]
+
+
+def test_robots_policy_request_rate_and_defaults() -> None:
+    policy: RobotsPolicy = RobotsPolicy("User-agent: *\nRequest-rate: 2/1\n")
+    assert policy.crawl_delay == 0.5
+    empty: RobotsPolicy = RobotsPolicy()
+    assert empty.can_fetch("https://example.com/anything")
+    assert empty.crawl_delay == 0
+    assert empty.sitemaps == []
+
+
+def test_robots_policy_matches_specific_user_agent() -> None:
+    policy: RobotsPolicy = RobotsPolicy(
+        "User-agent: qatools\nDisallow: /\n\nUser-agent: *\nDisallow:\n"
+    )
+    assert not policy.can_fetch("https://example.com/")
+
+
+@pytest.mark.parametrize(
+    "response, allowed",
+    [
+        (_response(200, ROBOTS_TXT), False),
+        (_response(404), True),
+        (RequestException("boom"), True),
+    ],
+)
+def test_fetch_robots(response: Any, allowed: bool) -> None:
+    client: MagicMock = MagicMock()
+    client.get.side_effect = [response]
+    policy: RobotsPolicy = fetch_robots(client, "https://example.com/some/page")
+    client.get.assert_called_once_with("https://example.com/robots.txt")
+    assert policy.can_fetch("https://example.com/private") is allowed
+
+
+def test_fetch_sitemap_urls_follows_indexes_and_gzip() -> None:
+    client: MagicMock = _client(
+        {
+            "https://example.com/sitemap_index.xml": _response(200, SITEMAP_INDEX),
+            "https://example.com/pages.xml": _response(200, URLSET),
+            "https://example.com/posts.xml.gz": _response(
+                200, gzip.compress(POSTS.encode())
+            ),
+        }
+    )
+    assert fetch_sitemap_urls(client, ["https://example.com/sitemap_index.xml"]) == [
+        "https://example.com/a",
+        "https://example.com/b",
+        "https://example.com/posts/1",
+    ]
+    assert client.get.call_count == 3
+
+
+def test_fetch_sitemap_urls_skips_broken_sitemaps() -> None:
+    client: MagicMock = _client(
+        {
+            "https://example.com/broken.xml": _response(200, "<urlset><url>"),
+            "https://example.com/pages.xml": _response(200, URLSET),
+        }
+    )
+    assert fetch_sitemap_urls(
+        client,
+        [
+            "https://example.com/missing.xml",
+            "https://example.com/broken.xml",
+            "https://example.com/pages.xml",
+        ],
+    ) == ["https://example.com/a", "https://example.com/b"]
+
+
+def test_fetch_sitemap_urls_limits() -> None:
+    client: MagicMock = _client(
+        {
+            "https://example.com/sitemap_index.xml": _response(200, SITEMAP_INDEX),
+            "https://example.com/pages.xml": _response(200, URLSET),
+        }
+    )
+    assert fetch_sitemap_urls(
+        client, ["https://example.com/sitemap_index.xml"], max_urls=1
+    ) == ["https://example.com/a"]
+    assert (
+        fetch_sitemap_urls(
+            client, ["https://example.com/sitemap_index.xml"], max_files=1
+        )
+        == []
+    )
+
+
+def test_fetch_sitemap_urls_skips_oversized_and_gzip_bomb_sitemaps() -> None:
+    bomb: bytes = gzip.compress(b"<urlset>" + b" " * 1_000_000 + b"</urlset>")
+    client: MagicMock = _client(
+        {
+            "https://example.com/big.xml": _response(200, URLSET + " " * 5000),
+            "https://example.com/bomb.xml.gz": _response(200, bomb),
+            "https://example.com/pages.xml.gz": _response(
+                200, gzip.compress(URLSET.encode())
+            ),
+        }
+    )
+    assert len(bomb) < 4000
+    assert fetch_sitemap_urls(
+        client,
+        [
+            "https://example.com/big.xml",
+            "https://example.com/bomb.xml.gz",
+            "https://example.com/pages.xml.gz",
+        ],
+        max_bytes=4000,
+    ) == ["https://example.com/a", "https://example.com/b"]
+    for call in client.get.call_args_list:
+        assert call.kwargs == {"stream": True}
@@ -0,0 +1,59 @@
+import random
+from typing import List
+
+from app.modules.sitemap.simhash import (
+    SimhashIndex,
+    _feature_hash,
+    hamming_distance,
+    simhash,
+)
+
+
+def _words(count: int, seed: int = 0) -> List[str]:
+    rng: random.Random = random.Random(seed)
+    return [f"word{rng.randrange(500)}" for _ in range(count)]
+
+
+def _reference_simhash(words: List[str], shingle_size: int = 3) -> int:
+    features = {
+        " ".join(words[index : index + shingle_size])
+        for index in range(len(words) - shingle_size + 1)
+    }
+    weights: List[int] = [0] * 64
+    for feature in features:
+        value: int = _feature_hash(feature)
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def test_simhash_matches_per_bit_reference() -> None:
+    words: List[str] = _words(400)
+    assert simhash(" ".join(words)) == _reference_simhash(words)
+
+
+def test_simhash_is_close_for_near_duplicates_and_far_otherwise() -> None:
+    words: List[str] = _words(1000)
+    original: int = simhash(" ".join(words))
+    edited: int = simhash(" ".join(words[:500] + ["changed"] + words[500:]))
+    unrelated: int = simhash(" ".join(_words(1000, seed=1)))
+    assert hamming_distance(original, edited) <= 3
+    assert hamming_distance(original, unrelated) > 10
+
+
+def test_simhash_normalizes_case_and_handles_short_text() -> None:
+    assert simhash("Hello   WORLD again") == simhash("hello world again")
+    assert simhash("two words") != 0
+    assert simhash("") == 0
+    assert simhash("<> !!") == 0
+
+
+def test_simhash_index_finds_near_duplicates() -> None:
+    index: SimhashIndex = SimhashIndex(max_distance=3)
+    base: int = 0x0123456789ABCDEF
+    assert index.add(base, "https://example.com/a") is None
+    assert index.add(base ^ 0b111, "https://example.com/b") == "https://example.com/a"
+    assert index.add(base ^ 0b1111, "https://example.com/c") is None
+    assert index.add(base ^ (1 << 63), "https://example.com/d") == (
+        "https://example.com/a"
+    )
@@ -1,9 +1,27 @@
+import io
+import time
+from pathlib import Path
+from datetime import timedelta
+from threading import Lock, Thread
 from unittest.mock import patch, MagicMock
-from bs4 import BeautifulSoup
 from requests import RequestException
 from requests.models import Response
-from typing import Set, Any
-from app.modules.sitemap.sitemap import Sitemap
+from typing import Dict, List, Any, Optional
+import pytest
+from app.modules.page_parser.page_parser import PageData, get_page_parser
+from app.modules.sitemap.crawl_state import CrawlState, PageState
+from app.modules.sitemap.frontier import PageResult, SQLiteFrontierStore
+from app.modules.sitemap.jstree_formatter import (
+    sitemap_to_jstree_formatter,
+    sitemap_to_text_outline,
+)
+from app.modules.sitemap.sitemap import (
+    CRAWL_PAGES,
+    CRAWL_PHASE_SECONDS,
+    CRAWL_REQUESTS_IN_FLIGHT,
+    CRAWL_RESPONSE_BYTES,
+    Sitemap,
+)
 
 HTML_PAGE: str = """
 <html>
@@ -19,14 +37,36 @@ HTML_PAGE: str = """
 </html>
 """
 
+SITE_PAGES: Dict[str, str] = {
+    "https://example.com": (
+        '<a href="/a">A</a><a href="/b">B</a><a href="https://external.com">E</a>'
+    ),
+    "https://example.com/a": '<title>A</title><a href="/c">C</a>',
+    "https://example.com/b": '<title>B</title><a href="/c">C</a><a href="/d">D</a>',
+    "https://example.com/c": "<title>C</title>",
+    "https://example.com/d": "<title>D</title>",
+}
 
-@patch("app.modules.sitemap.sitemap.get")
-def test_extract_links_with_depth(mock_get: MagicMock) -> None:
+
+def _mock_response(text: str) -> MagicMock:
     response_mock: MagicMock = MagicMock()
     response_mock.status_code = 200
-    response_mock.text = HTML_PAGE
+    response_mock.text = text
+    response_mock.content = text.encode()
+    response_mock.headers = {"Content-Type": "text/html; charset=utf-8"}
+    response_mock.iter_content.side_effect = lambda **kwargs: iter([text.encode()])
+    response_mock.elapsed = timedelta(0)
     response_mock.raise_for_status.return_value = None
-    mock_get.return_value = response_mock
+    return response_mock
+
+
+def _site_response(url: str, **kwargs: Any) -> MagicMock:
+    return _mock_response(SITE_PAGES.get(url, ""))
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get")
+def test_extract_links_with_depth(mock_get: MagicMock) -> None:
+    mock_get.return_value = _mock_response(HTML_PAGE)
 
     sitemap: Sitemap = Sitemap(
         "https://example.com", max_depth=1, exclude_substrings=[]
@@ -47,13 +87,9 @@ def test_extract_links_with_depth(mock_get: MagicMock) -> None:
     assert "https://example.com" in data["incoming"]["https://external.com"]
 
 
-@patch("app.modules.sitemap.sitemap.get")
+@patch("app.modules.http_client.http_client.HttpClient.get")
 def test_extract_links_with_exclusion(mock_get: MagicMock) -> None:
-    response_mock: MagicMock = MagicMock()
-    response_mock.status_code = 200
-    response_mock.text = HTML_PAGE
-    response_mock.raise_for_status.return_value = None
-    mock_get.return_value = response_mock
+    mock_get.return_value = _mock_response(HTML_PAGE)
 
     sitemap: Sitemap = Sitemap(
         "https://example.com", max_depth=1, exclude_substrings=["about"]
@@ -67,7 +103,7 @@ def test_extract_links_with_exclusion(mock_get: MagicMock) -> None:
     assert "https://example.com" in data["incoming"]["https://external.com"]
 
 
-@patch("app.modules.sitemap.sitemap.get")
+@patch("app.modules.http_client.http_client.HttpClient.get")
 def test_extract_links_with_request_exception(mock_get: MagicMock) -> None:
     response_mock: Response = Response()
     response_mock.status_code = 404
@@ -85,80 +121,1004 @@ def test_extract_links_with_request_exception(mock_get: MagicMock) -> None:
     assert data["response"]["https://fail.com"]["status"] == 404
 
 
-def test_normalize_url() -> None:
-    assert Sitemap._normalize_url("https://example.com/") == "https://example.com"
-    assert Sitemap._normalize_url("/") == "/"
+def test_incoming_links_build_reverse_map() -> None:
+    sitemap: Sitemap = Sitemap(
+        "https://example.com", max_depth=0, exclude_substrings=[]
+    )
+    sitemap._process_page_a_tags("https://example.com", ["/page1"])
+    sitemap._process_page_a_tags("https://example.com/page1", ["/page2"])
+    sitemap._process_page_a_tags("https://example.com/page2", [])
+
+    incoming: dict[str, Any] = sitemap.incoming_links
+    assert incoming["https://example.com/page1"] == ["https://example.com"]
+    assert incoming["https://example.com/page2"] == ["https://example.com/page1"]
+    assert incoming["https://example.com"] == []
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get", side_effect=_site_response)
+def test_collect_records_minimum_depths(mock_get: MagicMock) -> None:
+    sitemap: Sitemap = Sitemap("https://example.com", max_depth=1)
+    sitemap.collect()
+
+    assert sitemap.get()["depths"] == {
+        "https://example.com": 0,
+        "https://example.com/a": 1,
+        "https://example.com/b": 1,
+        "https://example.com/c": 2,
+        "https://example.com/d": 2,
+    }
+    assert set(sitemap.get()["metadata"]) == {
+        "https://example.com",
+        "https://example.com/a",
+        "https://example.com/b",
+    }
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get")
+def test_collect_does_not_depend_on_link_order(mock_get: MagicMock) -> None:
+    pages: Dict[str, str] = {
+        "https://example.com": '<a href="/a">A</a><a href="/b">B</a>',
+        "https://example.com/a": '<a href="/b">B</a>',
+        "https://example.com/b": '<a href="/c">C</a>',
+        "https://example.com/c": "<title>C</title>",
+    }
+
+    def page_response(url: str, **kwargs: Any) -> MagicMock:
+        return _mock_response(pages[url])
+
+    mock_get.side_effect = page_response
+    sitemap: Sitemap = Sitemap("https://example.com", max_depth=2)
+    sitemap.collect()
+
+    assert sitemap.depths["https://example.com/b"] == 1
+    assert sitemap.metadata["https://example.com/c"]["title"] == "C"
+    assert mock_get.call_count == 4
+
 
+@patch("app.modules.http_client.http_client.HttpClient.get")
+def test_collect_deep_site_without_recursion(mock_get: MagicMock) -> None:
+    chain_length: int = 1100
 
-def test_extract_tags_with_missing_elements() -> None:
-    soup: BeautifulSoup = BeautifulSoup(
-        "<html><head></head><body></body></html>", "html.parser"
+    def chain_response(url: str, **kwargs: Any) -> Response:
+        index: int = int(url.rsplit("/", 1)[-1]) if url.count("/") > 2 else 0
+        response: Response = Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(f'<a href="/{index + 1}">next</a>'.encode())
+        return response
+
+    mock_get.side_effect = chain_response
+    sitemap: Sitemap = Sitemap("https://example.com", max_depth=chain_length)
+    sitemap.collect()
+
+    assert len(sitemap.metadata) == chain_length + 1
+    assert sitemap.depths[f"https://example.com/{chain_length}"] == chain_length
+
+
+def test_process_page_a_tags_without_links() -> None:
+    sitemap: Sitemap = Sitemap(
+        "https://example.com", max_depth=1, exclude_substrings=[]
     )
-    title: str
-    desc: str
-    canon: str
-    title, desc, canon = Sitemap._extract_tags(soup)
-    assert title == ""
-    assert desc == ""
-    assert canon == ""
+    sitemap._process_page_a_tags("https://example.com", [])
+    assert sitemap.internal_links["https://example.com"] == []
 
 
-def test_extract_tags_with_empty_title() -> None:
-    soup: BeautifulSoup = BeautifulSoup(
-        "<html><head><title></title></head><body></body></html>", "html.parser"
+def test_process_page_a_tags_resolves_and_dedupes_hrefs() -> None:
+    sitemap: Sitemap = Sitemap(
+        "https://example.com", max_depth=1, exclude_substrings=["private"]
+    )
+    sitemap._process_page_a_tags(
+        "https://example.com/docs",
+        [
+            "/about",
+            "/about/#team",
+            "https://example.com/docs",
+            "/private",
+            "https://external.com",
+            "https://external.com/",
+        ],
     )
-    title: str
-    desc: str
-    canon: str
-    title, desc, canon = Sitemap._extract_tags(soup)
-    assert title == ""
-    assert desc == ""
-    assert canon == ""
+    assert sitemap.internal_links["https://example.com/docs"] == [
+        "https://example.com/about"
+    ]
+    assert sitemap.external_links == {"https://external.com"}
+    assert sitemap.incoming_links["https://external.com"] == [
+        "https://example.com/docs"
+    ]
 
 
-def test_process_incoming_links_builds_reverse_map() -> None:
+@patch("app.modules.http_client.http_client.HttpClient.get", side_effect=_site_response)
+def test_collect_follows_only_included_urls(mock_get: MagicMock) -> None:
     sitemap: Sitemap = Sitemap(
-        "https://example.com", max_depth=0, exclude_substrings=[]
+        "https://example.com",
+        max_depth=3,
+        exclude_substrings=["re:/d$"],
+        include_rules=["glob:https://example.com/[bc]"],
     )
-    sitemap.internal_links = {
-        "https://example.com": ["https://example.com/page1"],
-        "https://example.com/page1": ["https://example.com/page2"],
-        "https://example.com/page2": [],
+    sitemap.collect()
+    assert sitemap.internal_links == {
+        "https://example.com": ["https://example.com/b"],
+        "https://example.com/b": ["https://example.com/c"],
+        "https://example.com/c": [],
     }
-    sitemap._process_incoming_links()
+    assert sitemap.external_links == {"https://external.com"}
 
-    incoming: dict[str, Any] = sitemap.incoming_links
-    assert incoming["https://example.com/page1"] == ["https://example.com"]
-    assert incoming["https://example.com/page2"] == ["https://example.com/page1"]
-    assert incoming["https://example.com"] == []
 
+@patch("app.modules.http_client.http_client.HttpClient.get", side_effect=_site_response)
+def test_collect_concurrent_matches_sequential(mock_get: MagicMock) -> None:
+    sequential: Sitemap = Sitemap("https://example.com", max_depth=2)
+    sequential.collect()
+
+    concurrent: Sitemap = Sitemap(
+        "https://example.com", max_depth=2, concurrency=4, per_host_concurrency=2
+    )
+    concurrent.collect()
+
+    assert concurrent.get()["internal"] == sequential.get()["internal"]
+    assert concurrent.get()["external"] == sequential.get()["external"]
+    assert concurrent.get()["metadata"] == sequential.get()["metadata"]
+    assert concurrent.get()["incoming"] == sequential.get()["incoming"]
+    assert concurrent.get()["depths"] == sequential.get()["depths"]
+    assert mock_get.call_count == 2 * len(SITE_PAGES)
+
+
+def test_collect_concurrent_respects_per_host_limit() -> None:
+    lock: Lock = Lock()
+    active: List[int] = [0]
+    peak: List[int] = [0]
+
+    def slow_response(url: str, **kwargs: Any) -> MagicMock:
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return _site_response(url)
 
-def test_extract_links_skips_already_visited() -> None:
     sitemap: Sitemap = Sitemap(
-        "https://example.com", max_depth=1, exclude_substrings=[]
+        "https://example.com", max_depth=2, concurrency=8, per_host_concurrency=1
     )
-    visited: Set[str] = {"https://example.com"}
-    sitemap._extract_links("https://example.com", visited=visited)
+    with patch(
+        "app.modules.http_client.http_client.HttpClient.get", side_effect=slow_response
+    ):
+        sitemap.collect()
+
+    assert peak[0] == 1
+    assert set(sitemap.get()["metadata"]) == set(SITE_PAGES)
 
 
-def test_process_page_a_tags_skips_non_tag() -> None:
-    soup: BeautifulSoup = BeautifulSoup(
-        "<html><body><!-- comment --></body></html>", "html.parser"
+@patch("app.modules.http_client.http_client.HttpClient.get")
+def test_collect_concurrent_skips_excluded_root(mock_get: MagicMock) -> None:
+    sitemap: Sitemap = Sitemap(
+        "https://example.com/private",
+        max_depth=1,
+        exclude_substrings=["private"],
+        concurrency=4,
     )
+    sitemap.collect()
+
+    mock_get.assert_not_called()
+    assert sitemap.get()["internal"] == {}
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get")
+def test_collect_concurrent_handles_failed_pages(mock_get: MagicMock) -> None:
+    error_response: Response = Response()
+    error_response.status_code = 500
+    exc: RequestException = RequestException("Server error")
+    exc.response = error_response
+    mock_get.side_effect = exc
+
+    sitemap: Sitemap = Sitemap("https://example.com", max_depth=1, concurrency=4)
+    sitemap.collect()
+
+    assert sitemap.get()["internal"] == {}
+    assert sitemap.get()["response"]["https://example.com"]["status"] == 500
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get", side_effect=_site_response)
+def test_collect_uses_configured_parser(mock_get: MagicMock) -> None:
+    parser: MagicMock = MagicMock()
+    parser.parse.return_value = PageData(["/a"], "Parsed", "", "")
+
+    sitemap: Sitemap = Sitemap("https://example.com", max_depth=0, parser=parser)
+    sitemap.collect()
+
+    parser.parse.assert_called_once_with(SITE_PAGES["https://example.com"])
+    assert sitemap.metadata["https://example.com"]["title"] == "Parsed"
+    assert sitemap.internal_links["https://example.com"] == ["https://example.com/a"]
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get", side_effect=_site_response)
+def test_collect_reports_progress(mock_get: MagicMock) -> None:
+    on_progress: MagicMock = MagicMock()
     sitemap: Sitemap = Sitemap(
-        "https://example.com", max_depth=1, exclude_substrings=[]
+        "https://example.com", max_depth=1, on_progress=on_progress
     )
-    sitemap._process_page_a_tags("https://example.com", soup)
-    assert sitemap.internal_links["https://example.com"] == []
+    sitemap.collect()
+
+    assert on_progress.call_args_list[0].kwargs == {
+        "pages_fetched": 1,
+        "queue_size": 2,
+        "errors": 0,
+    }
+    assert on_progress.call_args_list[-1].kwargs == {
+        "pages_fetched": 3,
+        "queue_size": 0,
+        "errors": 0,
+    }
+    assert sitemap.pages_fetched == 3
+
+
+def _validated_response(url: str, **kwargs: Any) -> Response:
+    response: Response = Response()
+    response.raw = io.BytesIO()
+    if kwargs.get("headers", {}).get("If-None-Match") == f'"{url}"':
+        response.status_code = 304
+        return response
+    response.status_code = 200
+    response.headers["ETag"] = f'"{url}"'
+    response.raw = io.BytesIO(SITE_PAGES.get(url, "").encode())
+    return response
+
+
+def test_incremental_recrawl_reuses_not_modified_pages() -> None:
+    state: CrawlState = CrawlState()
+    parser: MagicMock = MagicMock(wraps=get_page_parser())
+
+    with patch(
+        "app.modules.http_client.http_client.HttpClient.get",
+        side_effect=_validated_response,
+    ) as mock_get:
+        first: Sitemap = Sitemap("https://example.com", max_depth=2, state=state)
+        first.collect()
+        second: Sitemap = Sitemap(
+            "https://example.com", max_depth=2, parser=parser, state=state
+        )
+        second.collect()
+
+    assert second.get()["internal"] == first.get()["internal"]
+    assert second.get()["metadata"] == first.get()["metadata"]
+    assert second.pages_reused == len(SITE_PAGES)
+    parser.parse.assert_not_called()
+    assert mock_get.call_args_list[-1].kwargs["headers"] == {
+        "If-None-Match": '"https://example.com/d"'
+    }
+    assert second.response_data["https://example.com/d"]["status"] == 200
+    assert second.response_data["https://example.com/d"]["not_modified"] is True
+
+
+def test_incremental_recrawl_skips_parsing_unchanged_content() -> None:
+    state: CrawlState = CrawlState()
+    parser: MagicMock = MagicMock(wraps=get_page_parser())
+
+    with patch(
+        "app.modules.http_client.http_client.HttpClient.get",
+        side_effect=lambda url, **kwargs: _validated_response(url),
+    ):
+        Sitemap("https://example.com", max_depth=2, state=state).collect()
+        SITE_PAGES["https://example.com/d"] = "<title>D changed</title>"
+        try:
+            second: Sitemap = Sitemap(
+                "https://example.com", max_depth=2, parser=parser, state=state
+            )
+            second.collect()
+        finally:
+            SITE_PAGES["https://example.com/d"] = "<title>D</title>"
+
+    assert second.pages_reused == len(SITE_PAGES) - 1
+    parser.parse.assert_called_once_with("<title>D changed</title>")
+    assert second.metadata["https://example.com/d"]["title"] == "D changed"
+
+
+ROBOTS_PAGES: Dict[str, str] = {
+    "https://example.com/robots.txt": (
+        "User-agent: *\nDisallow: /b\nSitemap: https://example.com/pages.xml\n"
+    ),
+    "https://example.com/pages.xml": (
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        "<url><loc>https://example.com/d/</loc></url>"
+        "<url><loc>https://example.com/a</loc></url>"
+        "<url><loc>https://example.com/b/secret</loc></url>"
+        "<url><loc>https://other.com/x</loc></url>"
+        "</urlset>"
+    ),
+}
+
+
+def _robots_site_response(url: str, **kwargs: Any) -> MagicMock:
+    return _mock_response(ROBOTS_PAGES.get(url, SITE_PAGES.get(url, "")))
+
+
+@patch(
+    "app.modules.http_client.http_client.HttpClient.get",
+    side_effect=_robots_site_response,
+)
+def test_collect_respects_robots_txt(mock_get: MagicMock) -> None:
+    sitemap: Sitemap = Sitemap("https://example.com", max_depth=3, respect_robots=True)
+    sitemap.collect()
 
+    fetched: List[str] = [call.args[0] for call in mock_get.call_args_list]
+    assert fetched[0] == "https://example.com/robots.txt"
+    assert "https://example.com/b" not in fetched
+    assert "https://example.com/d" not in sitemap.depths
+    assert sitemap.get()["blocked"] == ["https://example.com/b"]
+    assert sitemap.get()["seeded"] == []
 
-def test_process_page_a_tags_skips_non_tag_instance() -> None:
-    soup: BeautifulSoup = BeautifulSoup("<html><body></body></html>", "html.parser")
+
+@patch(
+    "app.modules.http_client.http_client.HttpClient.get",
+    side_effect=_robots_site_response,
+)
+def test_collect_skips_root_blocked_by_robots(mock_get: MagicMock) -> None:
     sitemap: Sitemap = Sitemap(
-        "https://example.com", max_depth=1, exclude_substrings=[]
+        "https://example.com/b", max_depth=3, respect_robots=True
     )
+    sitemap.collect()
+    assert mock_get.call_count == 1
+    assert sitemap.internal_links == {}
 
-    with patch.object(soup, "find_all", return_value=["not-a-tag"]):
-        sitemap._process_page_a_tags("https://example.com", soup)
 
-    assert sitemap.internal_links["https://example.com"] == []
+@patch(
+    "app.modules.http_client.http_client.HttpClient.get",
+    side_effect=_robots_site_response,
+)
+def test_collect_seeds_frontier_from_sitemaps(mock_get: MagicMock) -> None:
+    sitemap: Sitemap = Sitemap(
+        "https://example.com",
+        max_depth=1,
+        respect_robots=True,
+        seed_from_sitemaps=True,
+    )
+    sitemap.collect()
+
+    assert sitemap.seeded == [
+        "https://example.com/d",
+        "https://example.com/a",
+        "https://example.com/b/secret",
+    ]
+    assert sitemap.depths["https://example.com/d"] == 1
+    assert "https://example.com/d" in sitemap.metadata
+    assert "https://example.com/c" not in sitemap.metadata
+    assert sitemap.get()["blocked"] == [
+        "https://example.com/b",
+        "https://example.com/b/secret",
+    ]
+
+
+@patch(
+    "app.modules.http_client.http_client.HttpClient.get",
+    side_effect=_robots_site_response,
+)
+def test_collect_seeds_from_default_sitemap_location(mock_get: MagicMock) -> None:
+    sitemap: Sitemap = Sitemap(
+        "https://example.com", max_depth=0, seed_from_sitemaps=True
+    )
+    with patch.dict(ROBOTS_PAGES, {"https://example.com/robots.txt": ""}):
+        sitemap.collect()
+
+    fetched: List[str] = [call.args[0] for call in mock_get.call_args_list]
+    assert fetched == [
+        "https://example.com/robots.txt",
+        "https://example.com/sitemap.xml",
+        "https://example.com",
+    ]
+    assert sitemap.depths == {
+        "https://example.com": 0,
+        "https://example.com/a": 1,
+        "https://example.com/b": 1,
+    }
+
+
+def test_host_turn_paces_requests_by_crawl_delay() -> None:
+    sitemap: Sitemap = Sitemap("https://example.com", max_depth=0, concurrency=4)
+    sitemap._host_delays["example.com"] = 0.05
+    started: float = time.monotonic()
+    for _ in range(3):
+        with sitemap._host_turn("https://example.com/page"):
+            pass
+    assert time.monotonic() - started >= 0.1
+    with sitemap._host_turn("https://other.com"):
+        pass
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get", side_effect=_site_response)
+def test_collect_records_per_url_timings_and_metrics(mock_get: MagicMock) -> None:
+    parse_count: int = CRAWL_PHASE_SECONDS.count(phase="parse")
+    fetched: float = CRAWL_PAGES.value(result="fetched")
+    downloaded: float = CRAWL_RESPONSE_BYTES.value()
+
+    sitemap: Sitemap = Sitemap("https://example.com", max_depth=1)
+    sitemap.collect()
+
+    root_data: Dict[str, Any] = sitemap.get()["response"]["https://example.com"]
+    assert root_data["status"] == 200
+    assert root_data["bytes"] == len(SITE_PAGES["https://example.com"])
+    assert set(root_data) == {
+        "status",
+        "bytes",
+        "content_type",
+        "ttfb_ms",
+        "download_ms",
+        "parse_ms",
+        "links_ms",
+    }
+    assert CRAWL_PHASE_SECONDS.count(phase="parse") == parse_count + 3
+    assert CRAWL_PAGES.value(result="fetched") == fetched + 3
+    assert CRAWL_RESPONSE_BYTES.value() == downloaded + sum(
+        len(SITE_PAGES[url]) for url in sitemap.metadata
+    )
+    assert CRAWL_REQUESTS_IN_FLIGHT.value() == 0
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get", side_effect=_site_response)
+def test_collect_parses_through_parse_pool(mock_get: MagicMock) -> None:
+    parser = get_page_parser()
+    parse_pool: MagicMock = MagicMock()
+    parse_pool.parse.side_effect = lambda page_parser, html: page_parser.parse(html)
+
+    pooled: Sitemap = Sitemap(
+        "https://example.com",
+        max_depth=2,
+        concurrency=4,
+        parser=parser,
+        parse_pool=parse_pool,
+    )
+    pooled.collect()
+
+    assert parse_pool.parse.call_count == len(SITE_PAGES)
+    assert parse_pool.parse.call_args.args[0] is parser
+    sequential: Sitemap = Sitemap("https://example.com", max_depth=2)
+    sequential.collect()
+    assert pooled.get()["internal"] == sequential.get()["internal"]
+    assert pooled.get()["metadata"] == sequential.get()["metadata"]
+
+
+def _failing_site_response(url: str, **kwargs: Any) -> MagicMock:
+    if url == "https://example.com/d":
+        raise RequestException("boom")
+    return _site_response(url)
+
+
+@patch(
+    "app.modules.http_client.http_client.HttpClient.get",
+    side_effect=_failing_site_response,
+)
+def test_crawl_frontier_workers_share_one_store(
+    mock_get: MagicMock, tmp_path: Path
+) -> None:
+    path: str = str(tmp_path / "frontier.db")
+
+    def work(worker_id: str) -> None:
+        store: SQLiteFrontierStore = SQLiteFrontierStore(path)
+        Sitemap("https://example.com", max_depth=2).crawl_frontier(
+            store, worker_id, batch_size=1, poll_interval=0.01
+        )
+        store.close()
+
+    workers: List[Thread] = [Thread(target=work, args=(f"w{i}",)) for i in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    store: SQLiteFrontierStore = SQLiteFrontierStore(path)
+    assembled: Sitemap = Sitemap("https://example.com", max_depth=2)
+    assembled.load_frontier(store)
+    store.close()
+
+    sequential: Sitemap = Sitemap("https://example.com", max_depth=2)
+    sequential.collect()
+    assert assembled.get()["internal"] == sequential.get()["internal"]
+    assert assembled.get()["metadata"] == sequential.get()["metadata"]
+    assert assembled.get()["external"] == sequential.get()["external"]
+    assert assembled.depths == sequential.depths
+    assert "https://example.com/d" not in assembled.metadata
+    assert mock_get.call_count == 2 * len(SITE_PAGES)
+
+
+@patch(
+    "app.modules.http_client.http_client.HttpClient.get",
+    side_effect=_robots_site_response,
+)
+def test_crawl_frontier_seeds_store_and_skips_blocked_root(
+    mock_get: MagicMock,
+) -> None:
+    store: MagicMock = MagicMock()
+    store.claim.side_effect = [[], []]
+    store.is_finished.side_effect = [False, True]
+    state: MagicMock = MagicMock()
+
+    sitemap: Sitemap = Sitemap(
+        "https://example.com",
+        max_depth=1,
+        seed_from_sitemaps=True,
+        respect_robots=True,
+        state=state,
+    )
+    sitemap.crawl_frontier(store, "w1", poll_interval=0)
+
+    store.add.assert_any_call([("https://example.com", 0)])
+    store.add.assert_any_call(
+        [("https://example.com/d", 1), ("https://example.com/a", 1)]
+    )
+    state.save.assert_called_once_with()
+
+    blocked: Sitemap = Sitemap(
+        "https://example.com/b", max_depth=1, respect_robots=True
+    )
+    blocked_store: MagicMock = MagicMock()
+    blocked.crawl_frontier(blocked_store, "w1")
+    blocked_store.add.assert_not_called()
+
+
+def test_load_frontier_keeps_unvisited_urls_as_depths_only() -> None:
+    store: MagicMock = MagicMock()
+    store.results.return_value = [
+        (
+            "https://example.com",
+            0,
+            PageResult(["https://example.com/a"], [], {"title": "Home"}, {}),
+        ),
+        ("https://example.com/a", 1, None),
+    ]
+
+    sitemap: Sitemap = Sitemap("https://example.com", max_depth=1)
+    sitemap.load_frontier(store)
+
+    assert sitemap.depths == {"https://example.com": 0, "https://example.com/a": 1}
+    assert sitemap.metadata == {"https://example.com": {"title": "Home"}}
+    assert sitemap.response_data == {}
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get", side_effect=_site_response)
+def test_collect_stops_at_page_budget(mock_get: MagicMock) -> None:
+    sitemap: Sitemap = Sitemap("https://example.com", max_depth=3, max_pages=2)
+    sitemap.collect()
+
+    assert mock_get.call_count == 2
+    assert list(sitemap.metadata) == ["https://example.com", "https://example.com/a"]
+    assert sitemap.get()["truncated"] is True
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get", side_effect=_site_response)
+def test_collect_stops_at_byte_budget(mock_get: MagicMock) -> None:
+    sitemap: Sitemap = Sitemap("https://example.com", max_depth=3, max_bytes=1)
+    sitemap.collect()
+
+    assert mock_get.call_count == 1
+    assert sitemap.budget.bytes == len(SITE_PAGES["https://example.com"])
+    assert sitemap.truncated
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get", side_effect=_site_response)
+def test_crawl_frontier_keeps_no_pages_in_memory_and_honours_budget(
+    mock_get: MagicMock, tmp_path: Path
+) -> None:
+    store: SQLiteFrontierStore = SQLiteFrontierStore(str(tmp_path / "frontier.db"))
+    sitemap: Sitemap = Sitemap("https://example.com", max_depth=3, max_pages=3)
+    sitemap.crawl_frontier(store, "w1", batch_size=2, expected_urls=100)
+
+    assert mock_get.call_count == 3
+    assert sitemap.truncated
+    assert sitemap.metadata == {}
+    assert sitemap.response_data == {}
+    assert len(sitemap.graph) == 0
+    assert sitemap.external_links == set()
+
+    assembled: Sitemap = Sitemap("https://example.com", max_depth=3)
+    assembled.load_frontier(store)
+    assert assembled.get()["truncated"] is True
+    assert len(assembled.metadata) == 3
+    store.close()
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get", side_effect=_site_response)
+def test_collect_checks_external_links_once(mock_get: MagicMock) -> None:
+    link_checker: MagicMock = MagicMock()
+    link_checker.check.return_value = {"https://external.com": {"status": 404}}
+    progress: MagicMock = MagicMock()
+
+    sitemap: Sitemap = Sitemap(
+        "https://example.com",
+        max_depth=2,
+        link_checker=link_checker,
+        on_progress=progress,
+    )
+    sitemap.collect()
+
+    assert link_checker.check.call_args.args == (["https://external.com"],)
+    link_checker.check.call_args.kwargs["on_checked"](0)
+    assert progress.call_args.kwargs["queue_size"] == 0
+    assert sitemap.get()["response"]["https://external.com"] == {"status": 404}
+
+
+ASSET_RESPONSES: Dict[str, MagicMock] = {}
+
+
+def _asset_site_response(url: str, **kwargs: Any) -> MagicMock:
+    response_mock: MagicMock = _mock_response(SITE_PAGES.get(url, ""))
+    if url == "https://example.com":
+        response_mock = _mock_response(
+            '<a href="/report.pdf">PDF</a><a href="/big">Big</a><a href="/a">A</a>'
+        )
+    elif url == "https://example.com/big":
+        response_mock.iter_content.side_effect = lambda **kwargs: iter(
+            [b'<a href="/c">C</a>', b"x" * 100, b"never read"]
+        )
+        response_mock.text = '<a href="/c">C</a>'
+    elif url.endswith(".pdf"):
+        response_mock.headers = {"Content-Type": "application/pdf"}
+    ASSET_RESPONSES[url] = response_mock
+    return response_mock
+
+
+@patch(
+    "app.modules.http_client.http_client.HttpClient.get",
+    side_effect=_asset_site_response,
+)
+def test_collect_skips_non_html_and_truncates_large_bodies(
+    mock_get: MagicMock,
+) -> None:
+    skipped: float = CRAWL_PAGES.value(result="skipped")
+    sitemap: Sitemap = Sitemap("https://example.com", max_depth=2, max_page_bytes=64)
+    sitemap.collect()
+
+    assert mock_get.call_args.kwargs["stream"] is True
+    pdf: MagicMock = ASSET_RESPONSES["https://example.com/report.pdf"]
+    pdf.iter_content.assert_not_called()
+    pdf.close.assert_called_once_with()
+    assert sitemap.response_data["https://example.com/report.pdf"] == {
+        "status": 200,
+        "ttfb_ms": 0.0,
+        "download_ms": pytest.approx(0, abs=50),
+        "bytes": 0,
+        "content_type": "application/pdf",
+        "skipped": True,
+    }
+    assert "https://example.com/report.pdf" not in sitemap.metadata
+    assert (
+        "https://example.com/report.pdf"
+        in sitemap.internal_links["https://example.com"]
+    )
+
+    big: Dict[str, Any] = sitemap.response_data["https://example.com/big"]
+    assert big["bytes"] == 64
+    assert big["truncated"] is True
+    assert "https://example.com/c" in sitemap.metadata
+    assert sitemap.errors == 0
+    assert sitemap.pages_skipped == 1
+    assert CRAWL_PAGES.value(result="skipped") == skipped + 1
+
+
+SPA_PAGES: Dict[str, str] = {
+    "https://example.com": '<a href="/app">App</a><a href="/b">B</a><a href="/c">C</a>',
+    "https://example.com/app": '<title>App</title><div id="root"></div>',
+    "https://example.com/b": "<title>B</title>" + "<p>Server rendered text.</p>" * 20,
+}
+
+
+def _spa_response(url: str, **kwargs: Any) -> MagicMock:
+    return _mock_response(SPA_PAGES.get(url, ""))
+
+
+def _renderer(html: Any) -> MagicMock:
+    renderer: MagicMock = MagicMock()
+    renderer.reason.side_effect = lambda html, page: (
+        "framework" if 'id="root"' in html else None
+    )
+    renderer.render.side_effect = html
+    return renderer
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get", side_effect=_spa_response)
+def test_collect_renders_only_flagged_pages_into_the_same_graph(
+    mock_get: MagicMock,
+) -> None:
+    renderer: MagicMock = _renderer(
+        lambda url: '<title>App</title><meta name="description" content="SPA">'
+        '<div id="root"><a href="/app/inbox">Inbox</a><a href="/b">B</a></div>'
+    )
+    render_before: int = CRAWL_PHASE_SECONDS.count(phase="render")
+    sitemap: Sitemap = Sitemap("https://example.com", max_depth=2, renderer=renderer)
+    sitemap.collect()
+
+    renderer.render.assert_called_once_with("https://example.com/app")
+    data: Dict[str, Any] = sitemap.get()
+    assert data["internal"]["https://example.com/app"] == [
+        "https://example.com/app/inbox",
+        "https://example.com/b",
+    ]
+    assert data["incoming"]["https://example.com/b"] == [
+        "https://example.com",
+        "https://example.com/app",
+    ]
+    assert data["metadata"]["https://example.com/app"]["description"] == "SPA"
+    assert data["depths"]["https://example.com/app/inbox"] == 2
+    assert data["response"]["https://example.com/app"]["rendered"] == "framework"
+    assert "render_ms" in data["response"]["https://example.com/app"]
+    assert "rendered" not in data["response"]["https://example.com/b"]
+    assert sitemap.pages_rendered == 1
+    assert CRAWL_PHASE_SECONDS.count(phase="render") == render_before + 1
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get", side_effect=_spa_response)
+def test_collect_keeps_static_page_when_rendering_fails(mock_get: MagicMock) -> None:
+    sitemap: Sitemap = Sitemap(
+        "https://example.com", max_depth=1, renderer=_renderer(lambda url: None)
+    )
+    sitemap.collect()
+
+    data: Dict[str, Any] = sitemap.get()
+    assert data["internal"]["https://example.com/app"] == []
+    assert data["metadata"]["https://example.com/app"]["title"] == "App"
+    assert data["response"]["https://example.com/app"]["render_failed"] == "framework"
+    assert sitemap.pages_rendered == 0
+
+
+def test_static_page_is_fingerprinted_when_rendering_fails() -> None:
+    sitemap: Sitemap = Sitemap(
+        "https://example.com",
+        max_depth=1,
+        renderer=_renderer(lambda url: None),
+        near_duplicate_distance=3,
+    )
+    sitemap.response_data["https://example.com/app"] = {}
+    html: str = '<div id="root"></div><p>' + " ".join(f"w{i}" for i in range(50))
+    page: PageData = sitemap._parse_page("https://example.com/app", html)
+    assert page.fingerprint != 0
+
+
+@patch("app.modules.http_client.http_client.HttpClient.get", side_effect=_spa_response)
+def test_rendering_skips_conditional_requests_and_stale_static_state(
+    mock_get: MagicMock,
+) -> None:
+    state: CrawlState = CrawlState()
+    Sitemap("https://example.com", max_depth=1, state=state).collect()
+    assert state.get("https://example.com/app") is not None
+
+    mock_get.reset_mock()
+    renderer: MagicMock = _renderer(lambda url: '<a href="/app/inbox">Inbox</a>')
+    sitemap: Sitemap = Sitemap(
+        "https://example.com", max_depth=1, state=state, renderer=renderer
+    )
+    sitemap.collect()
+
+    assert all(call.kwargs["headers"] is None for call in mock_get.call_args_list)
+    renderer.render.assert_called_once_with("https://example.com/app")
+    assert sitemap.pages_reused == 3
+    assert sitemap.get()["internal"]["https://example.com/app"] == [
+        "https://example.com/app/inbox"
+    ]
+
+
+FACETED_PAGES: Dict[str, str] = {
+    "https://example.com": (
+        '<a href="/shoes?color=red&size=9">R</a>'
+        '<a href="/shoes?size=9&color=red&utm_source=mail">R again</a>'
+        '<a href="HTTPS://EXAMPLE.COM:443/shoes?color=red&size=9#reviews">R</a>'
+        '<a href="/jsp/page;jsessionid=XYZ">J</a>'
+        '<a href="https://external.com/?gclid=1">E</a>'
+    ),
+}
+
+
+def _faceted_response(url: str, **kwargs: Any) -> MagicMock:
+    return _mock_response(FACETED_PAGES.get(url, ""))
+
+
+@patch(
+    "app.modules.http_client.http_client.HttpClient.get",
+    side_effect=_faceted_response,
+)
+def test_collect_canonicalizes_links_before_queueing(mock_get: MagicMock) -> None:
+    sitemap: Sitemap = Sitemap("https://Example.com:443/", max_depth=1)
+    sitemap.collect()
+
+    data: Dict[str, Any] = sitemap.get()
+    assert data["root"] == "https://example.com"
+    assert data["internal"]["https://example.com"] == [
+        "https://example.com/shoes?color=red&size=9",
+        "https://example.com/jsp/page",
+    ]
+    assert data["external"] == {"https://external.com"}
+    assert mock_get.call_count == 3
+
+
+def test_graph_and_metadata_are_keyed_by_canonical_url() -> None:
+    sitemap: Sitemap = Sitemap("https://example.com", max_depth=1)
+    sitemap._process_page(
+        "https://Example.com:443/about/?utm_source=x", PageData([], "About", "", "")
+    )
+    assert sitemap.metadata["https://example.com/about"]["title"] == "About"
+    assert "https://example.com/about" in sitemap.internal_links
+
+
+DUPLICATE_PAGES: Dict[str, str] = {
+    "https://example.com": (
+        '<a href="/shoes?color=red">Red</a><a href="/article">A</a>'
+        '<a href="/article-print">P</a>'
+    ),
+    "https://example.com/shoes?color=red": (
+        '<link rel="canonical" href="/shoes"><a href="/shoes?color=red&page=2">2</a>'
+    ),
+    "https://example.com/shoes": '<title>Shoes</title><a href="/shoes/1">1</a>',
+    "https://example.com/article": "<p>" + " ".join(f"w{i}" for i in range(300)),
+    "https://example.com/article-print": (
+        "<title>Print</title><p>"
+        + " ".join(f"w{i}" for i in range(300))
+        + ' <a href="/print-only">X</a>'
+    ),
+}
+
+
+def _duplicate_response(url: str, **kwargs: Any) -> MagicMock:
+    return _mock_response(DUPLICATE_PAGES.get(url, ""))
+
+
+@patch(
+    "app.modules.http_client.http_client.HttpClient.get",
+    side_effect=_duplicate_response,
+)
+def test_collect_collapses_canonical_and_near_duplicate_pages(
+    mock_get: MagicMock,
+) -> None:
+    sitemap: Sitemap = Sitemap(
+        "https://example.com",
+        max_depth=3,
+        honor_canonical=True,
+        near_duplicate_distance=3,
+    )
+    sitemap.collect()
+
+    fetched: List[str] = [call.args[0] for call in mock_get.call_args_list]
+    assert "https://example.com/shoes" in fetched
+    assert "https://example.com/shoes/1" in fetched
+    assert "https://example.com/shoes?color=red&page=2" not in fetched
+    assert "https://example.com/print-only" not in fetched
+
+    response: Dict[str, Any] = sitemap.get()["response"]
+    assert response["https://example.com/shoes?color=red"]["duplicate_of"] == (
+        "https://example.com/shoes"
+    )
+    assert response["https://example.com/article-print"]["duplicate_of"] == (
+        "https://example.com/article"
+    )
+    assert "duplicate_of" not in response["https://example.com/article"]
+    assert sitemap.pages_collapsed == 2
+    assert sitemap.depths["https://example.com/shoes"] == 2
+
+    data: Dict[str, Any] = sitemap.get()
+    assert data["internal"]["https://example.com/shoes?color=red"] == [
+        "https://example.com/shoes"
+    ]
+    assert data["internal"]["https://example.com/article-print"] == [
+        "https://example.com/article"
+    ]
+    assert "https://example.com/shoes?color=red&page=2" not in data["incoming"]
+    assert "https://example.com/print-only" not in data["incoming"]
+    assert "".join(sitemap_to_text_outline(data)) == (
+        "- https://example.com\n"
+        "  - https://example.com/article\n"
+        "  - https://example.com/article-print\n"
+        "  - https://example.com/shoes?color=red\n"
+        "    - https://example.com/shoes\n"
+        "      - https://example.com/shoes/1\n"
+    )
+    assert [node["text"] for node in sitemap_to_jstree_formatter(data)] == [
+        "https://example.com",
+        "https://example.com/article",
+        "https://example.com/article-print",
+        "https://example.com/shoes?color=red",
+        "https://example.com/shoes",
+        "https://example.com/shoes/1",
+    ]
+
+
+def _validated_duplicate_response(url: str, **kwargs: Any) -> MagicMock:
+    response: MagicMock = _duplicate_response(url)
+    response.headers["ETag"] = f'"{url}"'
+    return response
+
+
+def test_pages_reused_from_a_plain_crawl_are_fingerprinted() -> None:
+    state: CrawlState = CrawlState()
+    article: str = "https://example.com/article"
+    with patch(
+        "app.modules.http_client.http_client.HttpClient.get",
+        side_effect=_validated_duplicate_response,
+    ) as mock_get:
+        Sitemap("https://example.com", max_depth=3, state=state).collect()
+        mock_get.reset_mock()
+        sitemap: Sitemap = Sitemap(
+            "https://example.com",
+            max_depth=3,
+            state=state,
+            near_duplicate_distance=3,
+        )
+        sitemap.collect()
+        assert all(call.kwargs["headers"] is None for call in mock_get.call_args_list)
+
+        mock_get.reset_mock()
+        Sitemap(
+            "https://example.com", max_depth=3, state=state, near_duplicate_distance=3
+        ).collect()
+        assert {"If-None-Match": f'"{article}"'} in [
+            call.kwargs["headers"] for call in mock_get.call_args_list
+        ]
+
+    response: Dict[str, Any] = sitemap.get()["response"]
+    assert response["https://example.com/article-print"]["duplicate_of"] == article
+    assert sitemap.pages_reused == 5
+    page_state: Optional[PageState] = state.get(article)
+    assert page_state is not None and page_state.page.fingerprint != 0
+
+
+@patch(
+    "app.modules.http_client.http_client.HttpClient.get",
+    side_effect=_duplicate_response,
+)
+def test_collect_ignores_duplicates_unless_enabled(mock_get: MagicMock) -> None:
+    sitemap: Sitemap = Sitemap("https://example.com", max_depth=2)
+    sitemap.collect()
+
+    fetched: List[str] = [call.args[0] for call in mock_get.call_args_list]
+    assert "https://example.com/print-only" in fetched
+    assert "https://example.com/shoes?color=red&page=2" in fetched
+    assert sitemap.pages_collapsed == 0
+
+
+@patch(
+    "app.modules.http_client.http_client.HttpClient.get",
+    side_effect=_duplicate_response,
+)
+def test_canonical_outside_rules_or_host_is_not_a_duplicate(
+    mock_get: MagicMock,
+) -> None:
+    sitemap: Sitemap = Sitemap(
+        "https://example.com",
+        max_depth=1,
+        honor_canonical=True,
+        exclude_substrings=["/shoes?", "/shoes/", "/shoes"],
+    )
+    page: PageData = PageData([], "", "", "/shoes")
+    assert sitemap._duplicate_of("https://example.com/x", page, {}) is None
+    other_host: PageData = PageData([], "", "", "https://other.com/")
+    assert sitemap._duplicate_of("https://example.com/x", other_host, {}) is None
+    itself: PageData = PageData([], "", "", "https://example.com/x/")
+    assert sitemap._duplicate_of("https://example.com/x", itself, {}) is None
+
+
+@patch(
+    "app.modules.http_client.http_client.HttpClient.get",
+    side_effect=_duplicate_response,
+)
+def test_crawl_frontier_collapses_duplicates(mock_get: MagicMock) -> None:
+    store: SQLiteFrontierStore = SQLiteFrontierStore(":memory:")
+    Sitemap(
+        "https://example.com",
+        max_depth=3,
+        honor_canonical=True,
+        near_duplicate_distance=3,
+    ).crawl_frontier(store, "worker-1")
+
+    results: Dict[str, Any] = {
+        url: result for url, _, result in store.results() if result is not None
+    }
+    assert results["https://example.com/shoes?color=red"].response["duplicate_of"] == (
+        "https://example.com/shoes"
+    )
+    assert "https://example.com/shoes/1" in results
+    assert "https://example.com/print-only" not in results
+    assert results["https://example.com/shoes?color=red"].links == [
+        "https://example.com/shoes"
+    ]
+    assert results["https://example.com/article-print"].external == []
+
+    loaded: Sitemap = Sitemap("https://example.com", max_depth=3)
+    loaded.load_frontier(store)
+    assert (
+        "  - https://example.com/shoes?color=red\n    - https://example.com/shoes\n"
+        in ("".join(sitemap_to_text_outline(loaded.get())))
+    )
+    store.close()
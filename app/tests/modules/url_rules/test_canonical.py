@@ -0,0 +1,56 @@
+import pytest
+
+from app.modules.url_rules.canonical import UrlCanonicalizer, compile_params
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("HTTPS://Example.COM:443/a/?b=2&a=1#top", "https://example.com/a?a=1&b=2"),
+        ("http://example.com:80/", "http://example.com"),
+        ("http://example.com:8080/x", "http://example.com:8080/x"),
+        ("https://example.com./x", "https://example.com/x"),
+        ("http://[::1]:80/x", "http://[::1]/x"),
+        ("https://user:pw@Example.com/x", "https://user:pw@example.com/x"),
+        (
+            "https://example.com/p?utm_source=a&UTM_Medium=b&gclid=1&fbclid=2&id=7",
+            "https://example.com/p?id=7",
+        ),
+        (
+            "https://example.com/p;jsessionid=ABC?PHPSESSID=1&page=2",
+            "https://example.com/p?page=2",
+        ),
+        ("https://example.com/p;v=1;jsessionid=A", "https://example.com/p;v=1"),
+        ("https://example.com/?", "https://example.com"),
+        ("https://example.com?b=1&a=2", "https://example.com/?a=2&b=1"),
+        ("https://example.com/a?q=a%20b&&x=", "https://example.com/a?q=a%20b&x="),
+        ("https://example.com/a?utm%5Fcampaign=1", "https://example.com/a"),
+        ("https://example.com/CaseSensitive", "https://example.com/CaseSensitive"),
+        ("mailto:someone@example.com", "mailto:someone@example.com"),
+        ("/", "/"),
+        ("https://example.com:bad/path/#x", "https://example.com:bad/path"),
+    ],
+)
+def test_canonicalize_defaults(url: str, expected: str) -> None:
+    assert UrlCanonicalizer().canonicalize(url) == expected
+
+
+def test_canonicalize_is_configurable() -> None:
+    canonicalizer: UrlCanonicalizer = UrlCanonicalizer(
+        drop_params=["sort", "view*"], sort_query=False, lowercase_path=True
+    )
+    assert canonicalizer.canonicalize(
+        "https://example.com/Shoes/?size=9&sort=price&viewMode=grid&color=red"
+        "&utm_source=x"
+    ) == ("https://example.com/shoes?size=9&color=red&utm_source=x")
+    assert UrlCanonicalizer(drop_params=[]).canonicalize(
+        "https://example.com/?utm_source=x"
+    ) == ("https://example.com/?utm_source=x")
+
+
+def test_compile_params_ignores_empty_patterns() -> None:
+    assert compile_params(["", ""]) is None
+    pattern = compile_params(["utm_*", "UTM_*", "gclid"])
+    assert pattern is not None
+    assert pattern.match("utm_term") and pattern.match("gclid")
+    assert not pattern.match("gclid_extra")
@@ -0,0 +1,54 @@
+import pytest
+
+from app.modules.url_rules.url_rules import UrlRules, compile_rules
+
+
+def test_compile_rules_empty() -> None:
+    assert compile_rules(None) is None
+    assert compile_rules(["", ""]) is None
+
+
+def test_compile_rules_rejects_invalid_regex() -> None:
+    with pytest.raises(ValueError, match="Invalid URL rule 're:\\(unclosed'"):
+        compile_rules(["private", "re:(unclosed"])
+
+
+def test_substring_rules_match_like_plain_substrings() -> None:
+    rules: UrlRules = UrlRules(exclude=["?sort=", "a.b", "[x]"])
+    assert rules.excludes("https://example.com/list?sort=asc")
+    assert rules.excludes("https://example.com/a.b")
+    assert not rules.excludes("https://example.com/aXb")
+    assert rules.excludes("https://example.com/[x]")
+    assert not rules.excludes("https://example.com/x")
+
+
+def test_glob_rules_match_whole_url() -> None:
+    rules: UrlRules = UrlRules(exclude=["glob:*.pdf", "glob:https://example.com/t?g/*"])
+    assert rules.excludes("https://example.com/files/report.pdf")
+    assert not rules.excludes("https://example.com/files/report.pdf?download=1")
+    assert rules.excludes("https://example.com/tag/python")
+    assert not rules.excludes("https://other.com/tag/python")
+
+
+def test_regex_rules_search_anywhere() -> None:
+    rules: UrlRules = UrlRules(exclude=[r"re:/page/\d+$", "re:(?i:LOGIN)"])
+    assert rules.excludes("https://example.com/blog/page/12")
+    assert not rules.excludes("https://example.com/blog/page/12/comments")
+    assert rules.excludes("https://example.com/Login")
+
+
+def test_include_and_exclude_rules_combine() -> None:
+    rules: UrlRules = UrlRules(include=["/blog/", "/news/"], exclude=["draft"])
+    assert rules.allows("https://example.com/blog/post")
+    assert rules.allows("https://example.com/news/item")
+    assert not rules.allows("https://example.com/shop")
+    assert not rules.allows("https://example.com/blog/draft-post")
+    assert UrlRules().allows("https://example.com/anything")
+
+
+def test_matches_are_memoized() -> None:
+    rules: UrlRules = UrlRules(include=["/blog/"], exclude=["draft"], cache_size=2)
+    for _ in range(3):
+        rules.allows("https://example.com/blog/post")
+    assert rules.allows.cache_info().hits == 2  # type: ignore[attr-defined]
+    assert rules.allows.cache_info().currsize == 1  # type: ignore[attr-defined]
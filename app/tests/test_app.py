@@ -1,15 +1,37 @@
+import gzip
+import json
+import subprocess
+import sys
 import pytest
+from pathlib import Path
+from threading import Event
 from unittest.mock import patch, MagicMock
 from typing import Generator, Any
+from flask import Flask
 from flask.testing import FlaskClient
 from werkzeug.test import TestResponse
 
-from app.app import app
+from app.app import SERVICES_KEY, Services, create_app
+from app.modules.jobs.jobs import Job
+from app.modules.sitemap.crawl_state import CrawlState
+from app.modules.sitemap.jstree_formatter import JsTreeIndex
 
 
 @pytest.fixture
-def client() -> Generator[FlaskClient, None, None]:
-    app.config["TESTING"] = True
+def app() -> Generator[Flask, None, None]:
+    app: Flask = create_app({"TESTING": True})
+    yield app
+    app.extensions[SERVICES_KEY].jobs.shutdown()
+
+
+@pytest.fixture
+def services(app: Flask) -> Services:
+    services: Services = app.extensions[SERVICES_KEY]
+    return services
+
+
+@pytest.fixture
+def client(app: Flask) -> Generator[FlaskClient, None, None]:
     with app.test_client() as client:
         yield client
 
@@ -21,10 +43,7 @@ def test_root_get_without_url(client: FlaskClient) -> None:
 
 
 @patch("app.app.Sitemap")
-@patch("app.app.sitemap_to_jstree_formatter")
-def test_root_get_with_url_basic(
-    mock_formatter: MagicMock, mock_sitemap: MagicMock, client: FlaskClient
-) -> None:
+def test_root_get_with_url_basic(mock_sitemap: MagicMock, client: FlaskClient) -> None:
     mock_instance: MagicMock = MagicMock()
     mock_instance.get.return_value = {
         "metadata": {"https://example.com": {"title": "Example"}},
@@ -34,18 +53,16 @@ def test_root_get_with_url_basic(
         "root": "https://example.com",
     }
     mock_sitemap.return_value = mock_instance
-    mock_formatter.return_value = [{"id": "1", "text": "example"}]
 
     response: TestResponse = client.get("/?url=https://example.com&depth=2")
     assert response.status_code == 200
-    assert b"example" in response.data
-    assert b"https://example.com" in response.data
+    assert b"Tree for URL: https://example.com" in response.data
+    assert b"/sitemap/" in response.data
 
 
 @patch("app.app.Sitemap")
-@patch("app.app.sitemap_to_jstree_formatter")
 def test_root_get_with_exclude_substrings(
-    mock_formatter: MagicMock, mock_sitemap: MagicMock, client: FlaskClient
+    mock_sitemap: MagicMock, client: FlaskClient
 ) -> None:
     mock_instance: MagicMock = MagicMock()
     mock_instance.get.return_value = {
@@ -56,10 +73,10 @@ def test_root_get_with_exclude_substrings(
         "root": "https://example.com",
     }
     mock_sitemap.return_value = mock_instance
-    mock_formatter.return_value = []
 
     response: TestResponse = client.get(
         "/?url=https://example.com&exclude_substrings=admin%0Alogin"
+        "&include_rules=glob:*/blog/*&seed_sitemaps=1"
     )
     assert response.status_code == 200
     assert b"admin" in response.data or b"login" in response.data
@@ -68,6 +85,100 @@ def test_root_get_with_exclude_substrings(
     kwargs: dict[str, Any]
     args, kwargs = mock_sitemap.call_args
     assert kwargs["exclude_substrings"] == ["admin", "login"]
+    assert kwargs["include_rules"] == ["glob:*/blog/*"]
+    assert kwargs["respect_robots"] is True
+    assert kwargs["seed_from_sitemaps"] is True
+    assert kwargs["link_checker"] is None
+    assert kwargs["renderer"] is None
+    assert kwargs["honor_canonical"] is False
+    assert kwargs["near_duplicate_distance"] is None
+    assert kwargs["canonicalizer"].canonicalize(
+        "https://example.com/?utm_source=x&b=1&a=2"
+    ) == ("https://example.com/?a=2&b=1")
+
+
+@patch("app.app.Sitemap")
+def test_root_get_checks_external_links_on_request(
+    mock_sitemap: MagicMock, client: FlaskClient, app: Flask, services: Services
+) -> None:
+    mock_sitemap.return_value.get.return_value = {
+        "metadata": {},
+        "incoming": {},
+        "internal": {"https://example.com": []},
+        "external": [],
+        "root": "https://example.com",
+    }
+
+    response: TestResponse = client.get("/?url=https://example.com&check_external=1")
+    assert response.status_code == 200
+    link_checker = mock_sitemap.call_args.kwargs["link_checker"]
+    assert link_checker.cache is services.link_check_cache
+    assert link_checker.per_host_concurrency == (
+        app.config["LINK_CHECK_PER_HOST_CONCURRENCY"]
+    )
+    assert b'id="check-external" name="check_external" value="1" checked' in (
+        response.data
+    )
+
+
+@patch("app.modules.meta_tags.browser_pool.configure_browser_pool")
+@patch("app.app.Sitemap")
+def test_root_get_renders_javascript_pages_on_request(
+    mock_sitemap: MagicMock,
+    mock_configure: MagicMock,
+    client: FlaskClient,
+    app: Flask,
+) -> None:
+    mock_sitemap.return_value.get.return_value = {
+        "metadata": {},
+        "incoming": {},
+        "internal": {"https://example.com": []},
+        "external": [],
+        "root": "https://example.com",
+    }
+
+    response: TestResponse = client.get("/?url=https://example.com&render_js=1")
+    assert response.status_code == 200
+    renderer = mock_sitemap.call_args.kwargs["renderer"]
+    assert renderer.pool is mock_configure.return_value
+    assert renderer.budget.max_pages == app.config["SITEMAP_RENDER_MAX_PAGES"]
+    assert renderer.timeout == app.config["SITEMAP_RENDER_TIMEOUT"]
+    assert b'id="render-js" name="render_js" value="1" checked' in response.data
+
+
+@patch("app.app.Sitemap")
+def test_root_get_collapses_duplicates_on_request(mock_sitemap: MagicMock) -> None:
+    mock_sitemap.return_value.get.return_value = {
+        "metadata": {},
+        "incoming": {},
+        "internal": {"https://example.com": []},
+        "external": [],
+        "root": "https://example.com",
+    }
+    app: Flask = create_app({"TESTING": True, "SITEMAP_EXTRA_DROP_PARAMS": ["sort"]})
+    services: Services = app.extensions[SERVICES_KEY]
+
+    with app.test_client() as client:
+        response: TestResponse = client.get(
+            "/?url=https://example.com/?sort=price&collapse_duplicates=1"
+        )
+        cached: TestResponse = client.get(
+            "/?url=https://example.com&collapse_duplicates=1"
+        )
+    services.jobs.shutdown()
+    assert response.status_code == 200
+    assert cached.status_code == 200
+    assert mock_sitemap.call_count == 1
+    kwargs: dict[str, Any] = mock_sitemap.call_args.kwargs
+    assert kwargs["honor_canonical"] is True
+    assert kwargs["near_duplicate_distance"] == (
+        app.config["SITEMAP_NEAR_DUPLICATE_DISTANCE"]
+    )
+    assert kwargs["canonicalizer"] is services.canonicalizer
+    assert kwargs["canonicalizer"].canonicalize(
+        "https://example.com/shoes?sort=price&gclid=1"
+    ) == ("https://example.com/shoes")
+    assert b'name="collapse_duplicates" value="1" checked' in response.data
 
 
 def test_meta_tags_get(client: FlaskClient) -> None:
@@ -92,8 +203,11 @@ def test_meta_tags_post_request(mock_tags: MagicMock, client: FlaskClient) -> No
     assert b"Example Description" in response.data
 
 
-@patch("app.app.get_meta_tags_selenium")
-def test_meta_tags_post_selenium(mock_tags: MagicMock, client: FlaskClient) -> None:
+@patch("app.modules.meta_tags.browser_pool.configure_browser_pool")
+@patch("app.modules.meta_tags.meta_tags_selenium.get_meta_tags_selenium")
+def test_meta_tags_post_selenium(
+    mock_tags: MagicMock, mock_configure: MagicMock, client: FlaskClient, app: Flask
+) -> None:
     mock_tags.return_value = {
         "https://example.com": {
             "title": "Selenium Title",
@@ -106,3 +220,477 @@ def test_meta_tags_post_selenium(mock_tags: MagicMock, client: FlaskClient) -> N
     assert response.status_code == 200
     assert b"Selenium Title" in response.data
     assert b"Selenium Description" in response.data
+    assert mock_tags.call_args.kwargs["pool"] is mock_configure.return_value
+    assert mock_tags.call_args.kwargs["session_timeout"] == (
+        app.config["BROWSER_SESSION_TIMEOUT"]
+    )
+    mock_configure.assert_called_once_with(
+        size=app.config["BROWSER_POOL_SIZE"],
+        max_pages_per_session=app.config["BROWSER_MAX_PAGES_PER_SESSION"],
+    )
+
+
+@patch("app.modules.meta_tags.browser_pool.configure_browser_pool")
+def test_browser_pool_is_created_once_on_first_use(
+    mock_configure: MagicMock, services: Services
+) -> None:
+    assert services.browser_pool() is mock_configure.return_value
+    assert services.browser_pool() is mock_configure.return_value
+    mock_configure.assert_called_once()
+
+
+def test_create_app_does_not_import_selenium() -> None:
+    code: str = (
+        "import sys; from app.app import create_app; create_app(); "
+        "print('selenium' in sys.modules)"
+    )
+    result: subprocess.CompletedProcess[str] = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_create_app_applies_env_and_overrides(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("QATOOLS_JOB_WORKERS", "2")
+    monkeypatch.setenv("QATOOLS_SITEMAP_CONCURRENCY", "3")
+    app: Flask = create_app({"SITEMAP_CONCURRENCY": 5})
+    assert app.config["JOB_WORKERS"] == 2
+    assert app.config["SITEMAP_CONCURRENCY"] == 5
+    assert app.config["HTTP_TIMEOUT"] == 10
+    app.extensions[SERVICES_KEY].jobs.shutdown()
+
+
+def test_crawl_state_is_kept_only_when_a_path_is_configured(
+    services: Services, tmp_path: Path
+) -> None:
+    assert services.crawl_state is None
+    configured: Services = Services(
+        {**services.config, "CRAWL_STATE_PATH": str(tmp_path / "state.sqlite3")}
+    )
+    assert isinstance(configured.crawl_state, CrawlState)
+    configured.jobs.shutdown()
+
+
+@patch("app.app.get_meta_tags_request")
+def test_meta_tags_post_head_only(mock_tags: MagicMock, client: FlaskClient) -> None:
+    mock_tags.return_value = {
+        "https://example.com": {
+            "title": "Head Title",
+            "description": "Head Description",
+            "bytes_saved": "2048",
+        },
+        "https://example.org": {"title": "Other", "description": ""},
+    }
+    response: TestResponse = client.post(
+        "/meta-tags",
+        data={"urls": "https://example.com\nhttps://example.org", "head-only": "on"},
+    )
+    assert response.status_code == 200
+    assert b"Head Title" in response.data
+    assert b"Skipped 2,048 bytes" in response.data
+    args, kwargs = mock_tags.call_args
+    assert args == (["https://example.com", "https://example.org"],)
+    assert kwargs["head_only"] is True
+
+
+@patch("app.app.Sitemap")
+def test_root_get_with_slow_crawl_returns_progress_page(
+    mock_sitemap: MagicMock, client: FlaskClient, app: Flask, services: Services
+) -> None:
+    started: Event = Event()
+    release: Event = Event()
+
+    def collect() -> None:
+        started.set()
+        release.wait(2)
+
+    mock_instance: MagicMock = MagicMock()
+    mock_instance.collect.side_effect = collect
+    mock_instance.get.return_value = {
+        "metadata": {},
+        "incoming": {},
+        "internal": {"https://example.com": []},
+        "external": [],
+        "root": "https://example.com",
+    }
+    mock_sitemap.return_value = mock_instance
+
+    with patch.dict(app.config, {"JOB_INLINE_WAIT": 0}):
+        response: TestResponse = client.get("/?url=https://example.com&depth=1")
+    assert response.status_code == 200
+    assert b"job-progress" in response.data
+    assert b"Tree for URL" not in response.data
+
+    assert started.wait(2)
+    job_id: str = mock_sitemap.call_args.kwargs["on_progress"].__self__.id
+    assert f"/jobs/{job_id}".encode() in response.data
+    mock_sitemap.call_args.kwargs["on_progress"](pages_fetched=5, queue_size=2)
+    status: TestResponse = client.get(f"/jobs/{job_id}")
+    assert status.json is not None
+    assert status.json["status"] == "running"
+    assert status.json["progress"] == {"pages_fetched": 5, "queue_size": 2}
+
+    release.set()
+    job = services.jobs.get(job_id)
+    assert job is not None and job.wait(2)
+
+    result: TestResponse = client.get(f"/?job={job_id}")
+    assert result.status_code == 200
+    assert b"Tree for URL: https://example.com" in result.data
+    assert b'value="1"' in result.data
+
+
+@patch("app.app.Sitemap")
+def test_root_get_with_failed_crawl_shows_error(
+    mock_sitemap: MagicMock, client: FlaskClient
+) -> None:
+    mock_sitemap.return_value.collect.side_effect = RuntimeError("boom")
+
+    response: TestResponse = client.get("/?url=https://example.com")
+    assert response.status_code == 200
+    assert b"Job failed: boom" in response.data
+
+
+def test_unknown_job_returns_404(client: FlaskClient) -> None:
+    assert client.get("/jobs/missing").status_code == 404
+    assert client.get("/?job=missing").status_code == 404
+    assert client.get("/meta-tags?job=missing").status_code == 404
+
+
+@patch("app.app.get_meta_tags_request")
+def test_meta_tags_job_result_is_retrievable(
+    mock_tags: MagicMock, client: FlaskClient
+) -> None:
+    mock_tags.return_value = {
+        "https://example.com": {"title": "Job Title", "description": ""}
+    }
+    client.post("/meta-tags", data={"urls": "https://example.com"})
+    job_id: str = mock_tags.call_args.kwargs["on_progress"].__self__.id
+
+    response: TestResponse = client.get(f"/meta-tags?job={job_id}")
+    assert response.status_code == 200
+    assert b"Job Title" in response.data
+    assert client.get(f"/?job={job_id}").status_code == 404
+
+
+@patch("app.app.Sitemap")
+def test_root_get_uses_crawl_cache_until_refresh(
+    mock_sitemap: MagicMock, client: FlaskClient
+) -> None:
+    mock_sitemap.return_value.get.return_value = {
+        "metadata": {},
+        "incoming": {},
+        "internal": {"https://example.com": []},
+        "external": [],
+        "root": "https://example.com",
+    }
+
+    first: TestResponse = client.get("/?url=https://example.com/&depth=3")
+    second: TestResponse = client.get("/?url=https://example.com&depth=3")
+    assert mock_sitemap.call_count == 1
+    assert b"(cached)" not in first.data
+    assert b"(cached)" in second.data
+    assert b"Tree for URL: https://example.com" in second.data
+
+    client.get("/?url=https://example.com&depth=3&refresh=1")
+    assert mock_sitemap.call_count == 2
+
+
+@patch("app.app.Sitemap")
+def test_root_get_warns_when_crawl_budget_ran_out(
+    mock_sitemap: MagicMock, client: FlaskClient, app: Flask
+) -> None:
+    mock_sitemap.return_value.get.return_value = {
+        "metadata": {},
+        "incoming": {},
+        "internal": {"https://example.com": []},
+        "external": [],
+        "root": "https://example.com",
+        "truncated": True,
+    }
+
+    response: TestResponse = client.get("/?url=https://example.com&depth=3")
+    assert b"reached its page or download budget" in response.data
+    assert mock_sitemap.call_args.kwargs["max_pages"] == app.config["SITEMAP_MAX_PAGES"]
+    assert mock_sitemap.call_args.kwargs["max_bytes"] == app.config["SITEMAP_MAX_BYTES"]
+    assert mock_sitemap.call_args.kwargs["max_page_bytes"] == (
+        app.config["SITEMAP_MAX_PAGE_BYTES"]
+    )
+
+
+@patch("app.app.Sitemap")
+def test_root_get_reports_robots_blocked_urls_and_can_ignore_robots(
+    mock_sitemap: MagicMock, client: FlaskClient
+) -> None:
+    mock_sitemap.return_value.get.return_value = {
+        "metadata": {},
+        "incoming": {},
+        "internal": {"https://example.com": []},
+        "external": [],
+        "root": "https://example.com",
+        "blocked": ["https://example.com/a", "https://example.com/b"],
+    }
+
+    blocked: TestResponse = client.get("/?url=https://example.com&depth=1")
+    assert mock_sitemap.call_args.kwargs["respect_robots"] is True
+    assert b"robots.txt blocked 2 URLs" in blocked.data
+
+    ignored: TestResponse = client.get(
+        "/?url=https://example.com&depth=1&ignore_robots=1"
+    )
+    assert mock_sitemap.call_count == 2
+    assert mock_sitemap.call_args.kwargs["respect_robots"] is False
+    assert b'name="ignore_robots" value="1" checked' in ignored.data
+
+
+SITEMAP_RESULT: dict[str, Any] = {
+    "root": "https://example.com",
+    "internal": {
+        "https://example.com": ["https://example.com/about"],
+        "https://example.com/about": [],
+    },
+    "external": {"https://external.com"},
+    "metadata": {"https://example.com/about": {"title": "About"}},
+    "incoming": {
+        "https://example.com/about": ["https://example.com"],
+        "https://external.com": ["https://example.com"],
+    },
+    "response": {},
+    "depths": {"https://example.com": 0, "https://example.com/about": 1},
+}
+
+
+def test_sitemap_tree_is_loaded_lazily(client: FlaskClient, services: Services) -> None:
+    job_id: str = services.jobs.add_finished("sitemap", SITEMAP_RESULT).id
+
+    roots: TestResponse = client.get(f"/sitemap/{job_id}/tree")
+    assert roots.json is not None
+    assert [node["text"] for node in roots.json] == [
+        "https://example.com",
+        "External Links",
+    ]
+    assert roots.json[0]["children"] is True
+
+    children: TestResponse = client.get(
+        f"/sitemap/{job_id}/tree?node=https://example.com"
+    )
+    assert children.json is not None
+    assert children.json == [
+        {
+            "text": "https://example.com/about",
+            "icon": "fa-regular fa-file",
+            "children": False,
+            "crawled": True,
+        }
+    ]
+
+    external: TestResponse = client.get(f"/sitemap/{job_id}/tree?node=__external__")
+    assert external.json == [{"text": "https://external.com", "icon": "fa fa-link"}]
+
+
+def test_sitemap_tree_index_is_built_once_per_job(
+    client: FlaskClient, services: Services
+) -> None:
+    job_id: str = services.jobs.add_finished("sitemap", SITEMAP_RESULT).id
+    with patch("app.app.JsTreeIndex", wraps=JsTreeIndex) as index:
+        client.get(f"/sitemap/{job_id}/tree")
+        client.get(f"/sitemap/{job_id}/tree?node=https://example.com")
+        client.get(f"/sitemap/{job_id}/details?url=https://example.com/about")
+    index.assert_called_once_with(SITEMAP_RESULT)
+    assert len(services.tree_indexes) == 1
+
+
+def test_sitemap_details_and_outline(client: FlaskClient, services: Services) -> None:
+    job_id: str = services.jobs.add_finished("sitemap", SITEMAP_RESULT).id
+
+    details: TestResponse = client.get(
+        f"/sitemap/{job_id}/details?url=https://example.com/about"
+    )
+    assert details.json == {
+        "url": "https://example.com/about",
+        "metadata": {"title": "About"},
+        "incoming": ["https://example.com"],
+    }
+
+    outline: TestResponse = client.get(f"/sitemap/{job_id}/outline?type=internal")
+    assert outline.mimetype == "text/plain"
+    assert outline.get_data(as_text=True) == (
+        "- https://example.com\n  - https://example.com/about\n"
+    )
+
+
+def test_sitemap_endpoints_require_finished_sitemap_job(
+    client: FlaskClient, services: Services
+) -> None:
+    meta_job_id: str = services.jobs.add_finished("meta_tags", {}).id
+    assert client.get("/sitemap/missing/tree").status_code == 404
+    assert client.get(f"/sitemap/{meta_job_id}/details").status_code == 404
+
+
+def test_sitemap_export_streams_formats(
+    client: FlaskClient, services: Services
+) -> None:
+    job_id: str = services.jobs.add_finished("sitemap", SITEMAP_RESULT).id
+
+    xml: TestResponse = client.get(f"/sitemap/{job_id}/export.xml")
+    assert xml.mimetype == "application/xml"
+    assert xml.is_streamed
+    assert b"<loc>https://example.com/about</loc>" in xml.data
+    assert xml.headers["Content-Disposition"] == "attachment; filename=sitemap.xml"
+
+    ndjson: TestResponse = client.get(f"/sitemap/{job_id}/export.ndjson")
+    assert ndjson.mimetype == "application/x-ndjson"
+    assert len(ndjson.get_data(as_text=True).splitlines()) == 3
+
+    csv: TestResponse = client.get(f"/sitemap/{job_id}/export.csv")
+    assert csv.mimetype == "text/csv"
+    assert csv.get_data(as_text=True).startswith("url,type,depth")
+
+    assert client.get(f"/sitemap/{job_id}/export.pdf").status_code == 404
+
+
+def test_meta_tags_export_streams_formats(
+    client: FlaskClient, services: Services
+) -> None:
+    job_id: str = services.jobs.add_finished(
+        "meta_tags", {"https://example.com": {"title": "T", "description": "D"}}
+    ).id
+
+    csv: TestResponse = client.get(f"/meta-tags/{job_id}/export.csv")
+    assert csv.get_data(as_text=True) == (
+        "url,title,description\r\nhttps://example.com,T,D\r\n"
+    )
+    ndjson: TestResponse = client.get(f"/meta-tags/{job_id}/export.ndjson")
+    assert json.loads(ndjson.data) == {
+        "url": "https://example.com",
+        "title": "T",
+        "description": "D",
+    }
+    assert client.get(f"/meta-tags/{job_id}/export.xml").status_code == 404
+    assert client.get("/meta-tags/missing/export.csv").status_code == 404
+
+
+def test_metrics_endpoint_exposes_prometheus_text(
+    client: FlaskClient, services: Services
+) -> None:
+    job: Job = services.jobs.submit("metrics_test", lambda job: "ok")
+    job.wait(5)
+
+    response: TestResponse = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type == "text/plain; version=0.0.4; charset=utf-8"
+    text: str = response.get_data(as_text=True)
+    assert "# TYPE qatools_crawl_phase_seconds histogram" in text
+    assert "# TYPE qatools_crawl_requests_in_flight gauge" in text
+    assert (
+        'qatools_jobs_completed_total{kind="metrics_test",status="finished"} 1' in text
+    )
+
+
+def test_api_sitemap_pages_paginates_and_filters(
+    client: FlaskClient, services: Services
+) -> None:
+    job_id: str = services.jobs.add_finished("sitemap", SITEMAP_RESULT).id
+
+    first: TestResponse = client.get(f"/api/sitemap/{job_id}/pages?limit=2")
+    assert first.status_code == 200
+    assert first.json is not None
+    assert first.json["job_id"] == job_id
+    assert first.json["total"] == 3
+    assert first.json["next_offset"] == 2
+    assert [item["url"] for item in first.json["items"]] == [
+        "https://example.com",
+        "https://example.com/about",
+    ]
+    assert first.json["items"][1]["metadata"] == {"title": "About"}
+    assert first.json["items"][1]["incoming"] == ["https://example.com"]
+
+    rest: TestResponse = client.get(f"/api/sitemap/{job_id}/pages?limit=2&offset=2")
+    assert rest.json is not None
+    assert [item["url"] for item in rest.json["items"]] == ["https://external.com"]
+    assert rest.json["next_offset"] is None
+
+    filtered: TestResponse = client.get(
+        f"/api/sitemap/{job_id}/pages?depth=1&prefix=https://example.com/"
+        "&type=internal"
+    )
+    assert filtered.json is not None
+    assert [item["url"] for item in filtered.json["items"]] == [
+        "https://example.com/about"
+    ]
+    bad_filter: TestResponse = client.get(f"/api/sitemap/{job_id}/pages?status=bad")
+    assert bad_filter.status_code == 400
+    assert bad_filter.json == {"error": "Unknown status filter: bad"}
+    assert client.get("/api/sitemap/missing/pages").status_code == 404
+    assert len(services.api_records) == 1
+
+
+def test_api_page_size_is_clamped(
+    client: FlaskClient, app: Flask, services: Services
+) -> None:
+    job_id: str = services.jobs.add_finished("sitemap", SITEMAP_RESULT).id
+    with patch.dict(app.config, {"API_PAGE_SIZE": 1, "API_MAX_PAGE_SIZE": 2}):
+        default: TestResponse = client.get(f"/api/sitemap/{job_id}/pages")
+        capped: TestResponse = client.get(f"/api/sitemap/{job_id}/pages?limit=50")
+        negative: TestResponse = client.get(
+            f"/api/sitemap/{job_id}/pages?limit=-1&offset=-5"
+        )
+    assert default.json is not None and default.json["limit"] == 1
+    assert capped.json is not None and capped.json["limit"] == 2
+    assert negative.json is not None
+    assert (negative.json["limit"], negative.json["offset"]) == (1, 0)
+
+
+def test_api_returns_not_modified_for_matching_etag(
+    client: FlaskClient, services: Services
+) -> None:
+    job_id: str = services.jobs.add_finished("sitemap", SITEMAP_RESULT).id
+    url: str = f"/api/sitemap/{job_id}/pages?limit=1"
+    response: TestResponse = client.get(url)
+    etag: str = response.headers["ETag"]
+
+    cached: TestResponse = client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    other: TestResponse = client.get(f"{url}&offset=1", headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+
+def test_api_meta_tags(client: FlaskClient, services: Services) -> None:
+    job_id: str = services.jobs.add_finished(
+        "meta_tags",
+        {
+            "https://example.com": {"title": "T", "description": "D"},
+            "https://other.com": {"title": "O"},
+        },
+    ).id
+    response: TestResponse = client.get(
+        f"/api/meta-tags/{job_id}?prefix=https://example.com"
+    )
+    assert response.json is not None
+    assert response.json["total"] == 1
+    assert response.json["items"] == [
+        {"url": "https://example.com", "tags": {"title": "T", "description": "D"}}
+    ]
+    sitemap_id: str = services.jobs.add_finished("sitemap", SITEMAP_RESULT).id
+    assert client.get(f"/api/meta-tags/{sitemap_id}").status_code == 404
+
+
+def test_json_responses_are_gzipped_when_accepted(
+    client: FlaskClient, app: Flask, services: Services
+) -> None:
+    job_id: str = services.jobs.add_finished("sitemap", SITEMAP_RESULT).id
+    url: str = f"/api/sitemap/{job_id}/pages"
+    with patch.dict(app.config, {"API_GZIP_MIN_BYTES": 0}):
+        compressed: TestResponse = client.get(
+            url, headers={"Accept-Encoding": "gzip, deflate"}
+        )
+        plain: TestResponse = client.get(url)
+        page: TestResponse = client.get(
+            "/meta-tags", headers={"Accept-Encoding": "gzip"}
+        )
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert json.loads(gzip.decompress(compressed.data)) == plain.json
+    assert "Content-Encoding" not in plain.headers
+    assert "Content-Encoding" not in page.headers
@@ -0,0 +1,221 @@
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from dataclasses import asdict, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.modules.http_client.http_client import HttpClient
+from app.modules.meta_tags.meta_tags_request import get_meta_tags_request
+from app.modules.page_parser.page_parser import DEFAULT_PARSER_BACKEND, get_page_parser
+from app.modules.page_parser.parse_pool import ParsePool
+from app.modules.sitemap.jstree_formatter import sitemap_to_jstree_formatter
+from app.modules.sitemap.sitemap import Sitemap
+from benchmarks.synthetic_site import SiteSpec, SyntheticSiteServer
+
+RESULTS_PATH: Path = Path(__file__).parent / "results.jsonl"
+SCENARIOS: Dict[str, SiteSpec] = {
+    "small": SiteSpec(pages=100, fan_out=5, depth=3),
+    "medium": SiteSpec(pages=1000, fan_out=10, depth=4),
+    "wide": SiteSpec(pages=1000, fan_out=100, depth=2, cross_links=20),
+    "deep": SiteSpec(pages=1000, fan_out=2, depth=12),
+    "slow": SiteSpec(pages=200, fan_out=8, depth=3, latency=0.02),
+    "flaky": SiteSpec(pages=500, fan_out=10, depth=3, error_rate=0.05),
+    "assets": SiteSpec(pages=300, fan_out=8, depth=3, assets=3),
+}
+
+
+def measure(
+    func: Callable[[], Any], track_memory: bool
+) -> Tuple[Any, Dict[str, float]]:
+    started: float = time.perf_counter()
+    result: Any = func()
+    metrics: Dict[str, float] = {"seconds": time.perf_counter() - started}
+    if track_memory:
+        tracemalloc.start()
+        func()
+        metrics["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, metrics
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run_scenario(
+    name: str,
+    spec: SiteSpec,
+    concurrency: int,
+    meta_tag_urls: int,
+    track_memory: bool,
+    parser_backend: str = DEFAULT_PARSER_BACKEND,
+    parse_workers: int = 0,
+) -> Dict[str, Any]:
+    client: HttpClient = HttpClient(retries=0, pool_maxsize=max(16, concurrency))
+    parse_pool: Optional[ParsePool] = (
+        ParsePool(parse_workers, min_bytes=0) if parse_workers > 0 else None
+    )
+    results: Dict[str, Dict[str, float]] = {}
+
+    with SyntheticSiteServer(spec) as server:
+
+        def collect() -> Sitemap:
+            sitemap: Sitemap = Sitemap(
+                server.root,
+                max_depth=spec.depth,
+                concurrency=concurrency,
+                client=client,
+                parser=get_page_parser(parser_backend),
+                parse_pool=parse_pool,
+            )
+            sitemap.collect()
+            return sitemap
+
+        sitemap, results["collect"] = measure(collect, track_memory)
+        results["collect"]["pages"] = sitemap.pages_fetched
+        results["collect"]["errors"] = sitemap.errors
+        results["collect"]["pages_per_sec"] = (
+            sitemap.pages_fetched / results["collect"]["seconds"]
+        )
+
+        sitemap_data: Dict[str, Any] = sitemap.get()
+        nodes, results["jstree"] = measure(
+            lambda: sitemap_to_jstree_formatter(sitemap_data), track_memory
+        )
+        results["jstree"]["nodes"] = len(nodes)
+
+        urls: List[str] = [server.url(path) for path in server.site.paths][
+            :meta_tag_urls
+        ]
+        for label, head_only in (("meta_tags", False), ("meta_tags_head", True)):
+            _, results[label] = measure(
+                lambda: get_meta_tags_request(urls, client=client, head_only=head_only),
+                track_memory,
+            )
+            results[label]["urls"] = len(urls)
+
+    client.close()
+    if parse_pool is not None:
+        parse_pool.close()
+    return {
+        "scenario": name,
+        "spec": asdict(spec),
+        "concurrency": concurrency,
+        "meta_tag_urls": meta_tag_urls,
+        "parser": parser_backend,
+        "parse_workers": parse_workers,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+
+def load_previous(path: Path, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    previous: Optional[Dict[str, Any]] = None
+    with path.open() as results_file:
+        for line in results_file:
+            candidate: Dict[str, Any] = json.loads(line)
+            if all(
+                candidate.get(key) == record[key]
+                for key in (
+                    "scenario",
+                    "spec",
+                    "concurrency",
+                    "meta_tag_urls",
+                    "parser",
+                    "parse_workers",
+                )
+            ):
+                previous = candidate
+    return previous
+
+
+def report(record: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> None:
+    print(f"{record['scenario']} @ {record['commit'] or 'unknown commit'}:")
+    for stage, metrics in record["results"].items():
+        parts: List[str] = []
+        for metric, value in metrics.items():
+            value_format: str = ",.3f" if isinstance(value, float) else ","
+            text: str = f"{metric}={value:{value_format}}"
+            old: Optional[float] = (
+                previous["results"].get(stage, {}).get(metric) if previous else None
+            )
+            if old:
+                text += f" ({(value - old) / old:+.1%})"
+            parts.append(text)
+        print(f"  {stage:<15} " + "  ".join(parts))
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Crawl a generated local site and record timings and memory."
+    )
+    parser.add_argument(
+        "--scenario",
+        choices=sorted(SCENARIOS),
+        nargs="+",
+        default=["small", "medium"],
+    )
+    parser.add_argument("--pages", type=int)
+    parser.add_argument("--fan-out", type=int)
+    parser.add_argument("--depth", type=int)
+    parser.add_argument("--page-size", type=int)
+    parser.add_argument("--latency", type=float)
+    parser.add_argument("--error-rate", type=float)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--meta-tag-urls", type=int, default=100)
+    parser.add_argument("--parser", default=DEFAULT_PARSER_BACKEND)
+    parser.add_argument("--parse-workers", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--results", type=Path, default=RESULTS_PATH)
+    parser.add_argument("--no-save", action="store_true")
+    args: argparse.Namespace = parser.parse_args()
+
+    overrides: Dict[str, Any] = {
+        field: getattr(args, field)
+        for field in (
+            "pages",
+            "fan_out",
+            "depth",
+            "page_size",
+            "latency",
+            "error_rate",
+            "seed",
+        )
+        if getattr(args, field) is not None
+    }
+    for name in args.scenario:
+        record: Dict[str, Any] = run_scenario(
+            name,
+            replace(SCENARIOS[name], **overrides),
+            args.concurrency,
+            args.meta_tag_urls,
+            not args.no_memory,
+            args.parser,
+            args.parse_workers,
+        )
+        report(record, load_previous(args.results, record))
+        if not args.no_save:
+            with args.results.open("a") as results_file:
+                results_file.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+PROBE: str = """
+import json, sys, time
+started = time.perf_counter()
+from app.app import create_app
+imported = time.perf_counter()
+create_app()
+created = time.perf_counter()
+print(json.dumps({
+    "import": imported - started,
+    "create_app": created - imported,
+    "selenium_loaded": "selenium" in sys.modules,
+}))
+"""
+
+
+def probe() -> Dict[str, float]:
+    result: subprocess.CompletedProcess[str] = subprocess.run(
+        [sys.executable, "-c", PROBE], capture_output=True, text=True, check=True
+    )
+    sample: Dict[str, float] = json.loads(result.stdout)
+    return sample
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Measure cold import and create_app() time in fresh interpreters."
+    )
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=500.0,
+        help="fail when the median cold start exceeds this",
+    )
+    args: argparse.Namespace = parser.parse_args()
+
+    samples: List[Dict[str, float]] = [probe() for _ in range(args.runs)]
+    imports: List[float] = [sample["import"] * 1000 for sample in samples]
+    creates: List[float] = [sample["create_app"] * 1000 for sample in samples]
+    totals: List[float] = [i + c for i, c in zip(imports, creates)]
+    print(f"{args.runs} cold starts:")
+    print(f"  import app.app   {statistics.median(imports):9.1f} ms median")
+    print(f"  create_app()     {statistics.median(creates):9.1f} ms median")
+    print(f"  total            {statistics.median(totals):9.1f} ms median")
+    print(f"  selenium loaded  {any(s['selenium_loaded'] for s in samples)}")
+
+    if statistics.median(totals) > args.budget_ms:
+        print(f"  over budget ({args.budget_ms:.0f} ms)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
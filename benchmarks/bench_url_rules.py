@@ -0,0 +1,68 @@
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from app.modules.url_rules.url_rules import UrlRules
+
+
+def substring_exclude(exclude_substrings: List[str]) -> Callable[[str], bool]:
+    def should_exclude(url: str) -> bool:
+        return any(substring in url for substring in exclude_substrings)
+
+    return should_exclude
+
+
+def make_rules(count: int) -> List[str]:
+    return [f"/section-{index}/private" for index in range(count)]
+
+
+def make_urls(count: int, distinct: int, seed: int) -> List[str]:
+    rng: random.Random = random.Random(seed)
+    pool: List[str] = [
+        f"https://example.com/section-{rng.randrange(1000)}/"
+        f"{rng.choice(['page', 'private', 'post'])}/{index}"
+        for index in range(distinct)
+    ]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def measure(name: str, matcher: Callable[[str], bool], urls: List[str]) -> float:
+    started: float = time.perf_counter()
+    excluded: int = sum(1 for url in urls if matcher(url))
+    elapsed: float = time.perf_counter() - started
+    print(f"  {name:<24} {elapsed * 1000:9.1f} ms  ({excluded} excluded)")
+    return elapsed
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Compare substring exclusion with the compiled URL rule engine."
+    )
+    parser.add_argument("--rules", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--urls", type=int, default=200_000)
+    parser.add_argument("--distinct", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args: argparse.Namespace = parser.parse_args()
+
+    urls: List[str] = make_urls(args.urls, args.distinct, args.seed)
+    for rule_count in args.rules:
+        rules: List[str] = make_rules(rule_count)
+        print(f"{rule_count} rules, {len(urls)} URLs ({args.distinct} distinct):")
+        baseline: float = measure(
+            "any(substring in url)", substring_exclude(rules), urls
+        )
+        compiled: float = measure(
+            "UrlRules.excludes", UrlRules(exclude=rules).excludes, urls
+        )
+        uncached: float = measure(
+            "UrlRules (no memo)", UrlRules(exclude=rules, cache_size=0).excludes, urls
+        )
+        print(
+            f"  speedup: {baseline / compiled:.1f}x memoized, "
+            f"{baseline / uncached:.1f}x compiled only"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import ClassVar, Dict, List, Optional, Type
+
+FILLER_WORDS: List[str] = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor"
+).split()
+
+
+@dataclass(frozen=True)
+class SiteSpec:
+    pages: int = 500
+    fan_out: int = 10
+    depth: int = 4
+    page_size: int = 20_000
+    cross_links: int = 5
+    external_links: int = 2
+    latency: float = 0.0
+    error_rate: float = 0.0
+    assets: int = 0
+    asset_size: int = 500_000
+    seed: int = 0
+
+
+class SyntheticSite:
+    def __init__(self, spec: SiteSpec) -> None:
+        self.spec: SiteSpec = spec
+        self.links: Dict[str, List[str]] = {}
+        self.depths: Dict[str, int] = {}
+        self._build()
+
+    def _build(self) -> None:
+        rng: random.Random = random.Random(self.spec.seed)
+        self.depths["/"] = 0
+        level: List[str] = ["/"]
+        paths: List[str] = ["/"]
+        while level and len(paths) < self.spec.pages:
+            next_level: List[str] = []
+            for parent in level:
+                if self.depths[parent] >= self.spec.depth:
+                    continue
+                for _ in range(self.spec.fan_out):
+                    if len(paths) >= self.spec.pages:
+                        break
+                    path: str = f"/page/{len(paths)}"
+                    self.depths[path] = self.depths[parent] + 1
+                    self.links.setdefault(parent, []).append(path)
+                    paths.append(path)
+                    next_level.append(path)
+            level = next_level
+
+        for path in paths:
+            children: List[str] = self.links.setdefault(path, [])
+            children.extend(
+                rng.choice(paths) for _ in range(min(self.spec.cross_links, len(paths)))
+            )
+
+    @property
+    def paths(self) -> List[str]:
+        return list(self.depths)
+
+    def is_error(self, path: str) -> bool:
+        if path == "/" or self.spec.error_rate <= 0:
+            return False
+        bucket: float = (zlib.crc32(path.encode()) % 10_000) / 10_000
+        return bucket < self.spec.error_rate
+
+    def render(self, path: str) -> Optional[bytes]:
+        if path not in self.depths:
+            return None
+        anchors: str = "".join(
+            f'<li><a href="{link}">{link}</a></li>' for link in self.links[path]
+        )
+        assets: str = "".join(
+            f'<a href="/files/{(index + len(path)) % 50}.pdf">file</a>'
+            for index in range(self.spec.assets)
+        )
+        externals: str = "".join(
+            f'<a href="https://external-{index}.example.org{path}">ext</a>'
+            for index in range(self.spec.external_links)
+        )
+        head: str = (
+            f"<!DOCTYPE html><html><head><title>Page {path}</title>"
+            f'<meta name="description" content="Synthetic page {path}">'
+            f'<link rel="canonical" href="{path}"></head><body>'
+            f"<nav><ul>{anchors}</ul></nav>{assets}{externals}"
+        )
+        filler_size: int = max(0, self.spec.page_size - len(head) - 20)
+        paragraph: str = " ".join(FILLER_WORDS)
+        filler: str = (paragraph * (filler_size // len(paragraph) + 1))[:filler_size]
+        return f"{head}<p>{filler}</p></body></html>".encode()
+
+
+def _handler_for(site: SyntheticSite) -> Type[BaseHTTPRequestHandler]:
+    class SyntheticSiteHandler(BaseHTTPRequestHandler):
+        protocol_version: str = "HTTP/1.1"
+        disable_nagle_algorithm: ClassVar[bool] = True
+
+        def do_GET(self) -> None:
+            if site.spec.latency:
+                time.sleep(site.spec.latency)
+            path: str = self.path.split("?")[0].split("#")[0]
+            path = path.rstrip("/") or "/"
+            body: Optional[bytes] = site.render(path)
+            status: int = 200
+            content_type: str = "text/html; charset=utf-8"
+            if path.startswith("/files/"):
+                body, content_type = b"%" * site.spec.asset_size, "application/pdf"
+            elif body is None:
+                status, body = 404, b"Not found"
+            elif site.is_error(path):
+                status, body = 500, b"Server error"
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    return SyntheticSiteHandler
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads: bool = True
+
+    def handle_error(self, request: object, client_address: object) -> None:
+        pass
+
+
+class SyntheticSiteServer:
+    def __init__(self, spec: SiteSpec, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.site: SyntheticSite = SyntheticSite(spec)
+        self._server: ThreadingHTTPServer = _QuietHTTPServer(
+            (host, port), _handler_for(self.site)
+        )
+        self._thread: threading.Thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+
+    @property
+    def root(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def url(self, path: str) -> str:
+        return f"{self.root}{path}" if path != "/" else self.root
+
+    def start(self) -> "SyntheticSiteServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "SyntheticSiteServer":
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop()
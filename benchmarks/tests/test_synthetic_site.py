@@ -0,0 +1,76 @@
+import time
+from typing import List, Optional
+
+import requests
+
+from benchmarks.synthetic_site import (
+    SiteSpec,
+    SyntheticSite,
+    SyntheticSiteServer,
+    _handler_for,
+)
+
+
+def test_site_is_deterministic_and_bounded() -> None:
+    spec: SiteSpec = SiteSpec(pages=30, fan_out=3, depth=2, cross_links=2, seed=7)
+    site: SyntheticSite = SyntheticSite(spec)
+
+    assert site.links == SyntheticSite(spec).links
+    assert len(site.paths) == 13
+    assert max(site.depths.values()) == 2
+    assert site.links["/"][:3] == ["/page/1", "/page/2", "/page/3"]
+    assert all(len(site.links[path]) >= 2 for path in site.paths)
+
+
+def test_render_includes_links_and_pads_to_page_size() -> None:
+    site: SyntheticSite = SyntheticSite(
+        SiteSpec(pages=5, fan_out=4, page_size=5_000, external_links=1, assets=1)
+    )
+    body: Optional[bytes] = site.render("/")
+
+    assert body is not None
+    assert len(body) >= 4_900
+    assert b'<a href="/page/1">' in body
+    assert b'<a href="https://external-0.example.org/">' in body
+    assert b'<a href="/files/1.pdf">' in body
+    assert site.render("/missing") is None
+
+
+def test_error_rate_spares_the_root() -> None:
+    site: SyntheticSite = SyntheticSite(SiteSpec(pages=200, error_rate=0.5))
+    errors: List[str] = [path for path in site.paths if site.is_error(path)]
+
+    assert "/" not in errors
+    assert 50 < len(errors) < 150
+    assert not SyntheticSite(SiteSpec(pages=200)).is_error("/page/1")
+
+
+def test_server_serves_pages_assets_and_errors() -> None:
+    spec: SiteSpec = SiteSpec(pages=20, error_rate=0.3, assets=1, asset_size=100)
+    with SyntheticSiteServer(spec) as server, requests.Session() as session:
+        error_path: str = next(p for p in server.site.paths if server.site.is_error(p))
+        ok_path: str = next(
+            p for p in server.site.paths if p != "/" and not server.site.is_error(p)
+        )
+
+        assert session.get(server.url("/")).status_code == 200
+        page: requests.Response = session.get(server.url(f"{ok_path}/?q=1#top"))
+        assert page.status_code == 200
+        assert page.headers["Content-Type"] == "text/html; charset=utf-8"
+        assert session.get(server.url(error_path)).status_code == 500
+        assert session.get(server.url("/missing")).status_code == 404
+        asset: requests.Response = session.get(server.url("/files/3.pdf"))
+        assert asset.headers["Content-Type"] == "application/pdf"
+        assert len(asset.content) == 100
+
+
+def test_reused_connections_do_not_stall_on_delayed_acks() -> None:
+    assert _handler_for(SyntheticSite(SiteSpec(pages=2))).disable_nagle_algorithm
+    with SyntheticSiteServer(
+        SiteSpec(pages=2)
+    ) as server, requests.Session() as session:
+        session.get(server.url("/"))
+        started: float = time.perf_counter()
+        for _ in range(10):
+            session.get(server.url("/"))
+        assert time.perf_counter() - started < 0.2
@@ -0,0 +1,16 @@
+import os
+
+# Crawl and meta-tag jobs live in the worker process that started them, so job
+# polling only works when requests reach the same worker. Scale with threads
+# first; add workers only behind sticky routing. Recycling a worker after
+# max_requests would drop every job it holds, so it is off unless set.
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = 100
+accesslog = "-"